@@ -0,0 +1,214 @@
+"""Load test for /auth/login and /orders/place.
+
+Runs against a live API (e.g. `make docker-up`, backed by the Firestore
+emulator). Products are seeded straight into the emulator, users are
+registered through the API, then each phase fires a fixed number of
+requests from a pool of concurrent workers:
+
+    python benchmarks/api_bench.py --concurrency 32 --orders 2000 --skew 1.1
+    python benchmarks/api_bench.py --save-baseline benchmarks/baseline.json
+    python benchmarks/api_bench.py --compare benchmarks/baseline.json
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from report import compare_to_baseline, print_report, save_baseline, summarize
+from requests.adapters import HTTPAdapter
+
+REQUEST_TIMEOUT = 30
+PASSWORD = "BenchPass123"
+
+_local = threading.local()
+
+
+def _session(pool_size: int) -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
+        session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+        _local.session = session
+    return session
+
+
+def _run_phase(requests_to_send: list, concurrency: int) -> tuple[dict, list]:
+    """POST every ``(url, body, headers)`` with ``concurrency`` workers.
+
+    Returns the phase summary and the responses (None for failed requests).
+    """
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+
+    def send(request):
+        url, body, headers = request
+        started = time.perf_counter()
+        try:
+            response = _session(concurrency).post(
+                url, json=body, headers=headers, timeout=REQUEST_TIMEOUT
+            )
+            status = response.status_code
+        except requests.RequestException as e:
+            response, status = None, type(e).__name__
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] += 1
+        return response
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        responses = list(executor.map(send, requests_to_send))
+    duration = time.perf_counter() - started
+    return summarize(latencies, duration, statuses), responses
+
+
+def _product_weights(products: int, skew: float) -> list[float]:
+    # Zipf-like popularity: product i gets weight 1 / (i + 1) ** skew, so
+    # skew 0 is uniform and larger values concentrate on a few hot products.
+    return [1 / (rank + 1) ** skew for rank in range(products)]
+
+
+def _seed_products(args, product_ids: list[str]) -> None:
+    os.environ["FIRESTORE_EMULATOR_HOST"] = args.emulator_host
+    from google.cloud import firestore
+
+    db = firestore.Client(project=args.project)
+    batch = db.batch()
+    for i, product_id in enumerate(product_ids, start=1):
+        batch.set(
+            db.collection("Products").document(product_id),
+            {
+                "product_id": product_id,
+                "product_name": f"Bench product {product_id}",
+                "quantity": args.stock,
+                "status": "in_stock",
+            },
+        )
+        if i % 400 == 0:
+            batch.commit()
+            batch = db.batch()
+    batch.commit()
+
+
+def _transaction_stats(base_url: str) -> dict:
+    try:
+        response = requests.get(f"{base_url}/health/stats", timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException:
+        return {}
+    return response.json().get("transactions", {})
+
+
+def _transaction_delta(before: dict, after: dict) -> dict:
+    totals = Counter()
+    for name, counts in after.items():
+        for key in ("transactions", "attempts", "retries"):
+            totals[key] += counts[key] - before.get(name, {}).get(key, 0)
+    if not totals["transactions"]:
+        return {}
+    return {
+        "transactions": totals["transactions"],
+        "transaction_retries": totals["retries"],
+        "retries_per_transaction": round(totals["retries"] / totals["transactions"], 4),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--emulator-host", default="localhost:8080")
+    parser.add_argument(
+        "--project",
+        default=os.getenv("GCP_PROJECT_ID", "demo-inventory"),
+        help="emulator project, the one `make docker-up` runs the API as",
+    )
+    parser.add_argument("--no-seed", action="store_true", help="use existing products")
+    parser.add_argument("--product-prefix", default="bench-product-")
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--stock", type=int, default=100_000)
+    parser.add_argument("--skew", type=float, default=1.0, help="0 = uniform")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+    base = args.base_url.rstrip("/")
+    product_ids = [f"{args.product_prefix}{i}" for i in range(args.products)]
+    if not args.no_seed:
+        _seed_products(args, product_ids)
+
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(args.users)]
+    credentials = [{"email": email, "password": PASSWORD} for email in emails]
+    register, _ = _run_phase(
+        [(f"{base}/auth/register", body, None) for body in credentials],
+        args.concurrency,
+    )
+
+    login_bodies = [credentials[i % len(credentials)] for i in range(args.logins)]
+    login, responses = _run_phase(
+        [(f"{base}/auth/login", body, None) for body in login_bodies],
+        args.concurrency,
+    )
+    tokens = {
+        body["email"]: response.json()["access_token"]
+        for body, response in zip(login_bodies, responses)
+        if response is not None and response.status_code == 200
+    }
+    if not tokens:
+        print("No successful login; is the API up?", file=sys.stderr)
+        return 1
+
+    weights = _product_weights(len(product_ids), args.skew)
+    buyers = list(tokens)
+    orders = []
+    for product_id in rng.choices(product_ids, weights=weights, k=args.orders):
+        email = rng.choice(buyers)
+        headers = {"Authorization": f"Bearer {tokens[email]}"}
+        body = {"buyer_email": email, "product_id": product_id}
+        orders.append((f"{base}/orders/place", body, headers))
+
+    before = _transaction_stats(base)
+    place, _ = _run_phase(orders, args.concurrency)
+    place.update(_transaction_delta(before, _transaction_stats(base)))
+    placed = place["statuses"].get("200", 0)
+    place["orders_per_s"] = round(placed / place["duration_s"], 2)
+    place["conflict_rate"] = round(
+        place["statuses"].get("409", 0) / place["requests"], 4
+    )
+
+    results = {"register": register, "login": login, "place": place}
+    print(
+        f"concurrency={args.concurrency} products={args.products} "
+        f"skew={args.skew} users={len(tokens)}"
+    )
+    print_report(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
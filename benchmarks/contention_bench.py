@@ -0,0 +1,115 @@
+"""Transaction contention of ``place_order`` on the in-memory Firestore engine.
+
+Runs the API's ``place_order`` in-process with ``FIRESTORE_ENGINE=memory``, so
+hot-product contention can be measured in milliseconds without the emulator:
+
+    python benchmarks/contention_bench.py --threads 16 --orders 5000 --skew 1.2
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from api_bench import _product_weights
+from report import compare_to_baseline, print_report, save_baseline, summarize
+
+API_ROOT = Path(__file__).resolve().parent.parent / "services" / "api"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--skew", type=float, default=1.0, help="0 = uniform")
+    parser.add_argument("--shards", type=int, default=1, help="shards per product")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    os.environ.update({"FIRESTORE_ENGINE": "memory", "LOG_LEVEL": "WARNING"})
+    os.environ.setdefault("GCP_PROJECT_ID", "bench-project")
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    sys.path.insert(0, str(API_ROOT))
+    from src.services import inventory
+    from src.utils.stats import txn_stats
+
+    products = inventory.products_ref()
+    product_ids = [f"bench-contention-{i}" for i in range(args.products)]
+    for product_id in product_ids:
+        products.document(product_id).set(
+            {"product_name": product_id, "quantity": args.stock, "status": "in_stock"}
+        )
+        if args.shards > 1:
+            inventory.set_shard_count(product_id, args.shards)
+
+    rng = random.Random(args.seed)
+    weights = _product_weights(len(product_ids), args.skew)
+    picks = rng.choices(product_ids, weights=weights, k=args.orders)
+    chunks = [picks[i :: args.threads] for i in range(args.threads)]
+    statuses = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(chunk):
+        local_statuses = Counter()
+        local_latencies = []
+        for i, product_id in enumerate(chunk):
+            started = time.perf_counter()
+            try:
+                placed = inventory.place_order(f"buyer{i}@example.com", product_id)
+                local_statuses[200 if placed else 409] += 1
+            except ValueError:
+                # firestore.transactional gave up after max_attempts aborts
+                local_statuses["aborted"] += 1
+            local_latencies.append(time.perf_counter() - started)
+        with lock:
+            statuses.update(local_statuses)
+            latencies.extend(local_latencies)
+
+    before = txn_stats.snapshot().get("place_order", {})
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+    after = txn_stats.snapshot().get("place_order", {})
+
+    summary = summarize(latencies, duration, statuses)
+    summary["orders_per_s"] = round(statuses[200] / duration, 2)
+    transactions = after.get("transactions", 0) - before.get("transactions", 0)
+    retries = after.get("retries", 0) - before.get("retries", 0)
+    if transactions:
+        summary["transactions"] = transactions
+        summary["transaction_retries"] = retries
+        summary["retries_per_transaction"] = round(retries / transactions, 4)
+
+    print(
+        f"threads={args.threads} orders={args.orders} products={args.products} "
+        f"stock={args.stock} skew={args.skew} shards={args.shards}"
+    )
+    results = {"place": summary}
+    print_report(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Throughput of the orders listener against a local SMTP sink.
+
+Imports the listener in-process, points it at a local SMTP sink and the
+Firestore emulator, and times single-event invocations against batched ones:
+
+    python benchmarks/listener_bench.py --events 1000 --batch-sizes 1,10,50
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from report import compare_to_baseline, print_report, save_baseline, summarize
+from smtp_sink import SMTPSink
+
+LISTENER_ROOT = Path(__file__).resolve().parent.parent / "services" / "orders_listener"
+
+
+def _event(buyer_email: str, product_id: str) -> dict:
+    return {
+        "value": {
+            "fields": {
+                "buyer_email": {"stringValue": buyer_email},
+                "product_id": {"stringValue": product_id},
+            }
+        }
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emulator-host", default="localhost:8080")
+    parser.add_argument(
+        "--project",
+        default=os.getenv("GCP_PROJECT_ID", "demo-inventory"),
+        help="emulator project, the one `make docker-up` runs the API as",
+    )
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--buyers", type=int, default=50)
+    parser.add_argument("--batch-sizes", default="1,10,50")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    sink = SMTPSink().start()
+    host, port = sink.server_address
+    os.environ.update(
+        {
+            "FIRESTORE_EMULATOR_HOST": args.emulator_host,
+            "GCP_PROJECT_ID": args.project,
+            "SMTP_HOST": host,
+            "SMTP_PORT": str(port),
+            "SMTP_FROM": "bench@example.com",
+            "SMTP_USE_TLS": "false",
+            "SMTP_USER": "",
+            "SMTP_PASSWORD": "",
+        }
+    )
+    sys.path.insert(0, str(LISTENER_ROOT))
+    from src import catalog
+    from src import main as listener
+    from src.firestore_client import get_db
+
+    products = get_db().collection("Products")
+    product_ids = [f"bench-listener-{i}" for i in range(args.products)]
+    for product_id in product_ids:
+        products.document(product_id).set({"product_name": f"Bench {product_id}"})
+    events = [
+        _event(f"buyer{i % args.buyers}@example.com", product_ids[i % args.products])
+        for i in range(args.events)
+    ]
+
+    results = {}
+    for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+        catalog.clear_cache()
+        sessions, messages = sink.sessions, sink.messages
+        latencies = []
+        started = time.perf_counter()
+        for i in range(0, len(events), batch_size):
+            chunk = events[i : i + batch_size]
+            call_started = time.perf_counter()
+            if batch_size == 1:
+                listener.orders_listener(chunk[0], None)
+            else:
+                listener.orders_listener_batch(chunk)
+            latencies.append(time.perf_counter() - call_started)
+        duration = time.perf_counter() - started
+
+        summary = summarize(latencies, duration, {"ok": len(latencies)})
+        summary["events_per_s"] = round(len(events) / duration, 2)
+        summary["emails"] = sink.messages - messages
+        summary["smtp_sessions"] = sink.sessions - sessions
+        summary["product_cache"] = catalog.cache_stats()
+        results[f"batch_{batch_size}"] = summary
+
+    sink.stop()
+    print(f"events={args.events} products={args.products} buyers={args.buyers}")
+    print_report(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
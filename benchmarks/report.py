@@ -0,0 +1,82 @@
+"""Latency/throughput summaries and baseline comparison for the benchmarks."""
+
+import json
+import math
+from pathlib import Path
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "requests_per_s": True,
+    "orders_per_s": True,
+    "events_per_s": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "error_rate": False,
+    "retries_per_transaction": False,
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(latencies: list[float], duration: float, statuses: dict) -> dict:
+    """Summary of one phase: ``latencies`` in seconds, ``statuses`` maps
+    HTTP status (or error name) to a count."""
+    values = sorted(latencies)
+    count = len(values)
+    errors = sum(
+        n for status, n in statuses.items() if not str(status).startswith(("2", "4"))
+    )
+    return {
+        "requests": count,
+        "duration_s": round(duration, 3),
+        "requests_per_s": round(count / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+    }
+
+
+def print_report(results: dict) -> None:
+    for phase, summary in results.items():
+        print(f"\n== {phase}")
+        for metric, value in summary.items():
+            print(f"  {metric:<26} {value}")
+
+
+def save_baseline(results: dict, path: str) -> None:
+    Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    print(f"\nBaseline saved to {path}")
+
+
+def compare_to_baseline(results: dict, path: str, tolerance: float) -> list[str]:
+    """Print every compared metric next to the baseline; return the ones that
+    got worse by more than ``tolerance`` (a fraction of the baseline)."""
+    baseline = json.loads(Path(path).read_text())
+    regressions = []
+    print(f"\n== compared to {path} (tolerance {tolerance:.0%})")
+    for phase, summary in results.items():
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in summary or metric not in baseline.get(phase, {}):
+                continue
+            old, new = baseline[phase][metric], summary[metric]
+            if old:
+                change = (new - old) / old
+            else:
+                change = math.inf if new > old else 0.0
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > tolerance else ""
+            if flag:
+                regressions.append(f"{phase}.{metric}")
+            print(
+                f"  {phase + '.' + metric:<40} {old:>10} -> {new:>10} ({change:+.1%}) {flag}"
+            )
+    return regressions
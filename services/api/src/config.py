@@ -19,3 +19,114 @@ GCP_PROJECT_ID = _required("GCP_PROJECT_ID")
 JWT_SECRET = _required("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRES_MINUTES = int(os.getenv("JWT_EXPIRES_MINUTES", "60"))
+
+# Serve requests with firestore.AsyncClient on the event loop instead of the
+# blocking client on FastAPI's threadpool.
+FIRESTORE_ASYNC = os.getenv("FIRESTORE_ASYNC", "false").lower() == "true"
+
+# Number of Firestore clients (one gRPC channel each) shared by the worker
+# threads of the sync path.
+FIRESTORE_CHANNEL_POOL_SIZE = max(int(os.getenv("FIRESTORE_CHANNEL_POOL_SIZE", "1")), 1)
+
+# "google" talks to Firestore (or its emulator); "memory" keeps every
+# collection in this process (src/services/memory_firestore.py), for tests
+# and contention benchmarks. Data is lost on restart.
+FIRESTORE_ENGINE = os.getenv("FIRESTORE_ENGINE", "google")
+
+# argon2 cost parameters (passlib defaults) and the worker pool that runs
+# hash/verify off the request threads. At most HASH_WORKERS + HASH_QUEUE_SIZE
+# jobs are admitted; the rest are answered with 503 + Retry-After.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "32"))
+HASH_RETRY_AFTER_SECONDS = int(os.getenv("HASH_RETRY_AFTER_SECONDS", "1"))
+
+# Verified JWT claims cache (0 disables). Entries never outlive the token's
+# own exp claim.
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+JWT_CACHE_TTL_SECONDS = int(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))
+
+# Short-TTL cache behind GET /products. Stock changes made by this instance
+# evict it right away; the TTL bounds staleness from other instances.
+PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", "1000"))
+PRODUCT_CACHE_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "2"))
+
+# How long an Idempotency-Key on POST /orders/place replays its first result.
+# Firestore's TTL policy on IdempotencyKeys.expires_at deletes expired keys.
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+
+# Stock reservations: how long a hold lasts before the sweeper puts it back
+# into stock, and how often (0 disables) and in what batches the API sweeps.
+RESERVATION_TTL_SECONDS = int(os.getenv("RESERVATION_TTL_SECONDS", "600"))
+RESERVATION_SWEEP_INTERVAL_SECONDS = int(
+    os.getenv("RESERVATION_SWEEP_INTERVAL_SECONDS", "30")
+)
+RESERVATION_SWEEP_BATCH_SIZE = int(os.getenv("RESERVATION_SWEEP_BATCH_SIZE", "100"))
+
+# Group commit for POST /orders/place: requests are queued in-process and a
+# single writer places each product's queued orders in one transaction. It
+# collects up to ORDER_GROUP_COMMIT_MAX_BATCH requests, waiting at most
+# ORDER_GROUP_COMMIT_WAIT_MS for more; beyond ORDER_GROUP_COMMIT_QUEUE_SIZE
+# waiting requests the API answers 503.
+ORDER_GROUP_COMMIT = os.getenv("ORDER_GROUP_COMMIT", "false").lower() == "true"
+ORDER_GROUP_COMMIT_MAX_BATCH = int(os.getenv("ORDER_GROUP_COMMIT_MAX_BATCH", "100"))
+ORDER_GROUP_COMMIT_WAIT_MS = int(os.getenv("ORDER_GROUP_COMMIT_WAIT_MS", "2"))
+ORDER_GROUP_COMMIT_QUEUE_SIZE = int(os.getenv("ORDER_GROUP_COMMIT_QUEUE_SIZE", "1000"))
+
+# OTLP/HTTP collector for traces, e.g. http://localhost:4318 (unset disables
+# export). The exporter reads the standard OTEL_* variables itself.
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "inventory-api")
+
+# Logging: records go through a queue to a background thread that writes JSON
+# lines to stdout. Records beyond LOG_QUEUE_SIZE are dropped rather than
+# blocking the request. LOG_SAMPLE_RATES keeps a fraction of DEBUG/INFO
+# records per route prefix, e.g. "/orders/place=0.1,/products=0.01".
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+# Token-bucket rate limits: *_RATE requests per second refill a bucket of
+# *_BURST tokens; a rate of 0 disables that limit. Buckets live in process
+# memory, or in Redis (or a Redis-compatible server) shared by all instances.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_AUTH_IP_RATE = float(os.getenv("RATE_LIMIT_AUTH_IP_RATE", "0"))
+RATE_LIMIT_AUTH_IP_BURST = int(os.getenv("RATE_LIMIT_AUTH_IP_BURST", "20"))
+# Proxies in front of the API that each append the address they saw to
+# X-Forwarded-For (1 on Cloud Run). The client IP is the entry the outermost
+# of them added; anything before it is client-supplied. 0 uses the socket peer.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+RATE_LIMIT_ORDER_USER_RATE = float(os.getenv("RATE_LIMIT_ORDER_USER_RATE", "0"))
+RATE_LIMIT_ORDER_USER_BURST = int(os.getenv("RATE_LIMIT_ORDER_USER_BURST", "20"))
+RATE_LIMIT_ORDER_PRODUCT_RATE = float(os.getenv("RATE_LIMIT_ORDER_PRODUCT_RATE", "0"))
+RATE_LIMIT_ORDER_PRODUCT_BURST = int(os.getenv("RATE_LIMIT_ORDER_PRODUCT_BURST", "200"))
+
+# Load shedding: requests in flight per process on the auth and order routes
+# beyond which new ones get 503 before any work starts (0 disables).
+MAX_INFLIGHT_AUTH = int(os.getenv("MAX_INFLIGHT_AUTH", "0"))
+MAX_INFLIGHT_ORDERS = int(os.getenv("MAX_INFLIGHT_ORDERS", "0"))
+
+# Per-product admission for POST /orders/place: at most
+# ORDER_ADMISSION_MAX_INFLIGHT transactions per product reach Firestore at
+# once (0 disables); others wait up to ORDER_ADMISSION_WAIT_MS, then get 503.
+# Products flagged in the sold-out cache below fail fast, queued or not.
+ORDER_ADMISSION_MAX_INFLIGHT = int(os.getenv("ORDER_ADMISSION_MAX_INFLIGHT", "0"))
+ORDER_ADMISSION_WAIT_MS = int(os.getenv("ORDER_ADMISSION_WAIT_MS", "500"))
+
+# Negative cache of sold-out products: orders for them fail before any
+# Firestore read (a size of 0 disables it). Entries expire after the TTL; with
+# SOLD_OUT_CACHE_WATCH a snapshot listener on out-of-stock products also
+# flags and clears them as soon as any instance changes a product's status,
+# so the TTL can be longer.
+SOLD_OUT_CACHE_SIZE = int(os.getenv("SOLD_OUT_CACHE_SIZE", "10000"))
+SOLD_OUT_CACHE_TTL_SECONDS = float(os.getenv("SOLD_OUT_CACHE_TTL_SECONDS", "1"))
+SOLD_OUT_CACHE_WATCH = os.getenv("SOLD_OUT_CACHE_WATCH", "false").lower() == "true"
+
+# POST /products/restock: products adjusted per transaction (every product
+# costs one read and up to a few writes, within Firestore's 500-write limit)
+# and how many of those transactions run at once.
+RESTOCK_BATCH_SIZE = min(max(int(os.getenv("RESTOCK_BATCH_SIZE", "100")), 1), 100)
+RESTOCK_WORKERS = max(int(os.getenv("RESTOCK_WORKERS", "4")), 1)
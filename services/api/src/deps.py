@@ -1,12 +1,55 @@
-from fastapi import Depends, HTTPException, status
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
+from src.config import TRUSTED_PROXY_HOPS
 from src.security.jwt import decode_token
+from src.security.rate_limit import ConcurrencyLimiter, rate_limiter
 
 security = HTTPBearer()
 
 
-def require_user(creds=Depends(security)):
+async def require_user(creds=Depends(security)):
     payload = decode_token(creds.credentials)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
     return payload
+
+
+# Claims of the authenticated caller, as a route parameter annotation
+CurrentUser = Annotated[dict, Depends(require_user)]
+
+
+async def require_admin(user: CurrentUser):
+    if user.get("role") != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    return user
+
+
+def client_ip(request: Request) -> str:
+    """The caller's address, as seen by the outermost trusted proxy."""
+    if TRUSTED_PROXY_HOPS:
+        forwarded = request.headers.get("x-forwarded-for", "").split(",")
+        hops = [hop.strip() for hop in forwarded if hop.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_ip(scope: str):
+    """Dependency spending one ``scope`` token for the client's IP."""
+
+    async def check(request: Request):
+        await rate_limiter.hit(scope, client_ip(request))
+
+    return check
+
+
+def shed(slots: ConcurrencyLimiter):
+    """Dependency holding one of ``slots`` for the whole request."""
+
+    async def hold():
+        with slots.slot():
+            yield
+
+    return hold
@@ -1,8 +1,139 @@
-from fastapi import FastAPI
-from src.routers import health, auth, orders
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="Inventory API")
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 
-app.include_router(health.router)
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
-app.include_router(orders.router, prefix="/orders", tags=["orders"])
+from src.config import HASH_RETRY_AFTER_SECONDS, RESERVATION_SWEEP_INTERVAL_SECONDS
+from src.routers import auth, health, orders, products, reservations
+from src.security.password import HashingBusyError
+from src.security.rate_limit import (
+    OverloadedError,
+    RateLimitedError,
+    rate_limiter,
+    retry_after_header,
+)
+from src.services import sold_out
+from src.services.firestore import close_async_db, close_db
+from src.services.order_queue import OrderQueueFullError, close_order_queue
+from src.services.reservations import release_expired
+from src.utils.logging import current_route, get_logger, setup_logging, stop_logging
+from src.utils.metrics import REQUEST_LATENCY, timed
+from src.utils.tracing import setup_tracing, shutdown_tracing
+
+logger = get_logger(__name__)
+
+
+async def _sweep_reservations():
+    while True:
+        await asyncio.sleep(RESERVATION_SWEEP_INTERVAL_SECONDS)
+        try:
+            released = await run_in_threadpool(release_expired)
+        except Exception:
+            logger.exception("Reservation sweep failed")
+            continue
+        if released:
+            logger.info("Released %d expired reservations", released)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    setup_tracing()
+    await run_in_threadpool(sold_out.start_watch)
+    sweeper = None
+    if RESERVATION_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = asyncio.create_task(_sweep_reservations())
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sweeper
+    await run_in_threadpool(close_order_queue)
+    sold_out.stop_watch()
+    close_db()
+    await close_async_db()
+    await rate_limiter.backend.close()
+    shutdown_tracing()
+    stop_logging()
+
+
+app = FastAPI(title="Inventory API", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    with timed(
+        REQUEST_LATENCY,
+        "http.request",
+        method=request.method,
+        route="unmatched",
+        status="500",
+    ) as labels:
+        token = current_route.set(request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            current_route.reset(token)
+        labels["route"] = _route_templates.get(
+            request.scope.get("endpoint"), "unmatched"
+        )
+        labels["status"] = str(response.status_code)
+        return response
+
+
+@app.exception_handler(HashingBusyError)
+async def hashing_busy(request: Request, exc: HashingBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, retry later"},
+        headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+@app.exception_handler(RateLimitedError)
+async def rate_limited(request: Request, exc: RateLimitedError):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests"},
+        headers={"Retry-After": retry_after_header(exc.retry_after)},
+    )
+
+
+@app.exception_handler(OverloadedError)
+async def overloaded(request: Request, exc: OverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(OrderQueueFullError)
+async def order_queue_full(request: Request, exc: OrderQueueFullError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Full route template per endpoint, used as the latency label instead of the
+# raw path to bound cardinality. Recorded here because newer FastAPI versions
+# only put the router-relative path on scope["route"].
+_route_templates = {}
+
+
+def _include(router, prefix: str = "", **kwargs) -> None:
+    app.include_router(router, prefix=prefix, **kwargs)
+    for route in router.routes:
+        _route_templates[route.endpoint] = prefix + route.path
+
+
+_include(health.router)
+_include(auth.router, prefix="/auth", tags=["auth"])
+_include(orders.router, prefix="/orders", tags=["orders"])
+_include(products.router, prefix="/products", tags=["products"])
+_include(reservations.router, prefix="/reservations", tags=["reservations"])
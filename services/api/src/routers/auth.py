@@ -1,10 +1,22 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 
-from src.services.users import create_user, authenticate_user
+from src.config import FIRESTORE_ASYNC
+from src.deps import rate_limit_ip, shed
+from src.security.rate_limit import auth_slots
+from src.services.users import (
+    authenticate_user,
+    authenticate_user_async,
+    create_user,
+    create_user_async,
+)
 from src.security.jwt import create_token
 
-router = APIRouter()
+# Shed and rate limit before any argon2 work is queued
+router = APIRouter(
+    dependencies=[Depends(shed(auth_slots)), Depends(rate_limit_ip("auth_ip"))]
+)
 
 
 class RegisterRequest(BaseModel):
@@ -18,16 +30,22 @@ class LoginRequest(BaseModel):
 
 
 @router.post("/register")
-def register(req: RegisterRequest):
-    create_user(req.email, req.password)
+async def register(req: RegisterRequest):
+    if FIRESTORE_ASYNC:
+        await create_user_async(req.email, req.password)
+    else:
+        await run_in_threadpool(create_user, req.email, req.password)
     return {"message": "user created"}
 
 
 @router.post("/login")
-def login(req: LoginRequest):
-    user_id = authenticate_user(req.email, req.password)
-    if not user_id:
+async def login(req: LoginRequest):
+    if FIRESTORE_ASYNC:
+        claims = await authenticate_user_async(req.email, req.password)
+    else:
+        claims = await run_in_threadpool(authenticate_user, req.email, req.password)
+    if not claims:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_token({"sub": user_id, "email": req.email})
+    token = create_token({**claims, "email": req.email})
     return {"access_token": token}
@@ -1,8 +1,30 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from src.security.jwt import token_cache_stats
+from src.services import sold_out
+from src.services.admission import admission
+from src.utils.metrics import render_metrics
+from src.utils.stats import txn_stats
 
 router = APIRouter()
 
 
 @router.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
+
+
+@router.get("/health/stats")
+async def stats():
+    return {
+        "transactions": txn_stats.snapshot(),
+        "admission": admission.snapshot(),
+        "sold_out_cache": sold_out.stats(),
+        "jwt_cache": token_cache_stats(),
+    }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
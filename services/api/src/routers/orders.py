@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, EmailStr
+import asyncio
 
-from src.deps import require_user
-from src.services.inventory import place_order
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, EmailStr, Field
 
-router = APIRouter()
+from src.config import FIRESTORE_ASYNC, ORDER_GROUP_COMMIT
+from src.deps import CurrentUser, shed
+from src.security.rate_limit import order_slots, rate_limiter
+from src.services.admission import SoldOutError, admission
+from src.services.inventory import (
+    IdempotencyKeyReused,
+    InvalidCursor,
+    list_user_orders,
+    list_user_orders_async,
+    place_cart_order,
+    place_cart_order_async,
+    place_order,
+    place_order_async,
+)
+from src.services.order_queue import submit_order
+
+router = APIRouter(dependencies=[Depends(shed(order_slots))])
 
 
 class PlaceOrderRequest(BaseModel):
@@ -12,9 +28,104 @@ class PlaceOrderRequest(BaseModel):
     product_id: str
 
 
+class CartItem(BaseModel):
+    product_id: str
+    quantity: int = Field(default=1, ge=1)
+
+
+class PlaceCartOrderRequest(BaseModel):
+    buyer_email: EmailStr
+    # Every line item costs at least one write in the order transaction
+    items: list[CartItem] = Field(min_length=1, max_length=100)
+
+
+@router.get("")
+async def list_(
+    user: CurrentUser,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+):
+    try:
+        if FIRESTORE_ASYNC:
+            orders, next_cursor = await list_user_orders_async(
+                user["sub"], limit, cursor
+            )
+        else:
+            orders, next_cursor = await run_in_threadpool(
+                list_user_orders, user["sub"], limit, cursor
+            )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"orders": orders, "next_cursor": next_cursor}
+
+
 @router.post("/place")
-def place(req: PlaceOrderRequest, user=Depends(require_user)):
-    success = place_order(req.buyer_email, req.product_id)
+async def place(
+    req: PlaceOrderRequest,
+    user: CurrentUser,
+    idempotency_key: str | None = Header(default=None, max_length=255),
+):
+    await _admit(user, [req.product_id])
+    # Keys are scoped to the caller so two users can never collide
+    key = f"{user['sub']}:{idempotency_key}" if idempotency_key else None
+    try:
+        # Keyed requests need their own transaction to record the key
+        if ORDER_GROUP_COMMIT and key is None:
+            success = await asyncio.wrap_future(
+                submit_order(req.buyer_email, req.product_id, user["sub"])
+            )
+        else:
+            # A replay must return its recorded result, never the sold-out flag
+            async with admission.slot(req.product_id, fail_fast=key is None):
+                success = await _place_order(
+                    req.buyer_email, req.product_id, key, user["sub"]
+                )
+    except SoldOutError:
+        success = False
+    except IdempotencyKeyReused:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different request",
+        )
     if not success:
         raise HTTPException(status_code=409, detail="Out of stock")
     return {"status": "order placed"}
+
+
+@router.post("/cart")
+async def place_cart(req: PlaceCartOrderRequest, user: CurrentUser):
+    items: dict[str, int] = {}
+    for item in req.items:
+        items[item.product_id] = items.get(item.product_id, 0) + item.quantity
+    await _admit(user, list(items))
+
+    if FIRESTORE_ASYNC:
+        failures = await place_cart_order_async(
+            req.buyer_email, items, user_id=user["sub"]
+        )
+    else:
+        failures = await run_in_threadpool(
+            place_cart_order, req.buyer_email, items, user_id=user["sub"]
+        )
+    if failures:
+        raise HTTPException(
+            status_code=409, detail={"message": "Out of stock", "items": failures}
+        )
+    return {"status": "order placed"}
+
+
+async def _place_order(
+    buyer_email: str, product_id: str, key: str | None, user_id: str
+) -> bool:
+    if FIRESTORE_ASYNC:
+        return await place_order_async(buyer_email, product_id, key, user_id=user_id)
+    return await run_in_threadpool(
+        place_order, buyer_email, product_id, key, user_id=user_id
+    )
+
+
+async def _admit(user: dict, product_ids: list[str]) -> None:
+    """Apply the per-user and per-product rate limits before any reads."""
+    await rate_limiter.hit("order_user", user["sub"])
+    for product_id in product_ids:
+        await rate_limiter.hit("order_product", product_id)
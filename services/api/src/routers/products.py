@@ -0,0 +1,90 @@
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from src.config import FIRESTORE_ASYNC
+from src.deps import require_admin
+from src.services.inventory import (
+    InvalidCursor,
+    get_product,
+    get_product_async,
+    list_products,
+    list_products_async,
+)
+from src.services.restock import restock, restock_async
+
+router = APIRouter()
+
+
+class RestockItem(BaseModel):
+    product_id: str
+    delta: int
+
+
+class RestockRequest(BaseModel):
+    items: list[RestockItem] = Field(min_length=1, max_length=5000)
+
+
+def _conditional_response(request: Request, body) -> Response:
+    """JSON response with a strong ETag; 304 if the client already has it."""
+    content = jsonable_encoder(body)
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    etag = f'"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content, headers={"ETag": etag})
+
+
+@router.get("")
+async def list_(
+    request: Request,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+):
+    try:
+        if FIRESTORE_ASYNC:
+            products, next_cursor = await list_products_async(limit, cursor)
+        else:
+            products, next_cursor = await run_in_threadpool(
+                list_products, limit, cursor
+            )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return _conditional_response(
+        request, {"products": products, "next_cursor": next_cursor}
+    )
+
+
+@router.get("/{product_id}")
+async def get(request: Request, product_id: str):
+    if FIRESTORE_ASYNC:
+        product = await get_product_async(product_id)
+    else:
+        product = await run_in_threadpool(get_product, product_id)
+    if product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return _conditional_response(request, product)
+
+
+@router.post("/restock", dependencies=[Depends(require_admin)])
+async def restock_(req: RestockRequest):
+    items: dict[str, int] = {}
+    for item in req.items:
+        items[item.product_id] = items.get(item.product_id, 0) + item.delta
+
+    if FIRESTORE_ASYNC:
+        results = await restock_async(items)
+    else:
+        results = await run_in_threadpool(restock, items)
+    return {
+        "results": results,
+        "failed": sum(1 for result in results if result["result"] != "ok"),
+    }
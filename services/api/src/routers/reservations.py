@@ -0,0 +1,69 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, EmailStr, Field
+
+from src.config import FIRESTORE_ASYNC
+from src.deps import CurrentUser
+from src.routers.orders import CartItem
+from src.services.reservations import (
+    confirm,
+    confirm_async,
+    release,
+    release_async,
+    reserve,
+    reserve_async,
+)
+
+router = APIRouter()
+
+
+class ReserveRequest(BaseModel):
+    buyer_email: EmailStr
+    items: list[CartItem] = Field(min_length=1, max_length=100)
+
+
+@router.post("", status_code=201)
+async def create(req: ReserveRequest, user: CurrentUser):
+    items: dict[str, int] = {}
+    for item in req.items:
+        items[item.product_id] = items.get(item.product_id, 0) + item.quantity
+
+    if FIRESTORE_ASYNC:
+        reservation_id, failures = await reserve_async(
+            req.buyer_email, user["sub"], items
+        )
+    else:
+        reservation_id, failures = await run_in_threadpool(
+            reserve, req.buyer_email, user["sub"], items
+        )
+    if failures:
+        raise HTTPException(
+            status_code=409, detail={"message": "Out of stock", "items": failures}
+        )
+    return {"reservation_id": reservation_id, "status": "held"}
+
+
+@router.post("/{reservation_id}/confirm")
+async def confirm_(reservation_id: str, user: CurrentUser):
+    if FIRESTORE_ASYNC:
+        status, order_id = await confirm_async(reservation_id, user["sub"])
+    else:
+        status, order_id = await run_in_threadpool(confirm, reservation_id, user["sub"])
+    if status == "not_found":
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    if status != "confirmed":
+        raise HTTPException(status_code=409, detail=f"Reservation {status}")
+    return {"status": "order placed", "order_id": order_id}
+
+
+@router.delete("/{reservation_id}")
+async def release_(reservation_id: str, user: CurrentUser):
+    if FIRESTORE_ASYNC:
+        status = await release_async(reservation_id, user["sub"])
+    else:
+        status = await run_in_threadpool(release, reservation_id, user["sub"])
+    if status == "not_found":
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    if status == "confirmed":
+        raise HTTPException(status_code=409, detail="Reservation confirmed")
+    return {"status": status}
@@ -1,6 +1,24 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from jose import jwt
-from src.config import JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRES_MINUTES
+from src.config import (
+    JWT_ALGORITHM,
+    JWT_CACHE_SIZE,
+    JWT_CACHE_TTL_SECONDS,
+    JWT_EXPIRES_MINUTES,
+    JWT_SECRET,
+)
+from src.utils.cache import TTLCache
+from src.utils.metrics import JWT_DECODE_SECONDS, timed
+
+# Claims of tokens that already passed signature and expiry checks, keyed by
+# the SHA-256 of the token so raw bearer tokens are never kept in memory.
+_token_cache = TTLCache(JWT_CACHE_SIZE, JWT_CACHE_TTL_SECONDS)
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 def create_token(data: dict) -> str:
@@ -10,7 +28,34 @@ def create_token(data: dict) -> str:
 
 
 def decode_token(token: str):
+    with timed(JWT_DECODE_SECONDS, cache="miss") as labels:
+        return _decode_token(token, labels)
+
+
+def _decode_token(token: str, labels: dict):
+    key = _digest(token)
+    claims = _token_cache.get(key)
+    if claims is not None:
+        # Re-check exp against the wall clock on every hit
+        if claims.get("exp", float("inf")) > time.time():
+            labels["cache"] = "hit"
+            return dict(claims)
+        _token_cache.pop(key)
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except Exception:
         return None
+
+    exp = claims.get("exp")
+    _token_cache.set(key, claims, ttl=None if exp is None else exp - time.time())
+    return dict(claims)
+
+
+def forget_token(token: str) -> None:
+    """Drop a token from the cache, e.g. right after revoking it."""
+    _token_cache.pop(_digest(token))
+
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
@@ -1,11 +1,70 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd = CryptContext(schemes=["argon2"], deprecated="auto")
+from src.config import (
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    ARGON2_TIME_COST,
+    HASH_QUEUE_SIZE,
+    HASH_WORKERS,
+)
+from src.utils.metrics import PASSWORD_HASH_SECONDS, timed
+
+pwd = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+# argon2-cffi releases the GIL while hashing, so a thread pool is enough to
+# keep the CPU work off the request threads and the event loop.
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="argon2")
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_SIZE)
+
+
+class HashingBusyError(Exception):
+    pass
+
+
+def _submit(fn, *args) -> Future:
+    if not _slots.acquire(blocking=False):
+        raise HashingBusyError("password hashing pool is saturated")
+    try:
+        future = _executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+# Timed on the worker so the histogram shows argon2 cost, not queueing
+def _hash(p: str) -> str:
+    with timed(PASSWORD_HASH_SECONDS, operation="hash"):
+        return pwd.hash(p)
+
+
+def _verify(p: str, h: str) -> bool:
+    with timed(PASSWORD_HASH_SECONDS, operation="verify"):
+        return pwd.verify(p, h)
 
 
 def hash_password(p: str) -> str:
-    return pwd.hash(p)
+    return _submit(_hash, p).result()
 
 
 def verify_password(p: str, h: str) -> bool:
-    return pwd.verify(p, h)
+    return _submit(_verify, p, h).result()
+
+
+async def hash_password_async(p: str) -> str:
+    return await asyncio.wrap_future(_submit(_hash, p))
+
+
+async def verify_password_async(p: str, h: str) -> bool:
+    return await asyncio.wrap_future(_submit(_verify, p, h))
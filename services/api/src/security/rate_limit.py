@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from src.config import (
+    MAX_INFLIGHT_AUTH,
+    MAX_INFLIGHT_ORDERS,
+    RATE_LIMIT_AUTH_IP_BURST,
+    RATE_LIMIT_AUTH_IP_RATE,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_ORDER_PRODUCT_BURST,
+    RATE_LIMIT_ORDER_PRODUCT_RATE,
+    RATE_LIMIT_ORDER_USER_BURST,
+    RATE_LIMIT_ORDER_USER_RATE,
+    RATE_LIMIT_REDIS_URL,
+)
+from src.utils.logging import get_logger
+from src.utils.metrics import REQUESTS_REJECTED
+
+logger = get_logger(__name__)
+
+
+class RateLimitedError(Exception):
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"rate limit exceeded: {scope}")
+        self.retry_after = retry_after
+
+
+class OverloadedError(Exception):
+    pass
+
+
+class MemoryBackend:
+    """Token buckets in process memory, least recently used evicted first.
+
+    An evicted bucket comes back full, so ``max_keys`` only needs to cover
+    the keys active within one refill period.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; return 0 or the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    async def close(self) -> None:
+        pass
+
+
+# Same bucket as MemoryBackend, updated atomically on the server with the
+# server's clock. Returned as a string: Lua numbers become integer replies.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Token buckets shared by every instance through a Redis server."""
+
+    def __init__(self, url: str):
+        # Optional dependency: only needed with RATE_LIMIT_BACKEND=redis
+        import redis.asyncio
+
+        self._client = redis.asyncio.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        return float(await self._take(keys=[f"ratelimit:{key}"], args=[rate, burst]))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """Named token-bucket limits, each keyed by e.g. IP, user or product."""
+
+    def __init__(self, backend, limits: dict[str, tuple[float, int]]):
+        self.backend = backend
+        self.limits = limits
+
+    async def hit(self, scope: str, key: str) -> None:
+        """Spend one request of ``scope`` for ``key``.
+
+        Raises RateLimitedError when the bucket is empty. If the backend is
+        unreachable the request is let through.
+        """
+        rate, burst = self.limits.get(scope, (0, 0))
+        if rate <= 0:
+            return
+        try:
+            wait = await self.backend.take(f"{scope}:{key}", rate, burst)
+        except Exception:
+            logger.exception("Rate limit backend failed for %s", scope)
+            return
+        if wait > 0:
+            REQUESTS_REJECTED.labels(reason=f"rate_limit:{scope}").inc()
+            raise RateLimitedError(scope, wait)
+
+
+class ConcurrencyLimiter:
+    """Sheds requests beyond ``limit`` in flight (0 disables).
+
+    Only used from the event loop, so a plain counter is enough.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.inflight = 0
+
+    @contextmanager
+    def slot(self):
+        if self.limit and self.inflight >= self.limit:
+            REQUESTS_REJECTED.labels(reason=f"overloaded:{self.name}").inc()
+            raise OverloadedError(f"too many {self.name} requests in flight")
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def _build_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(RATE_LIMIT_REDIS_URL)
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryBackend()
+    raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND}")
+
+
+rate_limiter = RateLimiter(
+    _build_backend(),
+    {
+        "auth_ip": (RATE_LIMIT_AUTH_IP_RATE, RATE_LIMIT_AUTH_IP_BURST),
+        "order_user": (RATE_LIMIT_ORDER_USER_RATE, RATE_LIMIT_ORDER_USER_BURST),
+        "order_product": (
+            RATE_LIMIT_ORDER_PRODUCT_RATE,
+            RATE_LIMIT_ORDER_PRODUCT_BURST,
+        ),
+    },
+)
+auth_slots = ConcurrencyLimiter("auth", MAX_INFLIGHT_AUTH)
+order_slots = ConcurrencyLimiter("orders", MAX_INFLIGHT_ORDERS)
@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.config import ORDER_ADMISSION_MAX_INFLIGHT, ORDER_ADMISSION_WAIT_MS
+from src.security.rate_limit import OverloadedError
+from src.services import sold_out
+from src.utils.metrics import ORDER_ADMISSION_WAITING, REQUESTS_REJECTED
+
+
+class SoldOutError(Exception):
+    pass
+
+
+class _Gate:
+    def __init__(self, max_inflight: int):
+        self.semaphore = asyncio.Semaphore(max_inflight)
+        self.inflight = 0
+        self.waiting = 0
+
+
+class ProductAdmission:
+    """Caps the order transactions in flight per product.
+
+    Firestore transactions on one document abort each other, so beyond a
+    few concurrent ones per product extra requests only add retries. The
+    rest queue in-process instead. Used from the event loop only.
+
+    Products flagged in the ``sold_out`` cache fail fast, including requests
+    that were already queued when the flag was set.
+    """
+
+    def __init__(self, max_inflight: int, wait: float):
+        self.max_inflight = max_inflight
+        self.wait = wait
+        self._gates: dict[str, _Gate] = {}
+
+    def _check_sold_out(self, product_id: str) -> None:
+        if sold_out.is_sold_out(product_id):
+            raise SoldOutError(product_id)
+
+    def _release_gate(self, product_id: str, gate: _Gate) -> None:
+        if not gate.inflight and not gate.waiting:
+            self._gates.pop(product_id, None)
+
+    @asynccontextmanager
+    async def slot(self, product_id: str, fail_fast: bool = True):
+        """Hold one of ``product_id``'s transaction slots.
+
+        Raises OverloadedError if none frees up in time and, with
+        ``fail_fast``, SoldOutError while the product is flagged sold out.
+        """
+        if not self.max_inflight:
+            yield
+            return
+
+        if fail_fast:
+            self._check_sold_out(product_id)
+        gate = self._gates.get(product_id)
+        if gate is None:
+            gate = self._gates[product_id] = _Gate(self.max_inflight)
+
+        gate.waiting += 1
+        ORDER_ADMISSION_WAITING.inc()
+        try:
+            await asyncio.wait_for(gate.semaphore.acquire(), self.wait)
+            gate.inflight += 1
+        except TimeoutError:
+            REQUESTS_REJECTED.labels(reason="admission_timeout").inc()
+            raise OverloadedError(f"too many orders queued for {product_id}")
+        finally:
+            gate.waiting -= 1
+            ORDER_ADMISSION_WAITING.dec()
+            self._release_gate(product_id, gate)
+
+        try:
+            # The flag may have been set while this request was queued
+            if fail_fast:
+                self._check_sold_out(product_id)
+            yield
+        finally:
+            gate.inflight -= 1
+            gate.semaphore.release()
+            self._release_gate(product_id, gate)
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """Transactions in flight and requests queued, per busy product."""
+        return {
+            product_id: {"inflight": gate.inflight, "waiting": gate.waiting}
+            for product_id, gate in self._gates.items()
+        }
+
+
+admission = ProductAdmission(
+    ORDER_ADMISSION_MAX_INFLIGHT, ORDER_ADMISSION_WAIT_MS / 1000
+)
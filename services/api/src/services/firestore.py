@@ -1,15 +1,116 @@
+import itertools
+import threading
+
 from google.cloud import firestore
 
-db = firestore.Client()
+from src.config import FIRESTORE_CHANNEL_POOL_SIZE, FIRESTORE_ENGINE, GCP_PROJECT_ID
+
+_lock = threading.Lock()
+_local = threading.local()
+_next_client = itertools.count()
+_pool: list = []
+_async_db = None
+
+
+def _engine():
+    if FIRESTORE_ENGINE == "memory":
+        from src.services import memory_firestore
+
+        return memory_firestore
+    if FIRESTORE_ENGINE == "google":
+        return firestore
+    raise RuntimeError(f"Unknown FIRESTORE_ENGINE: {FIRESTORE_ENGINE}")
+
+
+def _close_transport(client):
+    # firestore.Client has no close(); the gRPC channel lives on the lazily
+    # built GAPIC client, which only exists once the client made a call.
+    api = getattr(client, "_firestore_api_internal", None)
+    return api.transport.close() if api is not None else None
+
+
+def get_db():
+    """Process-wide Firestore client, created on first use.
+
+    The pool holds FIRESTORE_CHANNEL_POOL_SIZE clients, each with its own
+    gRPC channel; every worker thread sticks to one of them.
+    """
+    global _pool
+    pool = _pool
+    if getattr(_local, "pool", None) is not pool or not pool:
+        with _lock:
+            if not _pool:
+                _pool = [
+                    _engine().Client(project=GCP_PROJECT_ID)
+                    for _ in range(FIRESTORE_CHANNEL_POOL_SIZE)
+                ]
+            pool = _pool
+        _local.pool = pool
+        _local.db = pool[next(_next_client) % len(pool)]
+    return _local.db
+
+
+def get_async_db():
+    # A grpc.aio channel multiplexes every coroutine on the loop, so the
+    # async path needs a single client only.
+    global _async_db
+    if _async_db is None:
+        _async_db = _engine().AsyncClient(project=GCP_PROJECT_ID)
+    return _async_db
+
+
+def close_db() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, []
+    for client in pool:
+        _close_transport(client)
+
+
+async def close_async_db() -> None:
+    global _async_db
+    client, _async_db = _async_db, None
+    if client is not None:
+        closing = _close_transport(client)
+        if closing is not None:
+            await closing
 
 
 def products_ref():
-    return db.collection("Products")
+    return get_db().collection("Products")
 
 
 def orders_ref():
-    return db.collection("Orders")
+    return get_db().collection("Orders")
 
 
 def users_ref():
-    return db.collection("Users")
+    return get_db().collection("Users")
+
+
+def async_products_ref():
+    return get_async_db().collection("Products")
+
+
+def async_orders_ref():
+    return get_async_db().collection("Orders")
+
+
+def async_users_ref():
+    return get_async_db().collection("Users")
+
+
+def idempotency_keys_ref():
+    return get_db().collection("IdempotencyKeys")
+
+
+def async_idempotency_keys_ref():
+    return get_async_db().collection("IdempotencyKeys")
+
+
+def reservations_ref():
+    return get_db().collection("Reservations")
+
+
+def async_reservations_ref():
+    return get_async_db().collection("Reservations")
@@ -1,32 +1,760 @@
+import base64
+import hashlib
+import json
+import random
+from datetime import UTC, datetime, timedelta
+
 from google.cloud import firestore
-from src.services.firestore import products_ref, orders_ref
 
-db = firestore.Client()
+from src.config import (
+    IDEMPOTENCY_KEY_TTL_SECONDS,
+    PRODUCT_CACHE_SIZE,
+    PRODUCT_CACHE_TTL_SECONDS,
+)
+from src.services import sold_out
+from src.services.firestore import (
+    async_idempotency_keys_ref,
+    async_orders_ref,
+    async_products_ref,
+    get_async_db,
+    get_db,
+    idempotency_keys_ref,
+    orders_ref,
+    products_ref,
+)
+from src.utils.cache import TTLCache
+from src.utils.stats import txn_stats
+
+# Sub-collection holding the stock shards of a sharded product
+# (Products/{id}/shards/{0..shard_count-1}).
+SHARDS_COLLECTION = "shards"
+
+# Product views served by the read endpoints, keyed by product id, and list
+# pages keyed by (cursor, limit). Stock changes evict them.
+_product_cache = TTLCache(PRODUCT_CACHE_SIZE, PRODUCT_CACHE_TTL_SECONDS)
+_page_cache = TTLCache(PRODUCT_CACHE_SIZE, PRODUCT_CACHE_TTL_SECONDS)
+
+
+class IdempotencyKeyReused(Exception):
+    """The idempotency key was already used for a different request."""
+
+
+class InvalidCursor(Exception):
+    """The page cursor was not issued by this API."""
+
+
+def _stock_status(quantity: int) -> str:
+    return "out_of_stock" if quantity == 0 else "in_stock"
+
+
+def _shard_refs(product_doc, shard_count: int) -> list:
+    shards = product_doc.collection(SHARDS_COLLECTION)
+    return [shards.document(str(i)) for i in range(shard_count)]
+
+
+def _shard_quantity(snap) -> int:
+    return (snap.to_dict() or {}).get("quantity", 0) if snap.exists else 0
+
+
+def _order_data(buyer_email: str, user_id: str | None, **fields) -> dict:
+    # created_at is the commit time; the orders bridge pages through new
+    # orders with it as a cursor, GET /orders lists a user's orders by it.
+    return {
+        "buyer_email": buyer_email,
+        "user_id": user_id,
+        "created_at": firestore.SERVER_TIMESTAMP,
+        **fields,
+    }
+
+
+def _idempotency_doc_id(idempotency_key: str) -> str:
+    # Client keys are arbitrary strings; hash them into a valid document id
+    return hashlib.sha256(idempotency_key.encode()).hexdigest()
+
+
+def _replayed_result(snap, request: dict):
+    """The result stored under a live idempotency key, or None."""
+    if not snap.exists:
+        return None
+    record = snap.to_dict()
+    # TTL deletion can lag behind expires_at by a day
+    if record["expires_at"] <= datetime.now(UTC):
+        return None
+    if record["request"] != request:
+        raise IdempotencyKeyReused()
+    return record["result"]
+
+
+def _idempotency_record(request: dict, result) -> dict:
+    return {
+        "request": request,
+        "result": result,
+        "created_at": firestore.SERVER_TIMESTAMP,
+        "expires_at": datetime.now(UTC)
+        + timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS),
+    }
+
+
+def _plan_unsharded(product_doc, data: dict, quantity: int):
+    if data["quantity"] < quantity:
+        return None
+    new_qty = data["quantity"] - quantity
+    return [(product_doc, {"quantity": new_qty, "status": _stock_status(new_qty)})]
+
+
+def _spill_refs(refs: list, start: int) -> list:
+    return [refs[(start + i) % len(refs)] for i in range(1, len(refs))]
+
+
+def _plan_spill(product_doc, data: dict, refs: list, start: int, quantities, quantity):
+    total = sum(quantities.values())
+    if total < quantity:
+        return None
+
+    writes = []
+    remaining = quantity
+    for offset in range(len(refs)):
+        index = (start + offset) % len(refs)
+        take = min(remaining, quantities[index])
+        if take:
+            writes.append((refs[index], {"quantity": quantities[index] - take}))
+            remaining -= take
+        if not remaining:
+            break
+
+    status = _stock_status(total - quantity)
+    if data.get("status") != status:
+        writes.append((product_doc, {"status": status}))
+    return writes
+
+
+def _plan_decrement(txn, product_doc, data: dict, quantity: int):
+    """Read the stock of a product inside ``txn`` and return the writes that
+    take ``quantity`` units from it, or None if there is not enough stock.
+
+    Sharded products only read a single random shard unless that shard
+    cannot cover the order on its own.
+    """
+    shard_count = data.get("shard_count", 0)
+    if not shard_count:
+        return _plan_unsharded(product_doc, data, quantity)
+
+    refs = _shard_refs(product_doc, shard_count)
+    start = random.randrange(shard_count)
+    first_qty = _shard_quantity(refs[start].get(transaction=txn))
+    if first_qty > quantity:
+        return [(refs[start], {"quantity": first_qty - quantity})]
+
+    # The chosen shard would be drained: read the remaining shards to spill
+    # over into them and to keep the product status in line with the total.
+    quantities = {start: first_qty}
+    for snap in txn.get_all(_spill_refs(refs, start)):
+        quantities[int(snap.id)] = _shard_quantity(snap)
+    return _plan_spill(product_doc, data, refs, start, quantities, quantity)
+
+
+async def _plan_decrement_async(txn, product_doc, data: dict, quantity: int):
+    shard_count = data.get("shard_count", 0)
+    if not shard_count:
+        return _plan_unsharded(product_doc, data, quantity)
+
+    refs = _shard_refs(product_doc, shard_count)
+    start = random.randrange(shard_count)
+    first_qty = _shard_quantity(await refs[start].get(transaction=txn))
+    if first_qty > quantity:
+        return [(refs[start], {"quantity": first_qty - quantity})]
+
+    quantities = {start: first_qty}
+    async for snap in get_async_db().get_all(_spill_refs(refs, start), transaction=txn):
+        quantities[int(snap.id)] = _shard_quantity(snap)
+    return _plan_spill(product_doc, data, refs, start, quantities, quantity)
+
+
+def _plan_items(txn, product_docs: dict, items: dict[str, int]):
+    """Writes that take every ``product_id -> quantity`` in ``items``, and the
+    items that cannot be taken."""
+    snaps = {s.id: s for s in txn.get_all(list(product_docs.values()))}
+
+    failures = []
+    writes = []
+    for product_id, quantity in items.items():
+        snap = snaps.get(product_id)
+        if snap is None or not snap.exists:
+            failures.append({"product_id": product_id, "reason": "not_found"})
+            continue
+        product_doc = product_docs[product_id]
+        plan = _plan_decrement(txn, product_doc, snap.to_dict(), quantity)
+        if plan is None:
+            failures.append({"product_id": product_id, "reason": "out_of_stock"})
+            continue
+        writes.extend(plan)
+    return writes, failures
+
 
+async def _plan_items_async(txn, product_docs: dict, items: dict[str, int]):
+    snaps = {
+        s.id: s
+        async for s in get_async_db().get_all(
+            list(product_docs.values()), transaction=txn
+        )
+    }
+
+    failures = []
+    writes = []
+    for product_id, quantity in items.items():
+        snap = snaps.get(product_id)
+        if snap is None or not snap.exists:
+            failures.append({"product_id": product_id, "reason": "not_found"})
+            continue
+        product_doc = product_docs[product_id]
+        plan = await _plan_decrement_async(txn, product_doc, snap.to_dict(), quantity)
+        if plan is None:
+            failures.append({"product_id": product_id, "reason": "out_of_stock"})
+            continue
+        writes.extend(plan)
+    return writes, failures
+
+
+def _sold_out_items(items) -> list[dict]:
+    # Carts only read the flags; failing on quantity does not mean sold out
+    return [
+        {"product_id": pid, "reason": "out_of_stock"}
+        for pid in items
+        if sold_out.is_sold_out(pid)
+    ]
+
+
+def _plan_increment(txn, product_doc, data: dict, quantity: int) -> list:
+    """Writes that put ``quantity`` units back into a product's stock.
+
+    Sharded products get them on one random shard.
+    """
+    shard_count = data.get("shard_count", 0)
+    if not shard_count:
+        new_qty = data["quantity"] + quantity
+        return [(product_doc, {"quantity": new_qty, "status": _stock_status(new_qty)})]
+
+    ref = _shard_refs(product_doc, shard_count)[random.randrange(shard_count)]
+    writes = [(ref, {"quantity": _shard_quantity(ref.get(transaction=txn)) + quantity})]
+    if quantity and data.get("status") != "in_stock":
+        writes.append((product_doc, {"status": "in_stock"}))
+    return writes
+
+
+async def _plan_increment_async(txn, product_doc, data: dict, quantity: int) -> list:
+    shard_count = data.get("shard_count", 0)
+    if not shard_count:
+        new_qty = data["quantity"] + quantity
+        return [(product_doc, {"quantity": new_qty, "status": _stock_status(new_qty)})]
+
+    ref = _shard_refs(product_doc, shard_count)[random.randrange(shard_count)]
+    snap = await ref.get(transaction=txn)
+    writes = [(ref, {"quantity": _shard_quantity(snap) + quantity})]
+    if quantity and data.get("status") != "in_stock":
+        writes.append((product_doc, {"status": "in_stock"}))
+    return writes
 
-def place_order(buyer_email: str, product_id: str) -> bool:
+
+def place_order(
+    buyer_email: str,
+    product_id: str,
+    idempotency_key: str | None = None,
+    user_id: str | None = None,
+) -> bool:
+    """Take one unit of ``product_id`` and write the order.
+
+    With an ``idempotency_key`` the result is recorded in the same
+    transaction, and a repeated call returns it without placing the order
+    again until the key expires. Without a key, products flagged sold out
+    fail without a Firestore read.
+    """
+    # A keyed request may be a replay whose recorded result must win
+    if not idempotency_key and sold_out.is_sold_out(product_id):
+        return False
     product_doc = products_ref().document(product_id)
+    request = {"buyer_email": buyer_email, "product_id": product_id}
+    key_doc = None
+    if idempotency_key:
+        key_doc = idempotency_keys_ref().document(_idempotency_doc_id(idempotency_key))
+        replayed = _replayed_result(key_doc.get(), request)
+        if replayed is not None:
+            return replayed
 
     @firestore.transactional
+    @txn_stats.counted("place_order")
     def txn(txn):
+        if key_doc is not None:
+            # A concurrent retry may have committed since the read above
+            replayed = _replayed_result(key_doc.get(transaction=txn), request)
+            if replayed is not None:
+                return replayed, "replayed"
+
+        reason = reserve(txn)
+        placed = reason == "ok"
+        if key_doc is not None:
+            txn.set(key_doc, _idempotency_record(request, placed))
+        return placed, reason
+
+    def reserve(txn):
         snap = product_doc.get(transaction=txn)
         if not snap.exists:
-            return False
+            return "not_found"
+
+        writes = _plan_decrement(txn, product_doc, snap.to_dict(), 1)
+        if writes is None:
+            return "out_of_stock"
+
+        for ref, update in writes:
+            txn.update(ref, update)
+
+        txn.set(
+            orders_ref().document(),
+            _order_data(buyer_email, user_id, product_id=product_id),
+        )
+
+        return "ok"
+
+    placed, reason = txn(get_db().transaction())
+    if placed:
+        invalidate_products([product_id])
+    elif reason == "out_of_stock":
+        sold_out.mark_sold_out(product_id)
+    return placed
+
+
+def place_orders_batch(
+    product_id: str, buyer_emails: list[str], user_ids: list[str | None] | None = None
+) -> list[bool]:
+    """Place one order of ``product_id`` per entry of ``buyer_emails``, placed
+    by the matching entry of ``user_ids``, in a single transaction that takes
+    the combined quantity at once.
+
+    When stock runs short the earliest buyers are served first. Returns one
+    result per buyer, like ``place_order``.
+    """
+    if sold_out.is_sold_out(product_id):
+        return [False] * len(buyer_emails)
+    user_ids = user_ids or [None] * len(buyer_emails)
+    product_doc = products_ref().document(product_id)
+
+    @firestore.transactional
+    @txn_stats.counted("place_orders_batch")
+    def txn(txn):
+        snap = product_doc.get(transaction=txn)
+        if not snap.exists:
+            return 0, "not_found"
 
         data = snap.to_dict()
-        if data["quantity"] <= 0:
-            return False
+        taken = len(buyer_emails)
+        writes = _plan_decrement(txn, product_doc, data, taken)
+        if writes is None:
+            shard_count = data.get("shard_count", 0)
+            if shard_count:
+                shards = txn.get_all(_shard_refs(product_doc, shard_count))
+                taken = sum(_shard_quantity(s) for s in shards)
+            else:
+                taken = data["quantity"]
+            writes = _plan_decrement(txn, product_doc, data, taken) if taken else []
+
+        for ref, update in writes:
+            txn.update(ref, update)
+
+        for buyer_email, user_id in list(zip(buyer_emails, user_ids))[:taken]:
+            txn.set(
+                orders_ref().document(),
+                _order_data(buyer_email, user_id, product_id=product_id),
+            )
+
+        return taken, "ok" if taken == len(buyer_emails) else "out_of_stock"
 
-        new_qty = data["quantity"] - 1
-        status = "out_of_stock" if new_qty == 0 else "in_stock"
+    taken, reason = txn(get_db().transaction())
+    if taken:
+        invalidate_products([product_id])
+    if reason == "out_of_stock":
+        sold_out.mark_sold_out(product_id)
+    return [i < taken for i in range(len(buyer_emails))]
+
+
+def place_cart_order(
+    buyer_email: str, items: dict[str, int], user_id: str | None = None
+) -> list[dict]:
+    """Reserve every ``product_id -> quantity`` in ``items`` in one transaction
+    and write a single order with one line item per product.
+
+    All or nothing: returns the failing items (empty if the order was placed).
+    """
+    failures = _sold_out_items(items)
+    if failures:
+        return failures
+    product_docs = {pid: products_ref().document(pid) for pid in items}
+
+    @firestore.transactional
+    @txn_stats.counted("place_cart_order")
+    def txn(txn):
+        writes, failures = _plan_items(txn, product_docs, items)
+        if failures:
+            return failures
 
-        txn.update(product_doc, {"quantity": new_qty, "status": status})
+        for ref, update in writes:
+            txn.update(ref, update)
 
         txn.set(
             orders_ref().document(),
-            {"buyer_email": buyer_email, "product_id": product_id},
+            _order_data(
+                buyer_email,
+                user_id,
+                items=[{"product_id": pid, "quantity": q} for pid, q in items.items()],
+            ),
+        )
+
+        return []
+
+    failures = txn(get_db().transaction())
+    if not failures:
+        invalidate_products(items)
+    return failures
+
+
+async def place_order_async(
+    buyer_email: str,
+    product_id: str,
+    idempotency_key: str | None = None,
+    user_id: str | None = None,
+) -> bool:
+    if not idempotency_key and sold_out.is_sold_out(product_id):
+        return False
+    product_doc = async_products_ref().document(product_id)
+    request = {"buyer_email": buyer_email, "product_id": product_id}
+    key_doc = None
+    if idempotency_key:
+        key_doc = async_idempotency_keys_ref().document(
+            _idempotency_doc_id(idempotency_key)
+        )
+        replayed = _replayed_result(await key_doc.get(), request)
+        if replayed is not None:
+            return replayed
+
+    @firestore.async_transactional
+    @txn_stats.counted("place_order")
+    async def txn(txn):
+        if key_doc is not None:
+            replayed = _replayed_result(await key_doc.get(transaction=txn), request)
+            if replayed is not None:
+                return replayed, "replayed"
+
+        reason = await reserve(txn)
+        placed = reason == "ok"
+        if key_doc is not None:
+            txn.set(key_doc, _idempotency_record(request, placed))
+        return placed, reason
+
+    async def reserve(txn):
+        snap = await product_doc.get(transaction=txn)
+        if not snap.exists:
+            return "not_found"
+
+        writes = await _plan_decrement_async(txn, product_doc, snap.to_dict(), 1)
+        if writes is None:
+            return "out_of_stock"
+
+        for ref, update in writes:
+            txn.update(ref, update)
+
+        txn.set(
+            async_orders_ref().document(),
+            _order_data(buyer_email, user_id, product_id=product_id),
+        )
+
+        return "ok"
+
+    placed, reason = await txn(get_async_db().transaction())
+    if placed:
+        invalidate_products([product_id])
+    elif reason == "out_of_stock":
+        sold_out.mark_sold_out(product_id)
+    return placed
+
+
+async def place_cart_order_async(
+    buyer_email: str, items: dict[str, int], user_id: str | None = None
+) -> list[dict]:
+    failures = _sold_out_items(items)
+    if failures:
+        return failures
+    product_docs = {pid: async_products_ref().document(pid) for pid in items}
+
+    @firestore.async_transactional
+    @txn_stats.counted("place_cart_order")
+    async def txn(txn):
+        writes, failures = await _plan_items_async(txn, product_docs, items)
+        if failures:
+            return failures
+
+        for ref, update in writes:
+            txn.update(ref, update)
+
+        txn.set(
+            async_orders_ref().document(),
+            _order_data(
+                buyer_email,
+                user_id,
+                items=[{"product_id": pid, "quantity": q} for pid, q in items.items()],
+            ),
         )
 
+        return []
+
+    failures = await txn(get_async_db().transaction())
+    if not failures:
+        invalidate_products(items)
+    return failures
+
+
+def get_stock(product_id: str) -> int | None:
+    product_doc = products_ref().document(product_id)
+    snap = product_doc.get()
+    if not snap.exists:
+        return None
+
+    data = snap.to_dict()
+    shard_count = data.get("shard_count", 0)
+    if not shard_count:
+        return data["quantity"]
+    return sum(
+        _shard_quantity(s)
+        for s in get_db().get_all(_shard_refs(product_doc, shard_count))
+    )
+
+
+def set_shard_count(product_id: str, shard_count: int) -> bool:
+    """Spread a product's stock evenly over ``shard_count`` shards.
+
+    A ``shard_count`` of 1 or less folds the shards back into the product
+    document and turns sharding off.
+    """
+    product_doc = products_ref().document(product_id)
+
+    @firestore.transactional
+    def txn(txn):
+        snap = product_doc.get(transaction=txn)
+        if not snap.exists:
+            return False
+
+        data = snap.to_dict()
+        old_refs = _shard_refs(product_doc, data.pop("shard_count", 0))
+        if old_refs:
+            total = sum(_shard_quantity(s) for s in txn.get_all(old_refs))
+        else:
+            total = data["quantity"]
+
+        data.pop("quantity", None)
+        data["status"] = _stock_status(total)
+
+        if shard_count > 1:
+            for ref in old_refs[shard_count:]:
+                txn.delete(ref)
+            per_shard, extra = divmod(total, shard_count)
+            for i, ref in enumerate(_shard_refs(product_doc, shard_count)):
+                txn.set(ref, {"quantity": per_shard + (1 if i < extra else 0)})
+            data["shard_count"] = shard_count
+        else:
+            for ref in old_refs:
+                txn.delete(ref)
+            data["quantity"] = total
+
+        txn.set(product_doc, data)
         return True
 
-    return txn(db.transaction())
+    changed = txn(get_db().transaction())
+    if changed:
+        invalidate_products([product_id])
+    return changed
+
+
+def invalidate_products(product_ids) -> None:
+    for product_id in product_ids:
+        _product_cache.pop(product_id)
+    # Any page may list one of the products
+    _page_cache.clear()
+
+
+def clear_product_cache() -> None:
+    _product_cache.clear()
+    _page_cache.clear()
+    sold_out.clear()
+
+
+def _shard_reads(snaps) -> list:
+    """Shard refs whose quantities make up the stock of ``snaps``."""
+    return [
+        ref
+        for snap in snaps
+        for ref in _shard_refs(snap.reference, snap.to_dict().get("shard_count", 0))
+    ]
+
+
+def _product_views(snaps, shard_snaps) -> list[dict]:
+    shard_stock: dict[str, int] = {}
+    for shard in shard_snaps:
+        product_id = shard.reference.parent.parent.id
+        shard_stock[product_id] = shard_stock.get(product_id, 0) + _shard_quantity(
+            shard
+        )
+
+    views = []
+    for snap in snaps:
+        data = snap.to_dict()
+        if data.pop("shard_count", 0):
+            data["quantity"] = shard_stock.get(snap.id, 0)
+        views.append({**data, "product_id": snap.id})
+    return views
+
+
+def _cursor_document_id(cursor: str, doc_id) -> str:
+    # start_after() turns the id into a document path, which fails on ids
+    # Firestore could never have issued
+    if (
+        not isinstance(doc_id, str)
+        or not doc_id
+        or "/" in doc_id
+        or doc_id in (".", "..")
+        or len(doc_id.encode()) > 1500
+    ):
+        raise InvalidCursor(cursor)
+    return doc_id
+
+
+def _products_page_query(limit: int, cursor: str | None, products):
+    # Ordered by document id so the last id of a page is the next cursor
+    query = products.order_by("__name__").limit(limit)
+    if cursor:
+        query = query.start_after({"__name__": _cursor_document_id(cursor, cursor)})
+    return query
+
+
+def get_product(product_id: str) -> dict | None:
+    product = _product_cache.get(product_id)
+    if product is None:
+        snap = products_ref().document(product_id).get()
+        if not snap.exists:
+            return None
+        refs = _shard_reads([snap])
+        shards = get_db().get_all(refs) if refs else []
+        product = _product_views([snap], shards)[0]
+        _product_cache.set(product_id, product)
+    return product
+
+
+def list_products(
+    limit: int, cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    """One page of products ordered by id, plus the cursor of the next page
+    (None on the last page). Raises InvalidCursor."""
+    page = _page_cache.get((cursor, limit))
+    if page is None:
+        snaps = list(_products_page_query(limit, cursor, products_ref()).stream())
+        refs = _shard_reads(snaps)
+        shards = get_db().get_all(refs) if refs else []
+        next_cursor = snaps[-1].id if len(snaps) == limit else None
+        page = (_product_views(snaps, shards), next_cursor)
+        _page_cache.set((cursor, limit), page)
+    return page
+
+
+def iter_products(page_size: int):
+    """Every product view ordered by id, read ``page_size`` products at a
+    time and bypassing the read caches."""
+    cursor = None
+    while True:
+        snaps = list(_products_page_query(page_size, cursor, products_ref()).stream())
+        refs = _shard_reads(snaps)
+        shards = get_db().get_all(refs) if refs else []
+        yield from _product_views(snaps, shards)
+        if len(snaps) < page_size:
+            return
+        cursor = snaps[-1].id
+
+
+async def get_product_async(product_id: str) -> dict | None:
+    product = _product_cache.get(product_id)
+    if product is None:
+        snap = await async_products_ref().document(product_id).get()
+        if not snap.exists:
+            return None
+        refs = _shard_reads([snap])
+        shards = [s async for s in get_async_db().get_all(refs)] if refs else []
+        product = _product_views([snap], shards)[0]
+        _product_cache.set(product_id, product)
+    return product
+
+
+async def list_products_async(
+    limit: int, cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    page = _page_cache.get((cursor, limit))
+    if page is None:
+        query = _products_page_query(limit, cursor, async_products_ref())
+        snaps = [snap async for snap in query.stream()]
+        refs = _shard_reads(snaps)
+        shards = [s async for s in get_async_db().get_all(refs)] if refs else []
+        next_cursor = snaps[-1].id if len(snaps) == limit else None
+        page = (_product_views(snaps, shards), next_cursor)
+        _page_cache.set((cursor, limit), page)
+    return page
+
+
+def _encode_order_cursor(snap) -> str:
+    # Keyset position of the last order of a page: (created_at, order id)
+    position = [snap.get("created_at").isoformat(), snap.id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_order_cursor(cursor: str) -> dict:
+    try:
+        created_at, order_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return {
+            "created_at": datetime.fromisoformat(created_at),
+            "__name__": _cursor_document_id(cursor, order_id),
+        }
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def _user_orders_query(user_id: str, limit: int, cursor: str | None, orders):
+    # Served by the (user_id, created_at DESC, __name__ DESC) composite index,
+    # so a page costs the same however many orders there are.
+    query = (
+        orders.where(filter=firestore.FieldFilter("user_id", "==", user_id))
+        .order_by("created_at", direction=firestore.Query.DESCENDING)
+        .order_by("__name__", direction=firestore.Query.DESCENDING)
+        .limit(limit)
+    )
+    if cursor:
+        query = query.start_after(_decode_order_cursor(cursor))
+    return query
+
+
+def _order_page(snaps, limit: int) -> tuple[list[dict], str | None]:
+    orders = []
+    for snap in snaps:
+        data = snap.to_dict()
+        data.pop("user_id", None)
+        orders.append({**data, "order_id": snap.id})
+    next_cursor = _encode_order_cursor(snaps[-1]) if len(snaps) == limit else None
+    return orders, next_cursor
+
+
+def list_user_orders(
+    user_id: str, limit: int, cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    """One page of ``user_id``'s orders, newest first, plus the cursor of the
+    next page (None on the last page). Raises InvalidCursor."""
+    query = _user_orders_query(user_id, limit, cursor, orders_ref())
+    return _order_page(list(query.stream()), limit)
+
+
+async def list_user_orders_async(
+    user_id: str, limit: int, cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    query = _user_orders_query(user_id, limit, cursor, async_orders_ref())
+    return _order_page([snap async for snap in query.stream()], limit)
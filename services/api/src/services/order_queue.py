@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from src.config import (
+    ORDER_GROUP_COMMIT_MAX_BATCH,
+    ORDER_GROUP_COMMIT_QUEUE_SIZE,
+    ORDER_GROUP_COMMIT_WAIT_MS,
+)
+from src.services.inventory import place_orders_batch
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class OrderQueueFullError(Exception):
+    pass
+
+
+class GroupCommitQueue:
+    """Write-behind queue for single-product orders.
+
+    One writer thread drains the queue in batches and places every product's
+    orders of a batch in one transaction, so concurrent buyers of a hot
+    product contend on the product document once per batch instead of once
+    per order. Callers wait on the returned future.
+    """
+
+    def __init__(self, max_batch: int, max_wait: float, maxsize: int):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+
+    def submit(
+        self, buyer_email: str, product_id: str, user_id: str | None = None
+    ) -> Future:
+        """Queue an order; the future resolves to ``place_order``'s result."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="order-writer", daemon=True
+                )
+                self._writer.start()
+
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((product_id, buyer_email, user_id, future))
+        except queue.Full:
+            raise OrderQueueFullError("order queue is full") from None
+        return future
+
+    def close(self) -> None:
+        """Place everything already queued, then stop the writer."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    def _next_batch(self) -> tuple[list, bool]:
+        batch = []
+        deadline = None
+        while len(batch) < self.max_batch:
+            if deadline is None:
+                item = self._queue.get()
+                deadline = time.monotonic() + self.max_wait
+            else:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, batch: list) -> None:
+        by_product: dict[str, list] = {}
+        for product_id, buyer_email, user_id, future in batch:
+            by_product.setdefault(product_id, []).append((buyer_email, user_id, future))
+
+        for product_id, entries in by_product.items():
+            try:
+                results = place_orders_batch(
+                    product_id,
+                    [email for email, _, _ in entries],
+                    [user_id for _, user_id, _ in entries],
+                )
+            except Exception as e:
+                logger.exception("Group commit failed for %s", product_id)
+                for _, _, future in entries:
+                    future.set_exception(e)
+                continue
+            for (_, _, future), placed in zip(entries, results):
+                future.set_result(placed)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit(batch)
+
+
+_queue = GroupCommitQueue(
+    ORDER_GROUP_COMMIT_MAX_BATCH,
+    ORDER_GROUP_COMMIT_WAIT_MS / 1000,
+    ORDER_GROUP_COMMIT_QUEUE_SIZE,
+)
+
+
+def submit_order(
+    buyer_email: str, product_id: str, user_id: str | None = None
+) -> Future:
+    return _queue.submit(buyer_email, product_id, user_id)
+
+
+def close_order_queue() -> None:
+    _queue.close()
@@ -0,0 +1,301 @@
+"""Stock holds that are taken now and turned into an order later.
+
+``reserve`` takes the stock exactly like a cart order but writes a
+reservation instead of the order. ``confirm`` turns a live hold into the
+order, ``release`` (or the sweeper, once ``expires_at`` has passed) puts the
+stock back. Every step is a Firestore transaction, so stock is never sold
+twice.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from google.cloud import firestore
+
+from src.config import RESERVATION_SWEEP_BATCH_SIZE, RESERVATION_TTL_SECONDS
+from src.services import sold_out
+from src.services.firestore import (
+    async_orders_ref,
+    async_products_ref,
+    async_reservations_ref,
+    get_async_db,
+    get_db,
+    orders_ref,
+    products_ref,
+    reservations_ref,
+)
+from src.services.inventory import (
+    _order_data,
+    _plan_increment,
+    _plan_increment_async,
+    _plan_items,
+    _plan_items_async,
+    invalidate_products,
+)
+from src.utils.stats import txn_stats
+
+
+def _is_expired(reservation: dict) -> bool:
+    return reservation["expires_at"] <= datetime.now(UTC)
+
+
+def _reservation_data(buyer_email: str, user_id: str, items: dict[str, int]) -> dict:
+    return {
+        "buyer_email": buyer_email,
+        "user_id": user_id,
+        "items": [{"product_id": pid, "quantity": q} for pid, q in items.items()],
+        "status": "held",
+        "created_at": firestore.SERVER_TIMESTAMP,
+        "expires_at": datetime.now(UTC) + timedelta(seconds=RESERVATION_TTL_SECONDS),
+    }
+
+
+def _items(reservation: dict) -> dict[str, int]:
+    return {item["product_id"]: item["quantity"] for item in reservation["items"]}
+
+
+def _stock_returned(items: dict[str, int]) -> None:
+    # Released stock makes a sold-out product orderable again
+    invalidate_products(items)
+    for product_id in items:
+        sold_out.clear_sold_out(product_id)
+
+
+def _plan_restock(txn, items: dict[str, int]) -> list:
+    product_docs = [products_ref().document(pid) for pid in items]
+    writes = []
+    for snap in txn.get_all(product_docs):
+        # A product deleted while held has nothing to return the stock to
+        if snap.exists:
+            writes.extend(
+                _plan_increment(txn, snap.reference, snap.to_dict(), items[snap.id])
+            )
+    return writes
+
+
+async def _plan_restock_async(txn, items: dict[str, int]) -> list:
+    product_docs = [async_products_ref().document(pid) for pid in items]
+    writes = []
+    async for snap in get_async_db().get_all(product_docs, transaction=txn):
+        if snap.exists:
+            writes.extend(
+                await _plan_increment_async(
+                    txn, snap.reference, snap.to_dict(), items[snap.id]
+                )
+            )
+    return writes
+
+
+def reserve(
+    buyer_email: str, user_id: str, items: dict[str, int]
+) -> tuple[str | None, list[dict]]:
+    """Hold every ``product_id -> quantity`` in ``items`` for
+    RESERVATION_TTL_SECONDS.
+
+    All or nothing: returns the reservation id, or None and the failing items.
+    """
+    product_docs = {pid: products_ref().document(pid) for pid in items}
+    reservation_doc = reservations_ref().document()
+
+    @firestore.transactional
+    @txn_stats.counted("reserve")
+    def txn(txn):
+        writes, failures = _plan_items(txn, product_docs, items)
+        if failures:
+            return failures
+
+        for ref, update in writes:
+            txn.update(ref, update)
+        txn.set(reservation_doc, _reservation_data(buyer_email, user_id, items))
+        return []
+
+    failures = txn(get_db().transaction())
+    if failures:
+        return None, failures
+    invalidate_products(items)
+    return reservation_doc.id, []
+
+
+def confirm(reservation_id: str, user_id: str) -> tuple[str, str | None]:
+    """Turn a held reservation into an order.
+
+    Returns the reservation status afterwards and the order id, which is set
+    when the status is ``confirmed``. Confirming twice returns the same order;
+    a hold that already expired is released instead (status ``expired``).
+    Unknown ids and other users' reservations are ``not_found``.
+    """
+    reservation_doc = reservations_ref().document(reservation_id)
+
+    @firestore.transactional
+    @txn_stats.counted("confirm_reservation")
+    def txn(txn):
+        snap = reservation_doc.get(transaction=txn)
+        reservation = snap.to_dict() if snap.exists else None
+        if reservation is None or reservation["user_id"] != user_id:
+            return "not_found", None, None
+        if reservation["status"] != "held":
+            return reservation["status"], reservation.get("order_id"), None
+
+        if _is_expired(reservation):
+            items = _items(reservation)
+            for ref, update in _plan_restock(txn, items):
+                txn.update(ref, update)
+            txn.update(reservation_doc, {"status": "expired"})
+            return "expired", None, items
+
+        order_doc = orders_ref().document()
+        txn.set(
+            order_doc,
+            _order_data(
+                reservation["buyer_email"],
+                reservation["user_id"],
+                items=reservation["items"],
+                reservation_id=reservation_id,
+            ),
+        )
+        txn.update(reservation_doc, {"status": "confirmed", "order_id": order_doc.id})
+        return "confirmed", order_doc.id, None
+
+    status, order_id, restocked = txn(get_db().transaction())
+    if restocked:
+        _stock_returned(restocked)
+    return status, order_id
+
+
+def _release(reservation_doc, user_id: str | None, expired_only: bool) -> str:
+    @firestore.transactional
+    @txn_stats.counted("release_reservation")
+    def txn(txn):
+        snap = reservation_doc.get(transaction=txn)
+        reservation = snap.to_dict() if snap.exists else None
+        if reservation is None or user_id not in (None, reservation["user_id"]):
+            return "not_found", None
+        if reservation["status"] != "held":
+            return reservation["status"], None
+        if expired_only and not _is_expired(reservation):
+            return "held", None
+
+        items = _items(reservation)
+        for ref, update in _plan_restock(txn, items):
+            txn.update(ref, update)
+        status = "expired" if _is_expired(reservation) else "released"
+        txn.update(reservation_doc, {"status": status})
+        return status, items
+
+    status, items = txn(get_db().transaction())
+    if items:
+        _stock_returned(items)
+    return status
+
+
+def release(reservation_id: str, user_id: str) -> str:
+    """Give a held reservation's stock back; returns the status afterwards.
+
+    Releasing a confirmed reservation leaves it confirmed.
+    """
+    return _release(reservations_ref().document(reservation_id), user_id, False)
+
+
+def release_expired(limit: int = RESERVATION_SWEEP_BATCH_SIZE) -> int:
+    """Put the stock of up to ``limit`` expired holds back; returns how many
+    were released."""
+    query = (
+        reservations_ref()
+        .where(filter=firestore.FieldFilter("status", "==", "held"))
+        .where(filter=firestore.FieldFilter("expires_at", "<=", datetime.now(UTC)))
+        .limit(limit)
+    )
+    released = 0
+    for snap in query.stream():
+        if _release(snap.reference, None, True) == "expired":
+            released += 1
+    return released
+
+
+async def reserve_async(
+    buyer_email: str, user_id: str, items: dict[str, int]
+) -> tuple[str | None, list[dict]]:
+    product_docs = {pid: async_products_ref().document(pid) for pid in items}
+    reservation_doc = async_reservations_ref().document()
+
+    @firestore.async_transactional
+    @txn_stats.counted("reserve")
+    async def txn(txn):
+        writes, failures = await _plan_items_async(txn, product_docs, items)
+        if failures:
+            return failures
+
+        for ref, update in writes:
+            txn.update(ref, update)
+        txn.set(reservation_doc, _reservation_data(buyer_email, user_id, items))
+        return []
+
+    failures = await txn(get_async_db().transaction())
+    if failures:
+        return None, failures
+    invalidate_products(items)
+    return reservation_doc.id, []
+
+
+async def confirm_async(reservation_id: str, user_id: str) -> tuple[str, str | None]:
+    reservation_doc = async_reservations_ref().document(reservation_id)
+
+    @firestore.async_transactional
+    @txn_stats.counted("confirm_reservation")
+    async def txn(txn):
+        snap = await reservation_doc.get(transaction=txn)
+        reservation = snap.to_dict() if snap.exists else None
+        if reservation is None or reservation["user_id"] != user_id:
+            return "not_found", None, None
+        if reservation["status"] != "held":
+            return reservation["status"], reservation.get("order_id"), None
+
+        if _is_expired(reservation):
+            items = _items(reservation)
+            for ref, update in await _plan_restock_async(txn, items):
+                txn.update(ref, update)
+            txn.update(reservation_doc, {"status": "expired"})
+            return "expired", None, items
+
+        order_doc = async_orders_ref().document()
+        txn.set(
+            order_doc,
+            _order_data(
+                reservation["buyer_email"],
+                reservation["user_id"],
+                items=reservation["items"],
+                reservation_id=reservation_id,
+            ),
+        )
+        txn.update(reservation_doc, {"status": "confirmed", "order_id": order_doc.id})
+        return "confirmed", order_doc.id, None
+
+    status, order_id, restocked = await txn(get_async_db().transaction())
+    if restocked:
+        _stock_returned(restocked)
+    return status, order_id
+
+
+async def release_async(reservation_id: str, user_id: str) -> str:
+    reservation_doc = async_reservations_ref().document(reservation_id)
+
+    @firestore.async_transactional
+    @txn_stats.counted("release_reservation")
+    async def txn(txn):
+        snap = await reservation_doc.get(transaction=txn)
+        reservation = snap.to_dict() if snap.exists else None
+        if reservation is None or reservation["user_id"] != user_id:
+            return "not_found", None
+        if reservation["status"] != "held":
+            return reservation["status"], None
+
+        items = _items(reservation)
+        for ref, update in await _plan_restock_async(txn, items):
+            txn.update(ref, update)
+        status = "expired" if _is_expired(reservation) else "released"
+        txn.update(reservation_doc, {"status": status})
+        return status, items
+
+    status, items = await txn(get_async_db().transaction())
+    if items:
+        _stock_returned(items)
+    return status
@@ -0,0 +1,134 @@
+"""Bulk stock adjustments.
+
+Each product's delta is applied in a transaction that reads its stock, so
+``status`` follows the new quantity and stock never goes below zero even
+while orders are placed. Products are split into transactions of
+RESTOCK_BATCH_SIZE, RESTOCK_WORKERS of them in flight; a product that cannot
+be adjusted is reported without holding back the rest of its batch.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from google.cloud import firestore
+
+from src.config import RESTOCK_BATCH_SIZE, RESTOCK_WORKERS
+from src.services import sold_out
+from src.services.firestore import (
+    async_products_ref,
+    get_async_db,
+    get_db,
+    products_ref,
+)
+from src.services.inventory import (
+    _plan_decrement,
+    _plan_decrement_async,
+    _plan_increment,
+    _plan_increment_async,
+    invalidate_products,
+)
+from src.utils.stats import txn_stats
+
+
+def _chunks(items: dict[str, int]) -> list[dict[str, int]]:
+    pairs = list(items.items())
+    return [
+        dict(pairs[i : i + RESTOCK_BATCH_SIZE])
+        for i in range(0, len(pairs), RESTOCK_BATCH_SIZE)
+    ]
+
+
+def _result(product_id: str, delta: int, result: str) -> dict:
+    return {"product_id": product_id, "delta": delta, "result": result}
+
+
+def _plan_adjustment(txn, snap, delta: int):
+    if delta >= 0:
+        return _plan_increment(txn, snap.reference, snap.to_dict(), delta)
+    return _plan_decrement(txn, snap.reference, snap.to_dict(), -delta)
+
+
+async def _plan_adjustment_async(txn, snap, delta: int):
+    if delta >= 0:
+        return await _plan_increment_async(txn, snap.reference, snap.to_dict(), delta)
+    return await _plan_decrement_async(txn, snap.reference, snap.to_dict(), -delta)
+
+
+def _restocked(results: list[dict]) -> None:
+    changed = [r["product_id"] for r in results if r["result"] == "ok"]
+    invalidate_products(changed)
+    for result in results:
+        if result["result"] == "ok" and result["delta"] > 0:
+            sold_out.clear_sold_out(result["product_id"])
+
+
+def _apply(txn, plans: dict, items: dict[str, int]) -> list[dict]:
+    results = []
+    for product_id, delta in items.items():
+        if product_id not in plans:
+            results.append(_result(product_id, delta, "not_found"))
+        elif plans[product_id] is None:
+            results.append(_result(product_id, delta, "insufficient_stock"))
+        else:
+            for ref, update in plans[product_id]:
+                txn.update(ref, update)
+            results.append(_result(product_id, delta, "ok"))
+    return results
+
+
+def _restock_batch(items: dict[str, int]) -> list[dict]:
+    product_docs = [products_ref().document(pid) for pid in items]
+
+    @firestore.transactional
+    @txn_stats.counted("restock")
+    def txn(txn):
+        # Every read has to happen before the first write
+        plans = {
+            snap.id: _plan_adjustment(txn, snap, items[snap.id])
+            for snap in txn.get_all(product_docs)
+            if snap.exists
+        }
+        return _apply(txn, plans, items)
+
+    results = txn(get_db().transaction())
+    _restocked(results)
+    return results
+
+
+async def _restock_batch_async(items: dict[str, int]) -> list[dict]:
+    product_docs = [async_products_ref().document(pid) for pid in items]
+
+    @firestore.async_transactional
+    @txn_stats.counted("restock")
+    async def txn(txn):
+        plans = {}
+        async for snap in get_async_db().get_all(product_docs, transaction=txn):
+            if snap.exists:
+                plans[snap.id] = await _plan_adjustment_async(txn, snap, items[snap.id])
+        return _apply(txn, plans, items)
+
+    results = await txn(get_async_db().transaction())
+    _restocked(results)
+    return results
+
+
+def restock(items: dict[str, int]) -> list[dict]:
+    """Add ``product_id -> delta`` to each product's stock (negative deltas
+    take stock away) and return one result per product, in input order:
+    ``ok``, ``not_found`` or ``insufficient_stock``."""
+    batches = _chunks(items)
+    if len(batches) == 1:
+        return _restock_batch(batches[0])
+    with ThreadPoolExecutor(max_workers=RESTOCK_WORKERS) as executor:
+        return [r for results in executor.map(_restock_batch, batches) for r in results]
+
+
+async def restock_async(items: dict[str, int]) -> list[dict]:
+    semaphore = asyncio.Semaphore(RESTOCK_WORKERS)
+
+    async def run(batch):
+        async with semaphore:
+            return await _restock_batch_async(batch)
+
+    batches = await asyncio.gather(*(run(batch) for batch in _chunks(items)))
+    return [r for results in batches for r in results]
@@ -0,0 +1,89 @@
+"""Negative cache of products known to be out of stock.
+
+Orders for a flagged product are turned down without opening a transaction,
+and the per-product admission gate fails queued requests from the same
+flags. ``place_order`` flags products it finds sold out and a restock clears
+them on the same instance. Other instances' changes arrive through the
+optional snapshot listener on out-of-stock products, or once the entry's TTL
+runs out.
+"""
+
+import threading
+
+from google.api_core import exceptions
+from google.auth.exceptions import GoogleAuthError
+from google.cloud.firestore import FieldFilter
+
+from src.config import (
+    SOLD_OUT_CACHE_SIZE,
+    SOLD_OUT_CACHE_TTL_SECONDS,
+    SOLD_OUT_CACHE_WATCH,
+)
+from src.services.firestore import products_ref
+from src.utils.cache import TTLCache
+from src.utils.logging import get_logger
+from src.utils.metrics import REQUESTS_REJECTED
+
+logger = get_logger(__name__)
+
+_sold_out = TTLCache(SOLD_OUT_CACHE_SIZE, SOLD_OUT_CACHE_TTL_SECONDS)
+_watch = None
+_watch_lock = threading.Lock()
+
+
+def is_sold_out(product_id: str) -> bool:
+    if _sold_out.get(product_id):
+        REQUESTS_REJECTED.labels(reason="sold_out_cache").inc()
+        return True
+    return False
+
+
+def mark_sold_out(product_id: str) -> None:
+    _sold_out.set(product_id, True)
+
+
+def clear_sold_out(product_id: str) -> None:
+    _sold_out.pop(product_id)
+
+
+def clear() -> None:
+    _sold_out.clear()
+
+
+def stats() -> dict:
+    return _sold_out.stats()
+
+
+def _on_sold_out_snapshot(docs, changes, read_time) -> None:
+    # A product leaves the out_of_stock result set (restocked or deleted)
+    # as REMOVED
+    for change in changes:
+        if change.type.name == "REMOVED":
+            _sold_out.pop(change.document.id)
+        else:
+            _sold_out.set(change.document.id, True)
+
+
+def start_watch() -> None:
+    global _watch
+    if not SOLD_OUT_CACHE_WATCH or SOLD_OUT_CACHE_SIZE <= 0:
+        return
+    with _watch_lock:
+        if _watch is not None:
+            return
+        try:
+            query = products_ref().where(
+                filter=FieldFilter("status", "==", "out_of_stock")
+            )
+            _watch = query.on_snapshot(_on_sold_out_snapshot)
+        except (exceptions.GoogleAPICallError, GoogleAuthError) as e:
+            # Without the watch entries still expire after their TTL
+            logger.warning("Products watch unavailable: %s", e)
+
+
+def stop_watch() -> None:
+    global _watch
+    with _watch_lock:
+        watch, _watch = _watch, None
+    if watch is not None:
+        watch.unsubscribe()
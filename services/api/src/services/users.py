@@ -1,5 +1,19 @@
-from src.services.firestore import users_ref
-from src.security.password import hash_password, verify_password
+from src.services.firestore import async_users_ref, users_ref
+from src.security.password import (
+    hash_password,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
+
+
+def _claims(email: str, user: dict) -> dict:
+    # Roles are granted by setting "role" on the Users document by hand;
+    # registration never writes one
+    claims = {"sub": email}
+    if user.get("role"):
+        claims["role"] = user["role"]
+    return claims
 
 
 def create_user(email: str, password: str):
@@ -7,9 +21,26 @@ def create_user(email: str, password: str):
 
 
 def authenticate_user(email: str, password: str):
+    """Token claims for ``email`` if ``password`` matches, else None."""
     doc = users_ref().document(email).get()
     if not doc.exists:
         return None
-    if not verify_password(password, doc.to_dict()["password"]):
+    user = doc.to_dict()
+    if not verify_password(password, user["password"]):
+        return None
+    return _claims(email, user)
+
+
+async def create_user_async(email: str, password: str):
+    hashed = await hash_password_async(password)
+    await async_users_ref().document(email).set({"password": hashed})
+
+
+async def authenticate_user_async(email: str, password: str):
+    doc = await async_users_ref().document(email).get()
+    if not doc.exists:
+        return None
+    user = doc.to_dict()
+    if not await verify_password_async(password, user["password"]):
         return None
-    return email
+    return _claims(email, user)
@@ -0,0 +1,322 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+
+from src.services.firestore import get_db, orders_ref, products_ref
+from src.services.inventory import iter_products
+
+# Firestore commits at most 500 writes per batch
+MAX_BATCH_SIZE = 500
+
+# Column holding the document id, per collection
+ID_FIELDS = {"products": "product_id", "orders": "order_id"}
+
+# Typed fields parsed from CSV cells and JSON strings
+FIELD_TYPES = {
+    "quantity": int,
+    "shard_count": int,
+    "price": float,
+    "created_at": datetime.fromisoformat,
+}
+
+
+class Progress:
+    """Prints rows done and rows/s to stderr at most every ``interval``
+    seconds, and a summary at the end."""
+
+    def __init__(self, verb: str, interval: float, done: int = 0):
+        self.verb = verb
+        self.interval = interval
+        self.done = done
+        self.started = time.monotonic()
+        self._start_rows = done
+        self._last = self.started
+
+    def add(self, rows: int) -> None:
+        self.done += rows
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            print(
+                f"{self.verb} {self.done} rows ({self.rate():.0f} rows/s)",
+                file=sys.stderr,
+            )
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return (self.done - self._start_rows) / elapsed if elapsed else 0.0
+
+    def finish(self, collection: str) -> None:
+        elapsed = time.monotonic() - self.started
+        print(
+            f"{self.verb} {self.done} {collection} rows in {elapsed:.1f}s "
+            f"({self.rate():.0f} rows/s)",
+            file=sys.stderr,
+        )
+
+
+def _format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.endswith(".csv") else "jsonl"
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def read_rows(path: str, fmt: str):
+    """Yield one dict per CSV row or JSONL line without reading the whole
+    file."""
+    with _open(path, "r") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def to_document(row: dict, collection: str) -> tuple[str, dict]:
+    data = {}
+    for field, value in row.items():
+        if value == "" or value is None:
+            continue
+        if field in FIELD_TYPES and isinstance(value, str):
+            value = FIELD_TYPES[field](value)
+        data[field] = value
+
+    doc_id = str(data.get(ID_FIELDS[collection], ""))
+    if not doc_id:
+        raise ValueError(f"Row without {ID_FIELDS[collection]}: {row}")
+    if collection == "products" and "quantity" in data:
+        # Imported stock lives on the product document; reshard with
+        # src.tools.shards afterwards if needed.
+        data.pop("shard_count", None)
+        data.setdefault(
+            "status", "out_of_stock" if data["quantity"] == 0 else "in_stock"
+        )
+    if collection == "orders":
+        data.pop(ID_FIELDS[collection])
+    return doc_id, data
+
+
+def load_checkpoint(path: str, source: str) -> int:
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return 0
+    if checkpoint["source"] != source:
+        raise ValueError(f"Checkpoint {path} belongs to {checkpoint['source']}")
+    return checkpoint["rows"]
+
+
+def save_checkpoint(path: str, source: str, rows: int) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"source": source, "rows": rows}, f)
+    os.replace(tmp, path)
+
+
+def _commit(collection_ref, docs: list[tuple[str, dict]]) -> None:
+    batch = get_db().batch()
+    for doc_id, data in docs:
+        batch.set(collection_ref.document(doc_id), data)
+    batch.commit()
+
+
+def import_rows(
+    collection: str,
+    path: str,
+    fmt: str,
+    batch_size: int,
+    workers: int,
+    checkpoint: str | None,
+    progress_interval: float,
+) -> int:
+    """Write every row of ``path`` as one document, ``batch_size`` rows per
+    batch and ``workers`` batches in flight.
+
+    ``set()`` makes re-imports idempotent, so the checkpoint only records
+    the rows whose batch, and every batch before it, committed; a resumed
+    import skips them and rewrites whatever was in flight.
+    """
+    collection_ref = products_ref() if collection == "products" else orders_ref()
+    source = os.path.abspath(path)
+    skip = load_checkpoint(checkpoint, source) if checkpoint else 0
+    if skip:
+        print(f"Resuming after row {skip}", file=sys.stderr)
+    progress = Progress("Imported", progress_interval, skip)
+
+    rows = itertools.islice(read_rows(path, fmt), skip, None)
+    pending: deque = deque()
+    committed = skip
+
+    def settle(block: bool) -> None:
+        # Checkpoint in input order, whichever batch finishes first
+        nonlocal committed
+        while pending and (block or pending[0][0].done()):
+            future, size = pending.popleft()
+            future.result()
+            committed += size
+            progress.add(size)
+            if checkpoint:
+                save_checkpoint(checkpoint, source, committed)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            docs = [
+                to_document(row, collection)
+                for row in itertools.islice(rows, batch_size)
+            ]
+            if not docs:
+                break
+            pending.append((executor.submit(_commit, collection_ref, docs), len(docs)))
+            settle(block=False)
+            while len(pending) > workers * 2:
+                pending[0][0].result()  # backpressure: wait for the oldest batch
+                settle(block=False)
+        settle(block=True)
+
+    progress.finish(collection)
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return committed - skip
+
+
+def iter_orders(page_size: int):
+    query = orders_ref().order_by("__name__").limit(page_size)
+    cursor = None
+    while True:
+        page = query.start_after(cursor) if cursor else query
+        snaps = list(page.stream())
+        for snap in snaps:
+            yield {**snap.to_dict(), ID_FIELDS["orders"]: snap.id}
+        if len(snaps) < page_size:
+            return
+        cursor = snaps[-1]
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_value)
+    return value
+
+
+def export_rows(
+    collection: str,
+    path: str,
+    fmt: str,
+    page_size: int,
+    fields: list[str] | None,
+    progress_interval: float,
+) -> int:
+    """Stream every document of ``collection`` to ``path``, one page of
+    ``page_size`` documents in memory at a time.
+
+    CSV columns are ``fields``, or the keys of the first document; keys
+    that only appear later are left out.
+    """
+    docs = (
+        iter_products(page_size) if collection == "products" else iter_orders(page_size)
+    )
+    progress = Progress("Exported", progress_interval)
+    with _open(path, "w") as f:
+        writer = None
+        for doc in docs:
+            if fmt == "jsonl":
+                f.write(json.dumps(doc, default=_json_value) + "\n")
+            else:
+                if writer is None:
+                    id_field = ID_FIELDS[collection]
+                    columns = fields or [id_field, *sorted(set(doc) - {id_field})]
+                    writer = csv.DictWriter(f, columns, extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow({k: _csv_value(v) for k, v in doc.items()})
+            progress.add(1)
+    progress.finish(collection)
+    return progress.done
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Import or export Products and Orders as CSV or JSONL."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("import", help="write rows of a file as documents")
+    load.add_argument("collection", choices=sorted(ID_FIELDS))
+    load.add_argument("path", help="CSV or JSONL file ('-' for stdin)")
+    load.add_argument("--format", choices=["csv", "jsonl"])
+    load.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    load.add_argument("--workers", type=int, default=8)
+    load.add_argument(
+        "--checkpoint",
+        help="resume file (default: PATH.checkpoint, removed once done)",
+    )
+    load.add_argument("--progress-seconds", type=float, default=5.0)
+
+    dump = commands.add_parser("export", help="write documents to a file")
+    dump.add_argument("collection", choices=sorted(ID_FIELDS))
+    dump.add_argument("path", help="CSV or JSONL file ('-' for stdout)")
+    dump.add_argument("--format", choices=["csv", "jsonl"])
+    dump.add_argument("--page-size", type=int, default=1000)
+    dump.add_argument("--fields", help="comma-separated CSV columns")
+    dump.add_argument("--progress-seconds", type=float, default=5.0)
+
+    args = parser.parse_args(argv)
+    fmt = _format(args.path, args.format)
+
+    if args.command == "import":
+        if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+            parser.error(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
+        checkpoint = None
+        if args.path != "-":
+            checkpoint = args.checkpoint or f"{args.path}.checkpoint"
+        try:
+            import_rows(
+                args.collection,
+                args.path,
+                fmt,
+                args.batch_size,
+                max(args.workers, 1),
+                checkpoint,
+                args.progress_seconds,
+            )
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        return 0
+
+    export_rows(
+        args.collection,
+        args.path,
+        fmt,
+        max(args.page_size, 1),
+        args.fields.split(",") if args.fields else None,
+        args.progress_seconds,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import argparse
+import sys
+
+from src.services.inventory import get_stock, set_shard_count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Enable, resize or disable sharded stock counters for a product."
+    )
+    parser.add_argument("product_id")
+    parser.add_argument(
+        "shards",
+        type=int,
+        help="number of stock shards (1 or less turns sharding off)",
+    )
+    args = parser.parse_args(argv)
+
+    if not set_shard_count(args.product_id, args.shards):
+        print(f"Product not found: {args.product_id}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{args.product_id}: {max(args.shards, 1)} shard(s), "
+        f"{get_stock(args.product_id)} in stock"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
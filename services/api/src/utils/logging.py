@@ -1,17 +1,150 @@
+import contextvars
+import json
 import logging
-import os
+import queue
+import random
 import sys
+import threading
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from opentelemetry import trace
+
+from src.config import LOG_LEVEL, LOG_QUEUE_SIZE, LOG_SAMPLE_RATES
+
+# Path of the request being served, set by the HTTP middleware
+current_route: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_route", default=None
+)
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra`` fields are included as keys.
+
+    ``severity`` is the key Cloud Logging reads the level from.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Stamp the route and trace ids of the calling thread on the record.
+
+    Runs in the thread that logs, before the record is queued: the listener
+    thread that formats it later has neither context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        route = current_route.get()
+        if route is not None:
+            record.route = route
+        context = trace.get_current_span().get_span_context()
+        if context.is_valid:
+            record.trace_id = format(context.trace_id, "032x")
+            record.span_id = format(context.span_id, "016x")
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records per route prefix.
+
+    The longest matching prefix wins; warnings and errors always pass.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self._rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        route = getattr(record, "route", None)
+        if route is None or record.levelno > logging.INFO:
+            return True
+        for prefix, rate in self._rates:
+            if route.startswith(prefix):
+                return random.random() < rate
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueue records without formatting them or blocking on a full queue.
+
+    The queue never leaves the process, so records are passed as-is and
+    ``getMessage`` only runs on the listener thread. Records that do not fit
+    are counted in ``dropped`` instead.
+    """
+
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+def parse_sample_rates(value: str) -> dict[str, float]:
+    """Parse ``"prefix=rate,..."`` into a dict."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        prefix, _, rate = item.rpartition("=")
+        if not prefix:
+            raise ValueError(f"Invalid log sample rate: {item!r}")
+        rates[prefix] = float(rate)
+    return rates
 
 
 def setup_logging() -> None:
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-
-    logging.basicConfig(
-        level=log_level,
-        format=("%(asctime)s %(levelname)s %(name)s %(message)s"),
-        datefmt="%Y-%m-%dT%H:%M:%S",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
+    """Route the root logger through a queue to a JSON stdout writer."""
+    global _listener
+    if _listener is not None:
+        return
+
+    records = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = DroppingQueueHandler(records)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter(parse_sample_rates(LOG_SAMPLE_RATES)))
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.handlers = [handler]
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,85 @@
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from src.utils.tracing import tracer
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+TXN_ATTEMPTS = Counter(
+    "firestore_transaction_attempts_total",
+    "Firestore transaction attempts, retries included",
+    ["operation"],
+)
+TXN_RETRIES = Counter(
+    "firestore_transaction_retries_total",
+    "Firestore transaction attempts beyond the first",
+    ["operation"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "argon2_duration_seconds",
+    "argon2 hash/verify time on the hashing pool",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+JWT_DECODE_SECONDS = Histogram(
+    "jwt_decode_duration_seconds",
+    "Bearer token verification time",
+    ["cache"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+)
+REQUESTS_REJECTED = Counter(
+    "http_requests_rejected_total",
+    "Requests turned away by rate limiting or load shedding",
+    ["reason"],
+)
+ORDER_ADMISSION_WAITING = Gauge(
+    "order_admission_waiting",
+    "Order requests queued for a per-product transaction slot",
+    multiprocess_mode="livesum",
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, span_name: str | None = None, **labels):
+    """Observe the block's duration in ``histogram`` and, given a
+    ``span_name``, trace it as a span.
+
+    Yields the label dict so the block can refine labels it only learns
+    while running.
+    """
+    started = time.perf_counter()
+    scope = nullcontext()
+    if span_name:
+        # Current span, so logs and child spans of the block correlate with it
+        scope = tracer.start_as_current_span(span_name, attributes=labels)
+    with scope as span:
+        try:
+            yield labels
+        finally:
+            histogram.labels(**labels).observe(time.perf_counter() - started)
+            if span is not None:
+                span.set_attributes(labels)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    # Under several uvicorn workers each process writes its samples to
+    # PROMETHEUS_MULTIPROC_DIR; aggregate them on scrape.
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
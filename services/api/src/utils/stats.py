@@ -0,0 +1,73 @@
+import functools
+import inspect
+import threading
+import weakref
+
+from src.utils.metrics import TXN_ATTEMPTS, TXN_RETRIES
+from src.utils.tracing import tracer
+
+
+class TransactionStats:
+    """Counts Firestore transactions and their attempts, retries included.
+
+    ``firestore.transactional`` re-runs the decorated body with the same
+    transaction object on contention, so each new transaction object is one
+    transaction and every call is one attempt.
+    """
+
+    def __init__(self):
+        self._counts: dict[str, dict[str, int]] = {}
+        self._seen = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, transaction) -> bool:
+        """Count one attempt; return whether it is a retry."""
+        with self._lock:
+            counts = self._counts.setdefault(name, {"transactions": 0, "attempts": 0})
+            counts["attempts"] += 1
+            retry = transaction in self._seen
+            if not retry:
+                self._seen.add(transaction)
+                counts["transactions"] += 1
+        TXN_ATTEMPTS.labels(operation=name).inc()
+        if retry:
+            TXN_RETRIES.labels(operation=name).inc()
+        return retry
+
+    def counted(self, name: str):
+        """Decorate a transaction body; apply it below ``@transactional``."""
+
+        def decorate(fn):
+            if inspect.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def run_async(transaction, *args, **kwargs):
+                    retry = self._record(name, transaction)
+                    with tracer.start_as_current_span(
+                        f"firestore.txn.{name}", attributes={"retry": retry}
+                    ):
+                        return await fn(transaction, *args, **kwargs)
+
+                return run_async
+
+            @functools.wraps(fn)
+            def run(transaction, *args, **kwargs):
+                retry = self._record(name, transaction)
+                with tracer.start_as_current_span(
+                    f"firestore.txn.{name}", attributes={"retry": retry}
+                ):
+                    return fn(transaction, *args, **kwargs)
+
+            return run
+
+        return decorate
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                name: {**counts, "retries": counts["attempts"] - counts["transactions"]}
+                for name, counts in self._counts.items()
+            }
+
+
+txn_stats = TransactionStats()
@@ -0,0 +1,31 @@
+from opentelemetry import trace
+
+from src.config import OTEL_EXPORTER_OTLP_ENDPOINT, OTEL_SERVICE_NAME
+
+# A proxy until setup_tracing installs a provider; spans are no-ops without one
+tracer = trace.get_tracer("inventory-api")
+
+
+def setup_tracing() -> None:
+    """Batch-export spans over OTLP/HTTP if a collector endpoint is set."""
+    if not OTEL_EXPORTER_OTLP_ENDPOINT:
+        return
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": OTEL_SERVICE_NAME})
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+def shutdown_tracing() -> None:
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
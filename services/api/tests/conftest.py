@@ -1,5 +1,7 @@
+import asyncio
 import os
 import sys
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -9,46 +11,51 @@ os.environ.setdefault("GCP_PROJECT_ID", "test-project")
 os.environ.setdefault("JWT_SECRET", "test-secret")
 os.environ.setdefault("JWT_ALGORITHM", "HS256")
 os.environ.setdefault("JWT_EXPIRES_MINUTES", "60")
+# Every test runs on the in-memory Firestore engine, with the real
+# google.cloud.firestore decorators, sentinels and filters
+os.environ["FIRESTORE_ENGINE"] = "memory"
+# Cheap argon2 parameters keep hashing tests fast
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
 
 
-def pytest_configure(config):
-    """Pytest hook to set up mocks before test collection"""
-
-    class MockClient:
-        def collection(self, name):
-            return self
+@pytest.fixture(autouse=True)
+def _test_env(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret")
+    monkeypatch.setenv("JWT_ALGORITHM", "HS256")
+    monkeypatch.setenv("JWT_EXPIRES_MINUTES", "60")
+    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
 
-        def document(self, doc_id=None):
-            return self
 
-        def get(self, transaction=None):
-            return self
+@pytest.fixture(autouse=True)
+def _empty_store():
+    from src.services import memory_firestore
+    from src.services.inventory import clear_product_cache
 
-        def set(self, data, **kwargs):
-            pass
+    memory_firestore.reset()
+    clear_product_cache()
 
-        def transaction(self):
-            return lambda func: func(self)
 
-        def exists(self):
-            return False
+@pytest.fixture
+def db():
+    from src.services.firestore import get_db
 
-        def to_dict(self):
-            return {}
+    return get_db()
 
-    class MockFirestore:
-        def Client(self, **kwargs):
-            return MockClient()
 
-    sys.modules["google.cloud.firestore"] = MockFirestore()
+@pytest.fixture(params=["sync", "async"])
+def service(request):
+    """Call a service function, or its ``*_async`` twin on the memory
+    engine's AsyncClient in the ``async`` run of the test."""
 
+    def call(fn, *args, **kwargs):
+        if request.param == "sync":
+            return fn(*args, **kwargs)
+        fn_async = getattr(sys.modules[fn.__module__], f"{fn.__name__}_async")
+        return asyncio.run(fn_async(*args, **kwargs))
 
-@pytest.fixture(autouse=True)
-def _test_env(monkeypatch):
-    monkeypatch.setenv("JWT_SECRET", "test-secret")
-    monkeypatch.setenv("JWT_ALGORITHM", "HS256")
-    monkeypatch.setenv("JWT_EXPIRES_MINUTES", "60")
-    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
+    return call
 
 
 @pytest.fixture
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_slot_caps_inflight_per_product():
+    from src.services.admission import ProductAdmission
+
+    admission = ProductAdmission(max_inflight=2, wait=1)
+    peak = {"hot": 0, "cold": 0}
+    running = {"hot": 0, "cold": 0}
+
+    async def order(product_id):
+        async with admission.slot(product_id):
+            running[product_id] += 1
+            peak[product_id] = max(peak[product_id], running[product_id])
+            await asyncio.sleep(0.01)
+            running[product_id] -= 1
+
+    async def main():
+        await asyncio.gather(*(order("hot") for _ in range(6)), order("cold"))
+
+    _run(main())
+
+    assert peak == {"hot": 2, "cold": 1}
+    assert admission.snapshot() == {}
+
+
+def test_slot_reports_queue_depth_and_times_out():
+    from prometheus_client import REGISTRY
+
+    from src.security.rate_limit import OverloadedError
+    from src.services.admission import ProductAdmission
+
+    admission = ProductAdmission(max_inflight=1, wait=0.05)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with admission.slot("hot"):
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(admission.slot("hot").__aenter__())
+        await asyncio.sleep(0)
+        depth = admission.snapshot()
+        gauge = REGISTRY.get_sample_value("order_admission_waiting")
+        with pytest.raises(OverloadedError):
+            await waiter
+        release.set()
+        await task
+        return depth, gauge
+
+    assert _run(main()) == ({"hot": {"inflight": 1, "waiting": 1}}, 1)
+    assert admission.snapshot() == {}
+    assert REGISTRY.get_sample_value("order_admission_waiting") == 0
+
+
+def test_sold_out_flag_fails_queued_and_new_requests():
+    from src.services import sold_out
+    from src.services.admission import ProductAdmission, SoldOutError
+
+    admission = ProductAdmission(max_inflight=1, wait=1)
+    outcomes = []
+
+    async def order(sells_out):
+        try:
+            async with admission.slot("hot"):
+                await asyncio.sleep(0.01)
+                if sells_out:
+                    sold_out.mark_sold_out("hot")
+            outcomes.append("placed")
+        except SoldOutError:
+            outcomes.append("sold out")
+
+    async def main():
+        await asyncio.gather(order(True), order(False), order(False))
+
+    _run(main())
+
+    assert outcomes == ["placed", "sold out", "sold out"]
+
+    async def replay():
+        async with admission.slot("hot", fail_fast=False):
+            return True
+
+    assert _run(replay()) is True
+    sold_out.clear_sold_out("hot")
+    _run(order(False))
+    assert outcomes[-1] == "placed"
+
+
+def test_place_order_sold_out_skips_firestore(client, monkeypatch):
+    import src.routers.orders
+    from src.deps import require_user
+    from src.main import app
+    from src.services import sold_out
+    from src.services.admission import ProductAdmission
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    calls = []
+
+    def fake_place_order(buyer_email, product_id, idempotency_key=None, user_id=None):
+        # Like place_order, flag the product it found sold out
+        calls.append(product_id)
+        sold_out.mark_sold_out(product_id)
+        return False
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    monkeypatch.setattr(src.routers.orders, "place_order", fake_place_order)
+    monkeypatch.setattr(src.routers.orders, "admission", ProductAdmission(4, 1))
+
+    body = {"buyer_email": "leo@example.com", "product_id": "product-1"}
+    responses = [client.post("/orders/place", json=body) for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [409, 409, 409]
+    assert calls == ["product-1"]
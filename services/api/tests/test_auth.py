@@ -22,7 +22,7 @@ def test_login_success_returns_token(client, monkeypatch):
     def fake_authenticate_user(email: str, password: str):
         assert email == "leo@example.com"
         assert password == "pass123"
-        return "user-123"
+        return {"sub": "user-123"}
 
     def fake_create_token(claims: dict):
         assert claims["sub"] == "user-123"
@@ -53,3 +53,26 @@ def test_login_invalid_credentials(client, monkeypatch):
         "/auth/login", json={"email": "leo@example.com", "password": "wrong"}
     )
     assert resp.status_code == 401
+
+
+def test_login_uses_async_path_when_enabled(client, monkeypatch):
+    async def fake_authenticate_user_async(email: str, password: str):
+        return {"sub": "user-123"}
+
+    def fail_sync(*args):
+        raise AssertionError("sync path should not be used")
+
+    import src.routers.auth
+
+    monkeypatch.setattr(src.routers.auth, "FIRESTORE_ASYNC", True)
+    monkeypatch.setattr(
+        src.routers.auth, "authenticate_user_async", fake_authenticate_user_async
+    )
+    monkeypatch.setattr(src.routers.auth, "authenticate_user", fail_sync)
+    monkeypatch.setattr(src.routers.auth, "create_token", lambda claims: "tok")
+
+    resp = client.post(
+        "/auth/login", json={"email": "leo@example.com", "password": "pass123"}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"access_token": "tok"}
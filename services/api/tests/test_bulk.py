@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+
+def _write_csv(path, rows):
+    lines = ["product_id,product_name,quantity,price"]
+    lines += [f"p-{i:03d},Item {i},{i % 3},{i}.5" for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_import_csv_writes_typed_products(db, tmp_path):
+    from src.tools import bulk
+
+    source = tmp_path / "catalog.csv"
+    _write_csv(source, 25)
+
+    assert bulk.main(["import", "products", str(source), "--batch-size", "4"]) == 0
+
+    snaps = list(db.collection("Products").stream())
+    assert len(snaps) == 25
+    assert db.collection("Products").document("p-003").get().to_dict() == {
+        "product_id": "p-003",
+        "product_name": "Item 3",
+        "quantity": 0,
+        "price": 3.5,
+        "status": "out_of_stock",
+    }
+    assert not (tmp_path / "catalog.csv.checkpoint").exists()
+
+
+def test_import_resumes_from_checkpoint(db, tmp_path, monkeypatch):
+    from src.tools import bulk
+
+    source = tmp_path / "catalog.csv"
+    _write_csv(source, 10)
+    commit = bulk._commit
+    committed = []
+
+    def failing_commit(collection_ref, docs):
+        if len(committed) == 2:
+            raise RuntimeError("deadline exceeded")
+        committed.append([doc_id for doc_id, _ in docs])
+        commit(collection_ref, docs)
+
+    monkeypatch.setattr(bulk, "_commit", failing_commit)
+    args = ["import", "products", str(source), "--batch-size", "3", "--workers", "1"]
+    with pytest.raises(RuntimeError):
+        bulk.main(args)
+
+    checkpoint = json.loads((tmp_path / "catalog.csv.checkpoint").read_text())
+    assert checkpoint["rows"] == 6
+
+    monkeypatch.setattr(bulk, "_commit", commit)
+    assert bulk.main(args) == 0
+    assert len(list(db.collection("Products").stream())) == 10
+
+
+def test_export_streams_pages_with_stock_from_shards(db, tmp_path):
+    from src.services.inventory import set_shard_count
+    from src.tools import bulk
+
+    products = db.collection("Products")
+    for i in range(5):
+        products.document(f"p-{i}").set(
+            {"product_name": f"Item {i}", "quantity": 10, "status": "in_stock"}
+        )
+    set_shard_count("p-2", 3)
+    target = tmp_path / "products.jsonl"
+
+    assert bulk.main(["export", "products", str(target), "--page-size", "2"]) == 0
+
+    rows = [json.loads(line) for line in target.read_text().splitlines()]
+    assert [row["product_id"] for row in rows] == [f"p-{i}" for i in range(5)]
+    assert {row["quantity"] for row in rows} == {10}
+
+
+def test_orders_round_trip_through_csv(db, tmp_path):
+    from datetime import UTC, datetime
+
+    from src.tools import bulk
+
+    created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+    db.collection("Orders").document("o-1").set(
+        {"buyer_email": "leo@example.com", "product_id": "p-1", "created_at": created}
+    )
+    target = tmp_path / "orders.csv"
+    bulk.main(["export", "orders", str(target)])
+    db.collection("Orders").document("o-1").delete()
+
+    bulk.main(["import", "orders", str(target)])
+
+    assert db.collection("Orders").document("o-1").get().to_dict() == {
+        "buyer_email": "leo@example.com",
+        "product_id": "p-1",
+        "created_at": created,
+    }
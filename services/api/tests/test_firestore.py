@@ -0,0 +1,75 @@
+import threading
+
+
+class FakeTransport:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeApi:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+
+class FakeClient:
+    created = 0
+
+    def __init__(self, project=None):
+        FakeClient.created += 1
+        self.project = project
+        self._firestore_api_internal = FakeApi()
+
+
+class FakeFirestore:
+    Client = FakeClient
+
+
+def _reset(monkeypatch, pool_size=1):
+    import src.services.firestore as fs
+
+    FakeClient.created = 0
+    monkeypatch.setattr(fs, "FIRESTORE_ENGINE", "google")
+    monkeypatch.setattr(fs, "firestore", FakeFirestore)
+    monkeypatch.setattr(fs, "FIRESTORE_CHANNEL_POOL_SIZE", pool_size)
+    monkeypatch.setattr(fs, "_pool", [])
+    monkeypatch.setattr(fs, "_local", threading.local())
+    return fs
+
+
+def test_get_db_is_lazy_and_shared(monkeypatch):
+    fs = _reset(monkeypatch)
+
+    assert FakeClient.created == 0
+    db = fs.get_db()
+    assert fs.get_db() is db
+    assert db.project == "test-project"
+    assert FakeClient.created == 1
+
+
+def test_get_db_spreads_threads_over_the_pool(monkeypatch):
+    fs = _reset(monkeypatch, pool_size=2)
+
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(fs.get_db())) for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert FakeClient.created == 2
+    assert len({id(db) for db in seen}) == 2
+
+
+def test_close_db_closes_channels_and_allows_reopen(monkeypatch):
+    fs = _reset(monkeypatch)
+
+    db = fs.get_db()
+    fs.close_db()
+
+    assert db._firestore_api_internal.transport.closed
+    assert fs.get_db() is not db
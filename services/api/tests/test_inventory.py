@@ -0,0 +1,203 @@
+from datetime import datetime
+
+
+def _seed_product(db, product_id="product-1", quantity=5):
+    db.collection("Products").document(product_id).set(
+        {"product_id": product_id, "quantity": quantity, "status": "in_stock"}
+    )
+
+
+def _orders(db):
+    orders = [snap.to_dict() for snap in db.collection("Orders").stream()]
+    for order in orders:
+        assert isinstance(order.pop("created_at"), datetime)
+    return orders
+
+
+def test_place_order_decrements_stock(db, service):
+    from src.services.inventory import get_stock, place_order
+
+    _seed_product(db, quantity=2)
+
+    assert (
+        service(place_order, "leo@example.com", "product-1", user_id="user-1") is True
+    )
+    assert get_stock("product-1") == 1
+    assert _orders(db) == [
+        {
+            "buyer_email": "leo@example.com",
+            "user_id": "user-1",
+            "product_id": "product-1",
+        }
+    ]
+
+
+def test_place_order_marks_out_of_stock(db, service):
+    from src.services.inventory import place_order
+
+    _seed_product(db, quantity=1)
+
+    assert service(place_order, "leo@example.com", "product-1") is True
+    assert service(place_order, "leo@example.com", "product-1") is False
+    assert db.document("Products/product-1").get().to_dict()["status"] == "out_of_stock"
+    assert len(_orders(db)) == 1
+
+
+def test_place_order_unknown_product(db, service):
+    from src.services.inventory import place_order
+
+    assert service(place_order, "leo@example.com", "missing") is False
+    assert _orders(db) == []
+
+
+def test_set_shard_count_spreads_stock(db):
+    from src.services.inventory import get_stock, set_shard_count
+
+    _seed_product(db, quantity=10)
+
+    assert set_shard_count("product-1", 4) is True
+
+    product = db.document("Products/product-1").get().to_dict()
+    assert product["shard_count"] == 4
+    assert "quantity" not in product
+    shards = [
+        db.document(f"Products/product-1/shards/{i}").get().to_dict() for i in range(4)
+    ]
+    assert [s["quantity"] for s in shards] == [3, 3, 2, 2]
+    assert get_stock("product-1") == 10
+
+
+def test_sharded_place_order_sells_out_every_shard(db, service):
+    from src.services.inventory import get_stock, place_order, set_shard_count
+
+    _seed_product(db, quantity=7)
+    set_shard_count("product-1", 3)
+
+    results = [service(place_order, "leo@example.com", "product-1") for _ in range(8)]
+
+    assert results == [True] * 7 + [False]
+    assert get_stock("product-1") == 0
+    assert db.document("Products/product-1").get().to_dict()["status"] == "out_of_stock"
+    assert len(_orders(db)) == 7
+
+
+def test_set_shard_count_disables_sharding(db):
+    from src.services.inventory import place_order, set_shard_count
+
+    _seed_product(db, quantity=6)
+    set_shard_count("product-1", 3)
+    place_order("leo@example.com", "product-1")
+
+    assert set_shard_count("product-1", 1) is True
+
+    product = db.document("Products/product-1").get().to_dict()
+    assert product["quantity"] == 5
+    assert "shard_count" not in product
+    assert list(db.collection("Products/product-1/shards").stream()) == []
+
+
+def test_place_cart_order_writes_one_order(db, service):
+    from src.services.inventory import get_stock, place_cart_order
+
+    _seed_product(db, "product-1", quantity=3)
+    _seed_product(db, "product-2", quantity=2)
+
+    failures = service(
+        place_cart_order,
+        "leo@example.com",
+        {"product-1": 2, "product-2": 2},
+        user_id="user-1",
+    )
+
+    assert failures == []
+    assert get_stock("product-1") == 1
+    assert get_stock("product-2") == 0
+    assert db.document("Products/product-2").get().to_dict()["status"] == "out_of_stock"
+    assert _orders(db) == [
+        {
+            "buyer_email": "leo@example.com",
+            "user_id": "user-1",
+            "items": [
+                {"product_id": "product-1", "quantity": 2},
+                {"product_id": "product-2", "quantity": 2},
+            ],
+        }
+    ]
+
+
+def test_place_cart_order_is_all_or_nothing(db, service):
+    from src.services.inventory import get_stock, place_cart_order
+
+    _seed_product(db, "product-1", quantity=3)
+    _seed_product(db, "product-2", quantity=1)
+
+    failures = service(
+        place_cart_order,
+        "leo@example.com",
+        {"product-1": 1, "product-2": 2, "missing": 1},
+    )
+
+    assert failures == [
+        {"product_id": "product-2", "reason": "out_of_stock"},
+        {"product_id": "missing", "reason": "not_found"},
+    ]
+    assert get_stock("product-1") == 3
+    assert get_stock("product-2") == 1
+    assert _orders(db) == []
+
+
+def test_place_order_replays_idempotency_key(db, monkeypatch, service):
+    from src.services.firestore import get_async_db
+    from src.services.inventory import get_stock, place_order
+
+    _seed_product(db, quantity=5)
+
+    assert service(place_order, "leo@example.com", "product-1", "user-1:key-1") is True
+
+    transactions = []
+    for client in (db, get_async_db()):
+        monkeypatch.setattr(client, "transaction", lambda: transactions.append(1))
+    assert service(place_order, "leo@example.com", "product-1", "user-1:key-1") is True
+
+    assert transactions == []
+    assert get_stock("product-1") == 4
+    assert len(_orders(db)) == 1
+
+
+def test_place_order_replays_failed_result(db, service):
+    from src.services.inventory import place_order
+
+    _seed_product(db, quantity=0)
+
+    assert service(place_order, "leo@example.com", "product-1", "user-1:key-1") is False
+    db.document("Products/product-1").update({"quantity": 3})
+    assert service(place_order, "leo@example.com", "product-1", "user-1:key-1") is False
+    assert service(place_order, "leo@example.com", "product-1", "user-1:key-2") is True
+
+
+def test_place_order_ignores_expired_idempotency_key(db, service):
+    from datetime import timedelta
+
+    from src.services.inventory import get_stock, place_order
+
+    _seed_product(db, quantity=5)
+    service(place_order, "leo@example.com", "product-1", "user-1:key-1")
+
+    (key,) = db.collection("IdempotencyKeys").stream()
+    key.reference.update({"expires_at": key.get("expires_at") - timedelta(days=2)})
+
+    assert service(place_order, "leo@example.com", "product-1", "user-1:key-1") is True
+    assert get_stock("product-1") == 3
+
+
+def test_place_order_rejects_reused_idempotency_key(db, service):
+    import pytest
+
+    from src.services.inventory import IdempotencyKeyReused, place_order
+
+    _seed_product(db, "product-1", quantity=5)
+    _seed_product(db, "product-2", quantity=5)
+    service(place_order, "leo@example.com", "product-1", "user-1:key-1")
+
+    with pytest.raises(IdempotencyKeyReused):
+        service(place_order, "leo@example.com", "product-2", "user-1:key-1")
@@ -13,3 +13,69 @@ def test_verify_token_rejects_invalid_signature():
 
     result = jwt_mod.decode_token("invalid.token.here")
     assert result is None
+
+
+def test_decode_token_serves_repeat_tokens_from_cache(monkeypatch):
+    import src.security.jwt as jwt_mod
+    from src.utils.cache import TTLCache
+
+    monkeypatch.setattr(jwt_mod, "_token_cache", TTLCache(10, 60))
+    decodes = []
+    real_decode = jwt_mod.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_mod.jwt, "decode", counting_decode)
+
+    token = jwt_mod.create_token({"sub": "user-123"})
+    first = jwt_mod.decode_token(token)
+    first["sub"] = "tampered"
+    second = jwt_mod.decode_token(token)
+
+    assert second["sub"] == "user-123"
+    assert len(decodes) == 1
+    assert jwt_mod.token_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_decode_token_cache_respects_exp(monkeypatch):
+    import time
+
+    import src.security.jwt as jwt_mod
+    from src.utils.cache import TTLCache
+
+    monkeypatch.setattr(jwt_mod, "_token_cache", TTLCache(10, 60))
+    token = "expired.token.here"
+    expired = {"sub": "user-123", "exp": time.time() - 1}
+    jwt_mod._token_cache.set(jwt_mod._digest(token), expired)
+
+    assert jwt_mod.decode_token(token) is None
+    assert jwt_mod.token_cache_stats()["size"] == 0
+
+
+def test_forget_token_evicts_cached_claims(monkeypatch):
+    import src.security.jwt as jwt_mod
+    from src.utils.cache import TTLCache
+
+    monkeypatch.setattr(jwt_mod, "_token_cache", TTLCache(10, 60))
+    token = jwt_mod.create_token({"sub": "user-123"})
+    jwt_mod.decode_token(token)
+
+    jwt_mod.forget_token(token)
+
+    assert jwt_mod.token_cache_stats()["size"] == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    from src.utils.cache import TTLCache
+
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
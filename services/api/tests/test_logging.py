@@ -0,0 +1,80 @@
+import json
+import logging
+import queue
+
+
+def _record(msg="hello %s", args=("world",), level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    from src.utils.logging import JsonFormatter
+
+    line = JsonFormatter().format(_record(route="/orders/place", order_id="o-1"))
+
+    entry = json.loads(line)
+    assert entry["message"] == "hello world"
+    assert entry["severity"] == "INFO"
+    assert entry["route"] == "/orders/place"
+    assert entry["order_id"] == "o-1"
+
+
+def test_context_filter_adds_route_and_trace_ids():
+    from opentelemetry.sdk.trace import TracerProvider
+
+    from src.utils.logging import ContextFilter, current_route
+
+    tracer = TracerProvider().get_tracer("test")
+    token = current_route.set("/products/p-1")
+    try:
+        with tracer.start_as_current_span("request") as span:
+            record = _record()
+            ContextFilter().filter(record)
+    finally:
+        current_route.reset(token)
+
+    assert record.route == "/products/p-1"
+    assert record.trace_id == format(span.get_span_context().trace_id, "032x")
+    assert len(record.span_id) == 16
+
+
+def test_sampling_filter_uses_longest_prefix():
+    from src.utils import logging as log
+
+    sampler = log.SamplingFilter({"/products": 1.0, "/products/hot": 0.0})
+
+    assert sampler.filter(_record(route="/products/hot/1")) is False
+    assert sampler.filter(_record(route="/products/p-1")) is True
+    assert sampler.filter(_record(route="/orders/place")) is True
+    assert sampler.filter(_record(route="/products/hot/1", level=logging.ERROR))
+
+
+def test_parse_sample_rates():
+    from src.utils.logging import parse_sample_rates
+
+    assert parse_sample_rates("/orders/place=0.1, /products=0.01,") == {
+        "/orders/place": 0.1,
+        "/products": 0.01,
+    }
+    assert parse_sample_rates("") == {}
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    from src.utils.logging import DroppingQueueHandler
+
+    formatted = []
+
+    class Lazy:
+        def __str__(self):
+            formatted.append(True)
+            return "lazy"
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(_record("value %s", (Lazy(),)))
+    handler.handle(_record())
+
+    assert formatted == []
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().getMessage() == "value lazy"
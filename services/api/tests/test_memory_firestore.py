@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+from google.cloud import firestore_v1
+
+
+@pytest.fixture
+def memdb():
+    from src.services.memory_firestore import Client, MemoryStore
+
+    return Client(store=MemoryStore())
+
+
+def test_writes_apply_transforms(memdb):
+    doc = memdb.collection("Products").document("p-1")
+    doc.set({"quantity": 2, "meta": {"a": 1}})
+    doc.update({"quantity": firestore_v1.Increment(-1), "meta.b": 2})
+    doc.set({"created_at": firestore_v1.SERVER_TIMESTAMP}, merge=True)
+
+    data = doc.get().to_dict()
+    assert data["quantity"] == 1
+    assert data["meta"] == {"a": 1, "b": 2}
+    assert data["created_at"].tzinfo is not None
+    assert not memdb.collection("Products").document("missing").get().exists
+
+
+def test_queries_filter_order_and_paginate(memdb):
+    products = memdb.collection("Products")
+    for product_id, quantity in [("c", 1), ("a", 3), ("b", 0), ("d", 3)]:
+        products.document(product_id).set({"quantity": quantity})
+    products.document("a").collection("shards").document("0").set({"quantity": 9})
+
+    in_stock = products.where(filter=firestore_v1.FieldFilter("quantity", ">", 0))
+    by_stock = in_stock.order_by("quantity", direction=firestore_v1.Query.DESCENDING)
+    page = products.order_by("__name__").start_after({"__name__": "a"}).limit(2)
+
+    # Ties are broken by document name in the last order_by's direction.
+    assert [s.id for s in by_stock.stream()] == ["d", "a", "c"]
+    assert [s.id for s in page.stream()] == ["b", "c"]
+
+
+def test_transaction_retries_on_conflicting_write(memdb):
+    doc = memdb.collection("Products").document("p-1")
+    doc.set({"quantity": 5})
+    attempts = []
+
+    @firestore_v1.transactional
+    def take(txn):
+        snap = doc.get(transaction=txn)
+        attempts.append(snap.get("quantity"))
+        if len(attempts) == 1:
+            doc.update({"quantity": 3})  # a concurrent buyer commits first
+        txn.update(doc, {"quantity": snap.get("quantity") - 1})
+
+    take(memdb.transaction())
+
+    assert attempts == [5, 3]
+    assert doc.get().get("quantity") == 2
+
+
+def test_concurrent_place_order_never_oversells(db):
+    from src.services import inventory
+
+    db.collection("Products").document("hot").set(
+        {"quantity": 20, "status": "in_stock"}
+    )
+
+    results = []
+
+    def buyer():
+        for _ in range(5):
+            try:
+                results.append(inventory.place_order("leo@example.com", "hot"))
+            except ValueError:  # retries exhausted under contention
+                results.append(None)
+
+    threads = [threading.Thread(target=buyer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    placed = results.count(True)
+    orders = list(db.collection("Orders").stream())
+    product = db.collection("Products").document("hot").get().to_dict()
+    assert placed == len(orders) <= 20
+    assert product["quantity"] == 20 - placed
+    assert all(order.get("created_at") for order in orders)
+
+
+def test_on_snapshot_reports_changes(memdb):
+    products = memdb.collection("Products")
+    products.document("a").set({"name": "A"})
+    seen = []
+    watch = products.on_snapshot(
+        lambda docs, changes, read_time: seen.append(
+            [(change.type.name, change.document.id) for change in changes]
+        )
+    )
+
+    products.document("b").set({"name": "B"})
+    products.document("a").update({"name": "A2"})
+    products.document("b").delete()
+    watch.unsubscribe()
+    products.document("c").set({"name": "C"})
+
+    assert seen == [
+        [("ADDED", "a")],
+        [("ADDED", "b")],
+        [("MODIFIED", "a")],
+        [("REMOVED", "b")],
+    ]
+
+
+def test_async_client_shares_the_store():
+    import asyncio
+
+    from src.services.memory_firestore import AsyncClient, Client, MemoryStore
+
+    store = MemoryStore()
+    Client(store=store).collection("Products").document("p-1").set({"quantity": 1})
+    db = AsyncClient(store=store)
+
+    async def take():
+        @firestore_v1.async_transactional
+        async def txn(txn):
+            snap = await db.collection("Products").document("p-1").get(transaction=txn)
+            txn.update(snap.reference, {"quantity": snap.get("quantity") - 1})
+
+        await txn(db.transaction())
+        return [s.to_dict() async for s in db.collection("Products").stream()]
+
+    assert asyncio.run(take()) == [{"quantity": 0}]
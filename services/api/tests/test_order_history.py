@@ -0,0 +1,79 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def authed(client):
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-1"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    return client
+
+
+def _seed_orders(db, user_id, count, start=datetime(2025, 1, 1, tzinfo=UTC)):
+    for i in range(count):
+        db.collection("Orders").document(f"{user_id}-{i:02d}").set(
+            {
+                "buyer_email": f"{user_id}@example.com",
+                "user_id": user_id,
+                "product_id": "product-1",
+                # Pairs share a timestamp so the order id breaks ties
+                "created_at": start + timedelta(minutes=i // 2),
+            }
+        )
+
+
+def test_place_order_records_user_and_time(db, service):
+    from src.services.inventory import list_user_orders, place_order
+
+    db.collection("Products").document("product-1").set(
+        {"quantity": 1, "status": "in_stock"}
+    )
+    service(place_order, "leo@example.com", "product-1", user_id="user-1")
+
+    orders, next_cursor = service(list_user_orders, "user-1", 10)
+
+    assert [order["product_id"] for order in orders] == ["product-1"]
+    assert isinstance(orders[0]["created_at"], datetime)
+    assert next_cursor is None
+
+
+def test_list_orders_pages_newest_first(db, authed):
+    _seed_orders(db, "user-1", 5)
+    _seed_orders(db, "user-2", 3)
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = authed.get("/orders", params=params).json()
+        pages.append([order["order_id"] for order in body["orders"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == [
+        ["user-1-04", "user-1-03"],
+        ["user-1-02", "user-1-01"],
+        ["user-1-00"],
+    ]
+
+
+def test_list_orders_rejects_bad_cursor(db, authed):
+    import base64
+    import json
+
+    forged = json.dumps(["2025-01-01T00:00:00+00:00", "Orders/other"])
+
+    for cursor in ["not-a-cursor", base64.urlsafe_b64encode(forged.encode()).decode()]:
+        resp = authed.get("/orders", params={"cursor": cursor})
+        assert resp.status_code == 400
+
+
+def test_list_orders_requires_token(client):
+    assert client.get("/orders").status_code == 401
@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+
+
+def _seed_product(db, product_id="product-1", quantity=5):
+    db.collection("Products").document(product_id).set(
+        {"product_id": product_id, "quantity": quantity, "status": "in_stock"}
+    )
+
+
+def _orders(db):
+    return [snap.to_dict() for snap in db.collection("Orders").stream()]
+
+
+def test_place_orders_batch_serves_earliest_buyers(db):
+    from src.services.inventory import get_stock, place_orders_batch
+
+    _seed_product(db, quantity=3)
+
+    buyers = [f"buyer{i}@example.com" for i in range(5)]
+    assert place_orders_batch("product-1", buyers) == [True] * 3 + [False] * 2
+
+    assert get_stock("product-1") == 0
+    assert db.document("Products/product-1").get().to_dict()["status"] == "out_of_stock"
+    assert sorted(o["buyer_email"] for o in _orders(db)) == buyers[:3]
+
+
+def test_place_orders_batch_sharded(db):
+    from src.services.inventory import get_stock, place_orders_batch, set_shard_count
+
+    _seed_product(db, quantity=4)
+    set_shard_count("product-1", 3)
+
+    assert place_orders_batch("product-1", ["a@example.com"] * 3) == [True] * 3
+    assert place_orders_batch("product-1", ["b@example.com"] * 3) == [
+        True,
+        False,
+        False,
+    ]
+    assert get_stock("product-1") == 0
+    assert place_orders_batch("missing", ["c@example.com"]) == [False]
+
+
+def test_group_commit_queue_batches_per_product(db, monkeypatch):
+    from src.services import order_queue
+
+    _seed_product(db, "product-1", quantity=10)
+    _seed_product(db, "product-2", quantity=1)
+    calls = []
+    place_orders_batch = order_queue.place_orders_batch
+
+    def spy(product_id, buyer_emails, user_ids):
+        calls.append((product_id, len(buyer_emails)))
+        return place_orders_batch(product_id, buyer_emails, user_ids)
+
+    monkeypatch.setattr(order_queue, "place_orders_batch", spy)
+    q = order_queue.GroupCommitQueue(max_batch=100, max_wait=0.2, maxsize=100)
+
+    futures = [q.submit("a@example.com", "product-1", "user-a") for _ in range(6)]
+    futures += [q.submit("b@example.com", "product-2") for _ in range(2)]
+    results = [f.result(timeout=5) for f in futures]
+    q.close()
+
+    assert results == [True] * 6 + [True, False]
+    assert sorted(calls) == [("product-1", 6), ("product-2", 2)]
+    orders = _orders(db)
+    assert len(orders) == 7
+    assert sum(order["user_id"] == "user-a" for order in orders) == 6
+
+
+def test_group_commit_queue_rejects_when_full(monkeypatch):
+    from src.services import order_queue
+
+    entered = threading.Event()
+    proceed = threading.Event()
+
+    def blocking_batch(product_id, buyer_emails, user_ids):
+        entered.set()
+        proceed.wait(5)
+        return [True] * len(buyer_emails)
+
+    monkeypatch.setattr(order_queue, "place_orders_batch", blocking_batch)
+    q = order_queue.GroupCommitQueue(max_batch=1, max_wait=0, maxsize=1)
+
+    first = q.submit("a@example.com", "product-1")
+    assert entered.wait(5)
+    second = q.submit("a@example.com", "product-1")
+    with pytest.raises(order_queue.OrderQueueFullError):
+        q.submit("a@example.com", "product-1")
+
+    proceed.set()
+    q.close()
+    assert first.result() is True
+    assert second.result() is True
+
+
+def test_place_order_uses_group_commit_when_enabled(client, monkeypatch):
+    from concurrent.futures import Future
+
+    import src.routers.orders
+    from src.deps import require_user
+    from src.main import app
+
+    submitted = []
+
+    def fake_submit_order(buyer_email, product_id, user_id=None):
+        submitted.append((buyer_email, product_id, user_id))
+        future = Future()
+        future.set_result(True)
+        return future
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    monkeypatch.setattr(src.routers.orders, "ORDER_GROUP_COMMIT", True)
+    monkeypatch.setattr(src.routers.orders, "submit_order", fake_submit_order)
+
+    resp = client.post(
+        "/orders/place",
+        json={"buyer_email": "leo@example.com", "product_id": "product-1"},
+    )
+
+    assert resp.status_code == 200
+    assert submitted == [("leo@example.com", "product-1", "user-123")]
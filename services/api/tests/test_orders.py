@@ -1,12 +1,15 @@
 def test_place_order_success(client, monkeypatch):
-    def fake_place_order(buyer_email: str, product_id: str) -> bool:
+    def fake_place_order(
+        buyer_email: str, product_id: str, idempotency_key=None, user_id=None
+    ) -> bool:
         assert buyer_email == "leo@example.com"
         assert product_id == "product-1"
+        assert user_id == "user-123"
         return True
 
+    import src.routers.orders
     from src.deps import require_user
     from src.main import app
-    import src.routers.orders
 
     async def fake_require_user_override(creds=None):
         return {"sub": "user-123"}
@@ -23,12 +26,14 @@ def test_place_order_success(client, monkeypatch):
 
 
 def test_place_order_out_of_stock(client, monkeypatch):
-    def fake_place_order(buyer_email: str, product_id: str) -> bool:
+    def fake_place_order(
+        buyer_email: str, product_id: str, idempotency_key=None, user_id=None
+    ) -> bool:
         return False
 
+    import src.routers.orders
     from src.deps import require_user
     from src.main import app
-    import src.routers.orders
 
     async def fake_require_user_override(creds=None):
         return {"sub": "user-123"}
@@ -50,3 +55,119 @@ def test_place_order_missing_token_401(client):
         json={"buyer_email": "leo@example.com", "product_id": "product-1"},
     )
     assert resp.status_code in (401, 403)
+
+
+def test_place_cart_merges_duplicate_items(client, monkeypatch):
+    def fake_place_cart_order(buyer_email: str, items: dict, user_id=None) -> list:
+        assert buyer_email == "leo@example.com"
+        assert items == {"product-1": 3, "product-2": 1}
+        return []
+
+    import src.routers.orders
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    monkeypatch.setattr(src.routers.orders, "place_cart_order", fake_place_cart_order)
+
+    resp = client.post(
+        "/orders/cart",
+        json={
+            "buyer_email": "leo@example.com",
+            "items": [
+                {"product_id": "product-1", "quantity": 2},
+                {"product_id": "product-2"},
+                {"product_id": "product-1"},
+            ],
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "order placed"}
+
+
+def test_place_cart_reports_item_failures(client, monkeypatch):
+    failures = [{"product_id": "product-2", "reason": "out_of_stock"}]
+
+    import src.routers.orders
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    monkeypatch.setattr(
+        src.routers.orders,
+        "place_cart_order",
+        lambda email, items, user_id=None: failures,
+    )
+
+    resp = client.post(
+        "/orders/cart",
+        json={
+            "buyer_email": "leo@example.com",
+            "items": [{"product_id": "product-1"}, {"product_id": "product-2"}],
+        },
+    )
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == {"message": "Out of stock", "items": failures}
+
+
+def test_place_order_uses_async_path_when_enabled(client, monkeypatch):
+    async def fake_place_order_async(
+        buyer_email: str, product_id: str, idempotency_key=None, user_id=None
+    ) -> bool:
+        assert product_id == "product-1"
+        return True
+
+    def fail_sync(*args):
+        raise AssertionError("sync path should not be used")
+
+    import src.routers.orders
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    monkeypatch.setattr(src.routers.orders, "FIRESTORE_ASYNC", True)
+    monkeypatch.setattr(src.routers.orders, "place_order_async", fake_place_order_async)
+    monkeypatch.setattr(src.routers.orders, "place_order", fail_sync)
+
+    resp = client.post(
+        "/orders/place",
+        json={"buyer_email": "leo@example.com", "product_id": "product-1"},
+    )
+    assert resp.status_code == 200
+
+
+def test_place_order_idempotency_key(client, db):
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    db.collection("Products").document("product-1").set(
+        {"product_id": "product-1", "quantity": 1, "status": "in_stock"}
+    )
+
+    order = {"buyer_email": "leo@example.com", "product_id": "product-1"}
+    headers = {"Idempotency-Key": "retry-1"}
+    first = client.post("/orders/place", json=order, headers=headers)
+    retry = client.post("/orders/place", json=order, headers=headers)
+    reused = client.post(
+        "/orders/place",
+        json={**order, "product_id": "product-2"},
+        headers=headers,
+    )
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert reused.status_code == 422
+    assert client.post("/orders/place", json=order).status_code == 409
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+
+
+def test_hash_and_verify_roundtrip():
+    from src.security.password import hash_password, verify_password
+
+    hashed = hash_password("pass123")
+
+    assert hashed.startswith("$argon2")
+    assert "m=1024,t=1,p=1" in hashed
+    assert verify_password("pass123", hashed) is True
+    assert verify_password("wrong", hashed) is False
+
+
+def test_async_hash_and_verify_roundtrip():
+    from src.security.password import hash_password_async, verify_password_async
+
+    async def roundtrip():
+        hashed = await hash_password_async("pass123")
+        return await verify_password_async("pass123", hashed)
+
+    assert asyncio.run(roundtrip()) is True
+
+
+def test_saturated_pool_rejects_new_work(monkeypatch):
+    from src.security import password
+
+    monkeypatch.setattr(password, "_slots", threading.BoundedSemaphore(1))
+    release = threading.Event()
+    blocked = password._submit(release.wait)
+
+    with pytest.raises(password.HashingBusyError):
+        password.hash_password("pass123")
+
+    release.set()
+    blocked.result()
+    assert password.verify_password("pass123", password.hash_password("pass123"))
+
+
+def test_register_returns_503_when_hashing_is_saturated(client, monkeypatch):
+    import src.routers.auth
+    from src.security.password import HashingBusyError
+
+    def busy_create_user(email: str, password: str):
+        raise HashingBusyError
+
+    monkeypatch.setattr(src.routers.auth, "create_user", busy_create_user)
+
+    resp = client.post(
+        "/auth/register", json={"email": "leo@example.com", "password": "pass123"}
+    )
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
@@ -0,0 +1,142 @@
+def _seed(db, product_id, quantity, **fields):
+    db.collection("Products").document(product_id).set(
+        {
+            "name": product_id.title(),
+            "quantity": quantity,
+            "status": "in_stock",
+            **fields,
+        }
+    )
+
+
+def test_get_product(client, db):
+    _seed(db, "product-1", 3)
+
+    resp = client.get("/products/product-1")
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "product_id": "product-1",
+        "name": "Product-1",
+        "quantity": 3,
+        "status": "in_stock",
+    }
+    assert resp.headers["ETag"]
+
+
+def test_get_product_not_found(client, db):
+    resp = client.get("/products/missing")
+
+    assert resp.status_code == 404
+
+
+def test_get_product_sums_shards(client, db):
+    from src.services.inventory import set_shard_count
+
+    _seed(db, "product-1", 10)
+    set_shard_count("product-1", 3)
+
+    product = client.get("/products/product-1").json()
+
+    assert product["quantity"] == 10
+    assert "shard_count" not in product
+
+
+def test_get_product_if_none_match(client, db):
+    _seed(db, "product-1", 3)
+    etag = client.get("/products/product-1").headers["ETag"]
+
+    resp = client.get("/products/product-1", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+
+
+def test_get_product_is_served_from_cache(client, db):
+    _seed(db, "product-1", 3)
+    client.get("/products/product-1")
+
+    db.document("Products/product-1").update({"quantity": 99})
+
+    assert client.get("/products/product-1").json()["quantity"] == 3
+
+
+def test_place_order_invalidates_cached_product(client, db):
+    from src.services.inventory import place_order
+
+    _seed(db, "product-1", 1)
+    etag = client.get("/products/product-1").headers["ETag"]
+    client.get("/products")
+
+    assert place_order("leo@example.com", "product-1") is True
+
+    resp = client.get("/products/product-1", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["quantity"] == 0
+    assert resp.json()["status"] == "out_of_stock"
+    assert client.get("/products").json()["products"][0]["quantity"] == 0
+
+
+def test_list_products_paginates_with_cursor(client, db):
+    for i in range(5):
+        _seed(db, f"product-{i}", i)
+
+    first = client.get("/products", params={"limit": 2}).json()
+    second = client.get(
+        "/products", params={"limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+    last = client.get(
+        "/products", params={"limit": 2, "cursor": second["next_cursor"]}
+    ).json()
+
+    assert [p["product_id"] for p in first["products"]] == ["product-0", "product-1"]
+    assert [p["product_id"] for p in second["products"]] == ["product-2", "product-3"]
+    assert [p["product_id"] for p in last["products"]] == ["product-4"]
+    assert last["next_cursor"] is None
+
+
+def test_list_products_rejects_bad_cursor(client, db):
+    _seed(db, "product-1", 3)
+
+    for cursor in ["a/b", "..", "x" * 1501]:
+        resp = client.get("/products", params={"cursor": cursor})
+        assert resp.status_code == 400
+
+
+def test_list_products_if_none_match(client, db):
+    _seed(db, "product-1", 3)
+    etag = client.get("/products").headers["ETag"]
+
+    resp = client.get("/products", headers={"If-None-Match": f"W/{etag}"})
+
+    assert resp.status_code == 304
+
+
+def test_get_product_reads_shards(db, service):
+    from src.services.inventory import get_product, set_shard_count
+
+    _seed(db, "product-1", 10)
+    set_shard_count("product-1", 3)
+
+    assert service(get_product, "product-1") == {
+        "product_id": "product-1",
+        "name": "Product-1",
+        "quantity": 10,
+        "status": "in_stock",
+    }
+    assert service(get_product, "missing") is None
+
+
+def test_list_products_pages(db, service):
+    from src.services.inventory import list_products, set_shard_count
+
+    for i in range(3):
+        _seed(db, f"product-{i}", i + 1)
+    set_shard_count("product-2", 2)
+
+    first, cursor = service(list_products, 2)
+    last, end = service(list_products, 2, cursor)
+
+    assert [p["product_id"] for p in first] == ["product-0", "product-1"]
+    assert [(p["product_id"], p["quantity"]) for p in last] == [("product-2", 3)]
+    assert end is None
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+
+def test_memory_backend_refills_at_rate(monkeypatch):
+    from src.security import rate_limit
+
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    backend = rate_limit.MemoryBackend()
+
+    def take():
+        return asyncio.run(backend.take("k", rate=2, burst=2))
+
+    assert [take(), take()] == [0, 0]
+    assert take() == pytest.approx(0.5)
+    now[0] += 0.5
+    assert take() == 0
+    assert take() == pytest.approx(0.5)
+
+
+def test_memory_backend_evicts_least_recently_used():
+    from src.security.rate_limit import MemoryBackend
+
+    backend = MemoryBackend(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        asyncio.run(backend.take(key, rate=1, burst=5))
+
+    assert list(backend._buckets) == ["a", "c"]
+
+
+def test_rate_limiter_keys_limits_separately():
+    from src.security.rate_limit import MemoryBackend, RateLimitedError, RateLimiter
+
+    limiter = RateLimiter(MemoryBackend(), {"order_user": (0.001, 1)})
+
+    asyncio.run(limiter.hit("order_user", "user-1"))
+    asyncio.run(limiter.hit("order_user", "user-2"))
+    asyncio.run(limiter.hit("disabled", "user-1"))
+    with pytest.raises(RateLimitedError) as exc:
+        asyncio.run(limiter.hit("order_user", "user-1"))
+    assert exc.value.retry_after > 0
+
+
+def test_rate_limiter_lets_requests_through_when_backend_fails():
+    from src.security.rate_limit import RateLimiter
+
+    class Broken:
+        async def take(self, key, rate, burst):
+            raise ConnectionError("down")
+
+    asyncio.run(RateLimiter(Broken(), {"auth_ip": (1, 1)}).hit("auth_ip", "1.2.3.4"))
+
+
+def test_login_is_rate_limited_per_ip(client, monkeypatch):
+    import src.routers.auth
+    from src.security.rate_limit import MemoryBackend, rate_limiter
+
+    monkeypatch.setattr(src.routers.auth, "authenticate_user", lambda e, p: None)
+    monkeypatch.setattr(rate_limiter, "backend", MemoryBackend())
+    monkeypatch.setitem(rate_limiter.limits, "auth_ip", (0.01, 1))
+
+    body = {"email": "leo@example.com", "password": "wrong"}
+    assert client.post("/auth/login", json=body).status_code == 401
+    resp = client.post("/auth/login", json=body)
+
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+
+
+def test_auth_ip_limit_keys_on_trusted_forwarded_hop(client, monkeypatch):
+    import src.deps
+    import src.routers.auth
+    from src.security.rate_limit import MemoryBackend, rate_limiter
+
+    monkeypatch.setattr(src.routers.auth, "authenticate_user", lambda e, p: None)
+    monkeypatch.setattr(rate_limiter, "backend", MemoryBackend())
+    monkeypatch.setitem(rate_limiter.limits, "auth_ip", (0.01, 1))
+    monkeypatch.setattr(src.deps, "TRUSTED_PROXY_HOPS", 1)
+
+    def login(forwarded_for):
+        body = {"email": "leo@example.com", "password": "wrong"}
+        headers = {"X-Forwarded-For": forwarded_for}
+        return client.post("/auth/login", json=body, headers=headers).status_code
+
+    assert login("203.0.113.7") == 401
+    assert login("198.51.100.1") == 401
+    # A forged leading entry does not change the hop the proxy appended
+    assert login("10.0.0.1, 203.0.113.7") == 429
+
+
+def test_orders_are_shed_when_too_many_in_flight(client, monkeypatch):
+    import src.routers.orders
+    from src.deps import require_user
+    from src.main import app
+    from src.security.rate_limit import order_slots
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    def fail(*args):
+        raise AssertionError("shed requests must not reach Firestore")
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    monkeypatch.setattr(src.routers.orders, "place_order", fail)
+    monkeypatch.setattr(order_slots, "limit", 1)
+    monkeypatch.setattr(order_slots, "inflight", 1)
+
+    resp = client.post(
+        "/orders/place",
+        json={"buyer_email": "leo@example.com", "product_id": "product-1"},
+    )
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
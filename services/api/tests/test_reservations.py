@@ -0,0 +1,187 @@
+from datetime import UTC, datetime, timedelta
+
+
+def _seed_product(db, product_id="product-1", quantity=5):
+    db.collection("Products").document(product_id).set(
+        {"product_id": product_id, "quantity": quantity, "status": "in_stock"}
+    )
+
+
+def _expire(db, reservation_id):
+    db.document(f"Reservations/{reservation_id}").update(
+        {"expires_at": datetime.now(UTC) - timedelta(seconds=1)}
+    )
+
+
+def _orders(db):
+    return [snap.to_dict() for snap in db.collection("Orders").stream()]
+
+
+def test_reserve_holds_stock_until_confirmed(db, service):
+    from src.services.inventory import get_stock
+    from src.services.reservations import confirm, reserve
+
+    _seed_product(db, quantity=2)
+
+    reservation_id, failures = service(
+        reserve, "leo@example.com", "user-1", {"product-1": 2}
+    )
+
+    assert failures == []
+    assert get_stock("product-1") == 0
+    assert db.document("Products/product-1").get().to_dict()["status"] == "out_of_stock"
+    assert _orders(db) == []
+
+    status, order_id = service(confirm, reservation_id, "user-1")
+
+    assert status == "confirmed"
+    (order,) = _orders(db)
+    assert order["items"] == [{"product_id": "product-1", "quantity": 2}]
+    assert order["reservation_id"] == reservation_id
+    assert service(confirm, reservation_id, "user-1") == ("confirmed", order_id)
+    assert len(_orders(db)) == 1
+    assert get_stock("product-1") == 0
+
+
+def test_reserve_cannot_oversell(db, service):
+    from src.services.reservations import reserve
+
+    _seed_product(db, quantity=1)
+    service(reserve, "leo@example.com", "user-1", {"product-1": 1})
+
+    reservation_id, failures = service(
+        reserve, "ana@example.com", "user-2", {"product-1": 1}
+    )
+
+    assert reservation_id is None
+    assert failures == [{"product_id": "product-1", "reason": "out_of_stock"}]
+
+
+def test_release_returns_stock(db, service):
+    from src.services.inventory import get_stock
+    from src.services.reservations import confirm, release, reserve
+
+    _seed_product(db, quantity=1)
+    reservation_id, _ = service(reserve, "leo@example.com", "user-1", {"product-1": 1})
+
+    assert service(release, reservation_id, "user-2") == "not_found"
+    assert service(release, reservation_id, "user-1") == "released"
+    assert service(release, reservation_id, "user-1") == "released"
+    assert get_stock("product-1") == 1
+    assert db.document("Products/product-1").get().to_dict()["status"] == "in_stock"
+    assert service(confirm, reservation_id, "user-1") == ("released", None)
+
+
+def test_release_reopens_a_sold_out_product(db, service):
+    from src.services.inventory import place_order
+    from src.services.reservations import release, reserve
+
+    _seed_product(db, quantity=1)
+    reservation_id, _ = service(reserve, "leo@example.com", "user-1", {"product-1": 1})
+    assert service(place_order, "ana@example.com", "product-1") is False
+
+    service(release, reservation_id, "user-1")
+
+    assert service(place_order, "ana@example.com", "product-1") is True
+
+
+def test_release_returns_stock_to_a_shard(db, service):
+    from src.services.inventory import get_stock, set_shard_count
+    from src.services.reservations import release, reserve
+
+    _seed_product(db, quantity=3)
+    set_shard_count("product-1", 3)
+    reservation_id, _ = service(reserve, "leo@example.com", "user-1", {"product-1": 3})
+    assert db.document("Products/product-1").get().to_dict()["status"] == "out_of_stock"
+
+    service(release, reservation_id, "user-1")
+
+    assert get_stock("product-1") == 3
+    assert db.document("Products/product-1").get().to_dict()["status"] == "in_stock"
+
+
+def test_confirm_expired_reservation_releases_it(db, service):
+    from src.services.inventory import get_stock
+    from src.services.reservations import confirm, reserve
+
+    _seed_product(db, quantity=1)
+    reservation_id, _ = service(reserve, "leo@example.com", "user-1", {"product-1": 1})
+    _expire(db, reservation_id)
+
+    assert service(confirm, reservation_id, "user-1") == ("expired", None)
+    assert get_stock("product-1") == 1
+    assert _orders(db) == []
+
+
+def test_release_expired_sweeps_only_expired_holds(db):
+    from src.services.inventory import get_stock
+    from src.services.reservations import confirm, release_expired, reserve
+
+    _seed_product(db, quantity=5)
+    expired, _ = reserve("leo@example.com", "user-1", {"product-1": 2})
+    live, _ = reserve("leo@example.com", "user-1", {"product-1": 1})
+    confirmed, _ = reserve("leo@example.com", "user-1", {"product-1": 1})
+    confirm(confirmed, "user-1")
+    _expire(db, expired)
+    _expire(db, confirmed)
+
+    assert release_expired() == 1
+    assert release_expired() == 0
+
+    assert get_stock("product-1") == 3
+    assert db.document(f"Reservations/{expired}").get().to_dict()["status"] == "expired"
+    assert db.document(f"Reservations/{live}").get().to_dict()["status"] == "held"
+    assert (
+        db.document(f"Reservations/{confirmed}").get().to_dict()["status"]
+        == "confirmed"
+    )
+
+
+def test_reservation_transactions_are_counted(db, service):
+    from src.services.reservations import confirm, release, reserve
+    from src.utils.stats import txn_stats
+
+    def attempts(operation):
+        return txn_stats.snapshot().get(operation, {}).get("attempts", 0)
+
+    before = {
+        op: attempts(op)
+        for op in ("reserve", "confirm_reservation", "release_reservation")
+    }
+    _seed_product(db)
+    first, _ = service(reserve, "leo@example.com", "user-1", {"product-1": 1})
+    second, _ = service(reserve, "leo@example.com", "user-1", {"product-1": 1})
+    service(confirm, first, "user-1")
+    service(release, second, "user-1")
+
+    assert {op: attempts(op) - n for op, n in before.items()} == {
+        "reserve": 2,
+        "confirm_reservation": 1,
+        "release_reservation": 1,
+    }
+
+
+def test_reservation_endpoints(client, db):
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return {"sub": "user-123"}
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    _seed_product(db, quantity=1)
+    body = {"buyer_email": "leo@example.com", "items": [{"product_id": "product-1"}]}
+
+    created = client.post("/reservations", json=body)
+    assert created.status_code == 201
+    reservation_id = created.json()["reservation_id"]
+
+    sold_out = client.post("/reservations", json=body)
+    assert sold_out.status_code == 409
+
+    confirmed = client.post(f"/reservations/{reservation_id}/confirm")
+    assert confirmed.status_code == 200
+    assert confirmed.json()["order_id"]
+
+    assert client.delete(f"/reservations/{reservation_id}").status_code == 409
+    assert client.post("/reservations/missing/confirm").status_code == 404
@@ -0,0 +1,124 @@
+import pytest
+
+
+def _seed(db, product_id, quantity):
+    db.collection("Products").document(product_id).set(
+        {
+            "name": product_id.title(),
+            "quantity": quantity,
+            "status": "in_stock" if quantity else "out_of_stock",
+        }
+    )
+
+
+def _login_as(client, claims):
+    from src.deps import require_user
+    from src.main import app
+
+    async def fake_require_user_override(creds=None):
+        return claims
+
+    app.dependency_overrides[require_user] = fake_require_user_override
+    return client
+
+
+@pytest.fixture
+def authed(client):
+    return _login_as(client, {"sub": "user-123", "role": "admin"})
+
+
+def test_restock_requires_token(client):
+    resp = client.post(
+        "/products/restock", json={"items": [{"product_id": "p", "delta": 1}]}
+    )
+
+    assert resp.status_code == 401
+
+
+def test_restock_requires_admin_role(client, db):
+    _seed(db, "product-1", 0)
+    user = _login_as(client, {"sub": "user-123"})
+
+    resp = user.post(
+        "/products/restock",
+        json={"items": [{"product_id": "product-1", "delta": 5}]},
+    )
+
+    assert resp.status_code == 403
+    assert db.document("Products/product-1").get().to_dict()["quantity"] == 0
+
+
+def test_restock_reports_each_item(authed, db):
+    _seed(db, "product-1", 0)
+    _seed(db, "product-2", 2)
+
+    resp = authed.post(
+        "/products/restock",
+        json={
+            "items": [
+                {"product_id": "product-1", "delta": 3},
+                {"product_id": "product-2", "delta": -3},
+                {"product_id": "missing", "delta": 1},
+                {"product_id": "product-1", "delta": 2},
+            ]
+        },
+    )
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "results": [
+            {"product_id": "product-1", "delta": 5, "result": "ok"},
+            {"product_id": "product-2", "delta": -3, "result": "insufficient_stock"},
+            {"product_id": "missing", "delta": 1, "result": "not_found"},
+        ],
+        "failed": 2,
+    }
+    assert db.document("Products/product-1").get().to_dict()["quantity"] == 5
+    assert db.document("Products/product-1").get().to_dict()["status"] == "in_stock"
+    assert db.document("Products/product-2").get().to_dict()["quantity"] == 2
+
+
+def test_restock_to_zero_marks_out_of_stock(authed, db):
+    _seed(db, "product-1", 2)
+
+    authed.post(
+        "/products/restock",
+        json={"items": [{"product_id": "product-1", "delta": -2}]},
+    )
+
+    assert db.document("Products/product-1").get().to_dict() == {
+        "name": "Product-1",
+        "quantity": 0,
+        "status": "out_of_stock",
+    }
+
+
+def test_restock_splits_products_into_batches(db, monkeypatch, service):
+    from src.services import restock
+    from src.services.inventory import get_stock, set_shard_count
+
+    for i in range(5):
+        _seed(db, f"product-{i}", 1)
+    set_shard_count("product-4", 2)
+    monkeypatch.setattr(restock, "RESTOCK_BATCH_SIZE", 2)
+
+    results = service(restock.restock, {f"product-{i}": 10 for i in range(5)})
+
+    assert [r["product_id"] for r in results] == [f"product-{i}" for i in range(5)]
+    assert {r["result"] for r in results} == {"ok"}
+    assert [get_stock(f"product-{i}") for i in range(5)] == [11] * 5
+
+
+def test_restock_clears_sold_out_flag(authed, db):
+    from src.services import sold_out
+    from src.services.admission import admission
+
+    _seed(db, "product-1", 0)
+    sold_out.mark_sold_out("product-1")
+
+    authed.post(
+        "/products/restock",
+        json={"items": [{"product_id": "product-1", "delta": 1}]},
+    )
+
+    admission._check_sold_out("product-1")  # raises SoldOutError if still flagged
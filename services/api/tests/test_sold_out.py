@@ -0,0 +1,95 @@
+def _seed(db, product_id, quantity):
+    db.collection("Products").document(product_id).set(
+        {"quantity": quantity, "status": "in_stock" if quantity else "out_of_stock"}
+    )
+
+
+def test_sold_out_product_fails_without_firestore(db, monkeypatch):
+    from src.services import inventory
+    from src.services.inventory import place_cart_order, place_order
+
+    _seed(db, "product-1", 0)
+    assert place_order("leo@example.com", "product-1") is False
+
+    monkeypatch.setattr(inventory, "products_ref", None)
+
+    assert place_order("leo@example.com", "product-1") is False
+    assert place_cart_order("leo@example.com", {"product-1": 1}) == [
+        {"product_id": "product-1", "reason": "out_of_stock"}
+    ]
+
+
+def test_sold_out_flag_applies_to_async_orders(monkeypatch):
+    import asyncio
+
+    from src.services import inventory, sold_out
+
+    sold_out.mark_sold_out("product-1")
+    monkeypatch.setattr(inventory, "async_products_ref", None)
+
+    placed = asyncio.run(inventory.place_order_async("leo@example.com", "product-1"))
+
+    assert placed is False
+    sold_out.clear()
+
+
+def test_keyed_orders_skip_the_sold_out_flag(db):
+    from src.services import sold_out
+    from src.services.inventory import place_order
+
+    _seed(db, "product-1", 1)
+    sold_out.mark_sold_out("product-1")
+
+    assert place_order("leo@example.com", "product-1", idempotency_key="k") is True
+
+
+def test_unknown_products_are_not_flagged(db, service):
+    from src.services import sold_out
+    from src.services.inventory import place_order, place_orders_batch
+
+    assert service(place_order, "leo@example.com", "missing") is False
+    assert place_orders_batch("missing", ["leo@example.com"]) == [False]
+
+    assert not sold_out.is_sold_out("missing")
+
+
+def test_restock_clears_the_sold_out_flag(db):
+    from src.services.inventory import place_order
+    from src.services.restock import restock
+
+    _seed(db, "product-1", 1)
+    assert place_order("leo@example.com", "product-1") is True
+    assert place_order("leo@example.com", "product-1") is False
+
+    restock({"product-1": 2})
+
+    assert place_order("leo@example.com", "product-1") is True
+
+
+def test_products_watch_follows_status(db, monkeypatch):
+    from src.services import sold_out
+
+    monkeypatch.setattr(sold_out, "SOLD_OUT_CACHE_WATCH", True)
+    sold_out.clear()
+    products = db.collection("Products")
+    _seed(db, "product-1", 0)
+    _seed(db, "product-2", 3)
+
+    sold_out.start_watch()
+    try:
+        assert sold_out.is_sold_out("product-1")
+        assert not sold_out.is_sold_out("product-2")
+
+        # Restocked and sold out by other instances
+        products.document("product-1").update({"quantity": 5, "status": "in_stock"})
+        products.document("product-2").update({"quantity": 0, "status": "out_of_stock"})
+
+        assert not sold_out.is_sold_out("product-1")
+        assert sold_out.is_sold_out("product-2")
+
+        products.document("product-2").delete()
+
+        assert not sold_out.is_sold_out("product-2")
+    finally:
+        sold_out.stop_watch()
+        sold_out.clear()
@@ -0,0 +1,67 @@
+def test_transaction_stats_counts_retries():
+    from src.utils.stats import TransactionStats
+
+    stats = TransactionStats()
+
+    @stats.counted("op")
+    def body(transaction):
+        return "done"
+
+    class Transaction:
+        pass
+
+    first, second = Transaction(), Transaction()
+    body(first)
+    body(first)
+    body(second)
+
+    assert stats.snapshot() == {"op": {"transactions": 2, "attempts": 3, "retries": 1}}
+
+
+def test_health_stats_reports_order_transactions(client, db):
+    from src.services.inventory import place_order
+
+    before = client.get("/health/stats").json()["transactions"]
+    db.collection("Products").document("product-1").set(
+        {"product_id": "product-1", "quantity": 1, "status": "in_stock"}
+    )
+    place_order("leo@example.com", "product-1")
+
+    after = client.get("/health/stats").json()["transactions"]["place_order"]
+    attempts_before = before.get("place_order", {}).get("attempts", 0)
+    assert after["attempts"] == attempts_before + 1
+
+
+def test_health_stats_reports_the_token_cache(client):
+    from src.security.jwt import create_token, decode_token, token_cache_stats
+
+    before = token_cache_stats()["hits"]
+    token = create_token({"sub": "user-1"})
+    decode_token(token)
+    decode_token(token)
+
+    stats = client.get("/health/stats").json()["jwt_cache"]
+
+    assert stats["hits"] == before + 1
+    assert stats["size"] >= 1
+
+
+def test_metrics_exposes_hot_path_series(client, db):
+    from src.services.inventory import place_order
+
+    db.collection("Products").document("product-1").set(
+        {"product_id": "product-1", "quantity": 1, "status": "in_stock"}
+    )
+    place_order("leo@example.com", "product-1")
+    client.get("/products/product-1")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'firestore_transaction_attempts_total{operation="place_order"}' in body
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/products/{product_id}",status="200"}'
+    ) in body
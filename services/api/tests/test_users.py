@@ -0,0 +1,23 @@
+def test_create_and_authenticate_user(db, service):
+    from src.services.users import authenticate_user, create_user
+
+    service(create_user, "leo@example.com", "s3cret-pass")
+
+    assert db.document("Users/leo@example.com").get().exists
+    assert service(authenticate_user, "leo@example.com", "s3cret-pass") == {
+        "sub": "leo@example.com"
+    }
+    assert service(authenticate_user, "leo@example.com", "wrong") is None
+    assert service(authenticate_user, "ana@example.com", "s3cret-pass") is None
+
+
+def test_authenticate_user_carries_role(db, service):
+    from src.services.users import authenticate_user, create_user
+
+    service(create_user, "ops@example.com", "s3cret-pass")
+    db.document("Users/ops@example.com").update({"role": "admin"})
+
+    assert service(authenticate_user, "ops@example.com", "s3cret-pass") == {
+        "sub": "ops@example.com",
+        "role": "admin",
+    }
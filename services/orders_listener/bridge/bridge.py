@@ -1,10 +1,18 @@
+import json
 import logging
 import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any
 
 import requests
 from google.cloud import firestore
+from prometheus_client import Histogram, start_http_server
+from requests.adapters import HTTPAdapter
 
 
 def _get_env(name: str, default: str | None = None) -> str:
@@ -17,63 +25,266 @@ def _get_env(name: str, default: str | None = None) -> str:
 PROJECT_ID = os.getenv("GCP_PROJECT_ID") or os.getenv("GOOGLE_CLOUD_PROJECT", "demo-inventory")
 ORDERS_COLLECTION = os.getenv("ORDERS_COLLECTION", "Orders")
 FUNCTIONS_URL = _get_env("FUNCTIONS_URL", "http://orders_listener:8080/")
+CHECKPOINT_PATH = Path(os.getenv("BRIDGE_CHECKPOINT_PATH", "bridge_checkpoint.json"))
+PAGE_SIZE = int(os.getenv("BRIDGE_PAGE_SIZE", "200"))
+
+# Delivery: at most CONCURRENCY requests in flight over a pooled session,
+# BATCH_SIZE orders per request (1 sends one event per order), retried with
+# exponential backoff and full jitter on timeouts, connection errors and 5xx.
+# A batch retry only resends the events the function reports as failed.
+CONCURRENCY = int(os.getenv("BRIDGE_CONCURRENCY", "8"))
+BATCH_SIZE = int(os.getenv("BRIDGE_BATCH_SIZE", "1"))
+REQUEST_TIMEOUT = float(os.getenv("BRIDGE_REQUEST_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("BRIDGE_MAX_RETRIES", "5"))
+BACKOFF_BASE = float(os.getenv("BRIDGE_BACKOFF_BASE", "0.2"))
+BACKOFF_MAX = float(os.getenv("BRIDGE_BACKOFF_MAX", "10"))
+
+# Port for the Prometheus /metrics endpoint; 0 disables it
+METRICS_PORT = int(os.getenv("BRIDGE_METRICS_PORT", "0"))
 
 logging.basicConfig(level=logging.INFO, format="[bridge] %(message)s")
+logger = logging.getLogger("bridge")
+
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_maxsize=CONCURRENCY))
+_session.mount("https://", HTTPAdapter(pool_maxsize=CONCURRENCY))
+_executor = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="deliver")
+
+BRIDGE_LAG = Histogram(
+    "bridge_lag_seconds",
+    "Time from an order's created_at until the function acknowledged it",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+DELIVERY_SECONDS = Histogram(
+    "bridge_delivery_duration_seconds",
+    "Time to deliver one request to the function, retries included",
+)
+
 
+def _to_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [_to_value(item) for item in value]}}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": _to_fields(value)}}
+    if isinstance(value, datetime):
+        return {"timestampValue": value.isoformat()}
+    return {"stringValue": str(value)}
 
-def _to_fields(data: dict[str, Any]) -> dict[str, dict[str, str]]:
-    fields: dict[str, dict[str, str]] = {}
+
+def _to_fields(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    fields: dict[str, dict[str, Any]] = {}
     for key, value in data.items():
-        fields[key] = {"stringValue": str(value)}
+        fields[key] = _to_value(value)
     return fields
 
 
-def _send_event(doc_id: str, data: dict[str, Any]) -> None:
-    payload = {
+def _event(doc_id: str, data: dict[str, Any]) -> dict[str, Any]:
+    return {
         "value": {
             "name": f"projects/{PROJECT_ID}/databases/(default)/documents/{ORDERS_COLLECTION}/{doc_id}",
             "fields": _to_fields(data),
         }
     }
-    response = requests.post(FUNCTIONS_URL, json=payload, timeout=10)
-    logging.info("POST %s -> %s", doc_id, response.status_code)
-    if response.text:
-        logging.info("Response: %s", response.text)
+
+
+def _failed_events(payload: dict[str, Any], response) -> list[dict[str, Any]]:
+    """Events of a batch request whose result the function reports as failed."""
+    if "events" not in payload:
+        return []
+    try:
+        results = response.json()["results"]
+    except (ValueError, KeyError, TypeError):
+        return []
+    return [
+        event
+        for event, result in zip(payload["events"], results)
+        if result.get("status") == "failed"
+    ]
+
+
+class DeliveryError(Exception):
+    """The function did not take a request within MAX_RETRIES retries."""
+
+
+def _post(payload: dict[str, Any], label: str) -> None:
+    """POST until the function takes the request (any non-5xx answer) and,
+    for a batch, every event in it.
+
+    Raises DeliveryError once the retries run out.
+    """
+    error = ""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = _session.post(FUNCTIONS_URL, json=payload, timeout=REQUEST_TIMEOUT)
+        except (requests.Timeout, requests.ConnectionError) as exc:
+            error = str(exc)
+        else:
+            logger.info("POST %s -> %s", label, response.status_code)
+            if response.status_code < 500:
+                if response.text:
+                    logger.info("Response: %s", response.text)
+                failed = _failed_events(payload, response)
+                if not failed:
+                    return
+                payload = {"events": failed}
+                error = f"{len(failed)} failed events"
+            else:
+                error = f"HTTP {response.status_code}"
+
+        if attempt < MAX_RETRIES:
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+            logger.info("Retrying %s in %.2fs: %s", label, delay, error)
+            time.sleep(delay)
+    logger.info("Giving up on %s: %s", label, error)
+    raise DeliveryError(f"{label}: {error}")
+
+
+def _post_timed(
+    payload: dict[str, Any], label: str, created_ats: list[datetime | None]
+) -> None:
+    with DELIVERY_SECONDS.time():
+        _post(payload, label)
+    now = datetime.now(UTC)
+    for created_at in created_ats:
+        if created_at is not None:
+            BRIDGE_LAG.observe((now - created_at).total_seconds())
+
+
+def _deliver(orders: list[tuple[str, dict[str, Any]]]) -> None:
+    """POST ``orders`` to the function and wait until every request is done.
+
+    Raises DeliveryError if any request failed, so the caller does not
+    checkpoint past undelivered orders.
+    """
+    if BATCH_SIZE > 1:
+        jobs = []
+        for i in range(0, len(orders), BATCH_SIZE):
+            chunk = orders[i : i + BATCH_SIZE]
+            events = [_event(doc_id, data) for doc_id, data in chunk]
+            jobs.append(
+                (
+                    {"events": events},
+                    f"batch of {len(chunk)} from {chunk[0][0]}",
+                    [data.get("created_at") for _, data in chunk],
+                )
+            )
+    else:
+        jobs = [
+            (_event(doc_id, data), doc_id, [data.get("created_at")])
+            for doc_id, data in orders
+        ]
+
+    futures = [_executor.submit(_post_timed, *job) for job in jobs]
+    wait(futures)
+    for future in futures:
+        future.result()
+
+
+def _load_checkpoint() -> tuple[datetime | None, set[str]] | None:
+    try:
+        data = json.loads(CHECKPOINT_PATH.read_text())
+    except FileNotFoundError:
+        return None
+    created_at = data["created_at"] and datetime.fromisoformat(data["created_at"])
+    return created_at, set(data["ids"])
+
+
+def _save_checkpoint(created_at: datetime | None, ids: set[str]) -> None:
+    tmp = CHECKPOINT_PATH.with_name(CHECKPOINT_PATH.name + ".tmp")
+    tmp.write_text(
+        json.dumps(
+            {
+                "created_at": created_at.isoformat() if created_at else None,
+                "ids": sorted(ids),
+            }
+        )
+    )
+    tmp.replace(CHECKPOINT_PATH)
+
+
+def _latest_order(collection) -> tuple[datetime | None, set[str]]:
+    query = collection.order_by("created_at", direction=firestore.Query.DESCENDING)
+    for doc in query.limit(1).stream():
+        return doc.get("created_at"), {doc.id}
+    return None, set()
+
+
+def _drain(collection, cursor: datetime | None, boundary_ids: set[str]):
+    """Forward every order created at or after ``cursor``, page by page.
+
+    ``boundary_ids`` holds the orders already sent whose created_at equals
+    the cursor (several orders can share one commit timestamp). Each page is
+    delivered concurrently and the cursor is checkpointed once it is done.
+    """
+    while True:
+        query = collection.order_by("created_at")
+        if cursor is not None:
+            query = query.where(filter=firestore.FieldFilter("created_at", ">=", cursor))
+        limit = PAGE_SIZE + len(boundary_ids)
+        docs = list(query.limit(limit).stream())
+
+        orders = []
+        for doc in docs:
+            data = doc.to_dict() or {}
+            created_at = data.get("created_at")
+            if created_at == cursor and doc.id in boundary_ids:
+                continue
+            logger.info("New order detected: %s", doc.id)
+            orders.append((doc.id, data))
+            if created_at != cursor:
+                cursor, boundary_ids = created_at, set()
+            boundary_ids.add(doc.id)
+
+        if orders:
+            _deliver(orders)
+            _save_checkpoint(cursor, boundary_ids)
+
+        if len(docs) < limit:
+            return cursor, boundary_ids
 
 
 def main() -> None:
-    logging.info("Starting Firestore bridge")
-    logging.info("Project: %s", PROJECT_ID)
-    logging.info("Collection: %s", ORDERS_COLLECTION)
-    logging.info("Functions URL: %s", FUNCTIONS_URL)
+    logger.info("Starting Firestore bridge")
+    logger.info("Project: %s", PROJECT_ID)
+    logger.info("Collection: %s", ORDERS_COLLECTION)
+    logger.info("Functions URL: %s", FUNCTIONS_URL)
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+        logger.info("Metrics on :%s/metrics", METRICS_PORT)
 
     client = firestore.Client(project=PROJECT_ID)
     collection = client.collection(ORDERS_COLLECTION)
 
-    seen_ids: set[str] = set()
-    poll_interval = float(os.getenv("BRIDGE_POLL_INTERVAL", "2"))
-    initialized = False
+    checkpoint = _load_checkpoint()
+    if checkpoint is None:
+        # First run: only orders created from now on are forwarded
+        checkpoint = _latest_order(collection)
+        _save_checkpoint(*checkpoint)
+        logger.info("No checkpoint, starting after %s", checkpoint[0])
+    else:
+        logger.info("Resuming from checkpoint %s", checkpoint[0])
+    cursor, boundary_ids = checkpoint
 
-    while True:
-        try:
-            docs = list(collection.stream())
-            if not initialized:
-                for doc in docs:
-                    seen_ids.add(doc.id)
-                initialized = True
-                logging.info("Initialized polling with %d docs", len(seen_ids))
-            else:
-                for doc in docs:
-                    if doc.id in seen_ids:
-                        continue
-                    seen_ids.add(doc.id)
-                    data = doc.to_dict() or {}
-                    logging.info("New order detected: %s", doc.id)
-                    _send_event(doc.id, data)
-        except Exception as exc:
-            logging.info("Polling error: %s", exc)
-
-        time.sleep(poll_interval)
+    # The listener only watches the newest order, so its state stays one
+    # document big; it just wakes the loop up. The poll interval is a fallback
+    # in case the listen stream drops.
+    wakeup = threading.Event()
+    newest = collection.order_by("created_at", direction=firestore.Query.DESCENDING)
+    watch = newest.limit(1).on_snapshot(lambda *_: wakeup.set())
+    poll_interval = float(os.getenv("BRIDGE_POLL_INTERVAL", "10"))
+
+    try:
+        while True:
+            wakeup.wait(poll_interval)
+            wakeup.clear()
+            try:
+                cursor, boundary_ids = _drain(collection, cursor, boundary_ids)
+            except Exception as exc:
+                logger.info("Polling error: %s", exc)
+                # Start over from the last page that was fully delivered
+                cursor, boundary_ids = _load_checkpoint()
+    finally:
+        watch.unsubscribe()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+import atexit
+import threading
+
+from google.api_core import exceptions
+from google.auth.exceptions import GoogleAuthError
+
+from .cache import TTLCache
+from .config import (
+    PRODUCT_CACHE_SIZE,
+    PRODUCT_CACHE_TTL_SECONDS,
+    PRODUCT_CACHE_WATCH,
+    PRODUCTS_COLLECTION,
+)
+from .firestore_client import get_db
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+_names = TTLCache(PRODUCT_CACHE_SIZE, PRODUCT_CACHE_TTL_SECONDS)
+_watch = None
+_watch_lock = threading.Lock()
+
+
+def _display_name(snap) -> str:
+    return (snap.to_dict() or {}).get("product_name", snap.id)
+
+
+def _on_products_snapshot(docs, changes, read_time) -> None:
+    # Every order rewrites its product's stock, so most changes leave the
+    # name alone; only a rename or a delete evicts the cached entry.
+    for change in changes:
+        snap = change.document
+        cached = _names.peek(snap.id)
+        if cached is None:
+            continue
+        if change.type.name == "REMOVED" or _display_name(snap) != cached:
+            _names.pop(snap.id)
+
+
+def _start_watch(collection) -> None:
+    global _watch
+    if not PRODUCT_CACHE_WATCH or _watch is not None:
+        return
+    with _watch_lock:
+        if _watch is not None or not hasattr(collection, "on_snapshot"):
+            return
+        try:
+            _watch = collection.on_snapshot(_on_products_snapshot)
+        except (exceptions.GoogleAPICallError, GoogleAuthError) as e:
+            # Without the watch the cache still works, bounded by its TTL
+            logger.info("Products watch unavailable: %s", e)
+            _watch = False
+
+
+def stop_watch() -> None:
+    global _watch
+    with _watch_lock:
+        watch, _watch = _watch, None
+    if watch:
+        watch.unsubscribe()
+
+
+def get_product_names(product_ids: list[str]) -> dict[str, str]:
+    """Map each existing product in ``product_ids`` to its display name.
+
+    Cached names are served without a read; the rest are fetched with one
+    ``get_all``. Products that do not exist are left out.
+    """
+    names = {}
+    missing = []
+    for product_id in dict.fromkeys(product_ids):
+        name = _names.get(product_id)
+        if name is None:
+            missing.append(product_id)
+        else:
+            names[product_id] = name
+
+    if missing:
+        collection = get_db().collection(PRODUCTS_COLLECTION)
+        _start_watch(collection)
+        refs = [collection.document(product_id) for product_id in missing]
+        for snap in get_db().get_all(refs):
+            if snap.exists:
+                name = _display_name(snap)
+                _names.set(snap.id, name)
+                names[snap.id] = name
+    return names
+
+
+def cache_stats() -> dict:
+    return _names.stats()
+
+
+def clear_cache() -> None:
+    _names.clear()
+
+
+atexit.register(stop_watch)
@@ -20,3 +20,32 @@ PROJECT_ID = env("GCP_PROJECT_ID", "shopping-inventory-service")
 
 ORDERS_COLLECTION = env("ORDERS_COLLECTION", "Orders")
 PRODUCTS_COLLECTION = env("PRODUCTS_COLLECTION", "Products")
+
+# Number of Firestore clients (one gRPC channel each) kept per instance
+FIRESTORE_CHANNEL_POOL_SIZE = max(int(env("FIRESTORE_CHANNEL_POOL_SIZE", "1")), 1)
+
+# "google" talks to Firestore (or its emulator); "memory" keeps documents in
+# this process, for local runs and benchmarks
+FIRESTORE_ENGINE = env("FIRESTORE_ENGINE", "google")
+
+# SMTP connection pool kept across warm invocations
+SMTP_POOL_SIZE = int(env("SMTP_POOL_SIZE", "2"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(env("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+SMTP_NOOP_AFTER_SECONDS = float(env("SMTP_NOOP_AFTER_SECONDS", "5"))
+
+# Product-name cache kept across warm invocations; entries are evicted by a
+# Products snapshot listener when PRODUCT_CACHE_WATCH is on, the TTL bounds
+# staleness otherwise. The listener's first snapshot reads every product, on
+# each cold instance, so it is off by default. A size of 0 disables the cache.
+PRODUCT_CACHE_SIZE = int(env("PRODUCT_CACHE_SIZE", "1000"))
+PRODUCT_CACHE_TTL_SECONDS = float(env("PRODUCT_CACHE_TTL_SECONDS", "300"))
+PRODUCT_CACHE_WATCH = env("PRODUCT_CACHE_WATCH", "false").lower() == "true"
+
+# OTLP/HTTP collector for traces (unset disables export)
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+OTEL_SERVICE_NAME = env("OTEL_SERVICE_NAME", "orders-listener")
+
+# Logging: JSON lines written by a background thread; see the API's config
+LOG_LEVEL = env("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(env("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
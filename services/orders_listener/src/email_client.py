@@ -1,4 +1,7 @@
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
 from email.message import EmailMessage
 
 from .config import (
@@ -8,21 +11,183 @@ from .config import (
     SMTP_PASSWORD,
     SMTP_FROM,
     SMTP_USE_TLS,
+    SMTP_POOL_SIZE,
+    SMTP_MAX_MESSAGES_PER_CONNECTION,
+    SMTP_NOOP_AFTER_SECONDS,
 )
+from .telemetry import SMTP_SEND_SECONDS, timed
 
 
-def send_email(to_email: str, subject: str, body: str) -> None:
+class _Connection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """Keeps authenticated SMTP sessions open between sends.
+
+    At most ``size`` connections exist at once. An idle connection is checked
+    with NOOP before reuse once it has been idle for ``noop_after`` seconds,
+    and is retired after ``max_messages`` messages.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        use_tls: bool = True,
+        user: str = "",
+        password: str = "",
+        size: int = 2,
+        max_messages: int = 100,
+        noop_after: float = 5.0,
+    ):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.user = user
+        self.password = password
+        self.max_messages = max_messages
+        self.noop_after = noop_after
+        self._idle: list[_Connection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> _Connection:
+        server = smtplib.SMTP(self.host, self.port, timeout=20)
+        server.ehlo()
+        if self.use_tls:
+            server.starttls()
+            server.ehlo()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        return _Connection(server)
+
+    def _is_alive(self, conn: _Connection) -> bool:
+        if time.monotonic() - conn.last_used < self.noop_after:
+            return True
+        try:
+            return conn.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _close(self, conn: _Connection) -> None:
+        try:
+            conn.server.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.server.close()
+
+    def _checkout(self) -> _Connection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if self._is_alive(conn):
+                return conn
+            self._close(conn)
+
+    def _checkin(self, conn: _Connection) -> None:
+        conn.last_used = time.monotonic()
+        if conn.sent >= self.max_messages:
+            self._close(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow one session, e.g. to send several messages back to back."""
+        with self._slots:
+            conn = self._checkout()
+            reusable = False
+            try:
+                yield conn
+                reusable = True
+            except smtplib.SMTPServerDisconnected:
+                raise
+            except smtplib.SMTPException:
+                # The server refused a message; the session itself is fine
+                reusable = True
+                raise
+            finally:
+                if reusable:
+                    self._checkin(conn)
+                else:
+                    self._close(conn)
+
+    def send(self, conn: _Connection, msg: EmailMessage) -> None:
+        with timed(SMTP_SEND_SECONDS, "smtp.send"):
+            conn.server.send_message(msg)
+        conn.sent += 1
+
+    def send_message(self, msg: EmailMessage) -> None:
+        try:
+            with self.connection() as conn:
+                self.send(conn, msg)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped a pooled session (e.g. idle timeout shorter
+            # than noop_after): retry once on a fresh connection.
+            with self.connection() as conn:
+                self.send(conn, msg)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+
+_pool = SMTPPool(
+    SMTP_HOST,
+    SMTP_PORT,
+    use_tls=SMTP_USE_TLS,
+    user=SMTP_USER,
+    password=SMTP_PASSWORD,
+    size=SMTP_POOL_SIZE,
+    max_messages=SMTP_MAX_MESSAGES_PER_CONNECTION,
+    noop_after=SMTP_NOOP_AFTER_SECONDS,
+)
+
+
+def build_message(to_email: str, subject: str, body: str) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = SMTP_FROM
     msg["To"] = to_email
     msg["Subject"] = subject
     msg.set_content(body)
+    return msg
 
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=20) as server:
-        server.ehlo()
-        if SMTP_USE_TLS:
-            server.starttls()
-            server.ehlo()
-        if SMTP_USER and SMTP_PASSWORD:
-            server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(msg)
+
+def send_email(to_email: str, subject: str, body: str) -> None:
+    _pool.send_message(build_message(to_email, subject, body))
+
+
+def send_emails(messages: list[tuple[str, str, str]]) -> list[Exception | None]:
+    """Send ``(to_email, subject, body)`` messages over one pooled session.
+
+    Returns one entry per message: None if it was accepted, else the error.
+    A dropped session is replaced once and the remaining messages resent.
+    """
+    results: list[Exception | None] = [None] * len(messages)
+    pending = list(range(len(messages)))
+    for attempt in range(2):
+        try:
+            with _pool.connection() as conn:
+                while pending:
+                    index = pending[0]
+                    try:
+                        _pool.send(conn, build_message(*messages[index]))
+                    except smtplib.SMTPServerDisconnected:
+                        raise
+                    except smtplib.SMTPException as e:
+                        results[index] = e
+                    pending.pop(0)
+            break
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            if attempt:
+                for index in pending:
+                    results[index] = e
+    return results
@@ -1,6 +1,58 @@
+import atexit
+import itertools
+import threading
+
 from google.cloud import firestore
-from .config import PROJECT_ID
+
+from .config import FIRESTORE_CHANNEL_POOL_SIZE, FIRESTORE_ENGINE, PROJECT_ID
+
+_lock = threading.Lock()
+_local = threading.local()
+_next_client = itertools.count()
+_pool: list = []
+
+
+def _engine():
+    if FIRESTORE_ENGINE == "memory":
+        from . import memory_firestore
+
+        return memory_firestore
+    if FIRESTORE_ENGINE == "google":
+        return firestore
+    raise RuntimeError(f"Unknown FIRESTORE_ENGINE: {FIRESTORE_ENGINE}")
 
 
 def get_db() -> firestore.Client:
-    return firestore.Client(project=PROJECT_ID)
+    """Process-wide Firestore client, reused across warm invocations.
+
+    The pool holds FIRESTORE_CHANNEL_POOL_SIZE clients, each with its own
+    gRPC channel; every worker thread sticks to one of them.
+    """
+    global _pool
+    pool = _pool
+    if getattr(_local, "pool", None) is not pool or not pool:
+        with _lock:
+            if not _pool:
+                _pool = [
+                    _engine().Client(project=PROJECT_ID)
+                    for _ in range(FIRESTORE_CHANNEL_POOL_SIZE)
+                ]
+            pool = _pool
+        _local.pool = pool
+        _local.db = pool[next(_next_client) % len(pool)]
+    return _local.db
+
+
+def close_db() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, []
+    for client in pool:
+        # firestore.Client has no close(); the gRPC channel lives on the
+        # lazily built GAPIC client, which only exists after the first call.
+        api = getattr(client, "_firestore_api_internal", None)
+        if api is not None:
+            api.transport.close()
+
+
+atexit.register(close_db)
@@ -1,52 +1,161 @@
-import logging
+from .catalog import cache_stats, get_product_names
+from .email_client import send_email, send_emails
+from .log import current_route, get_logger, setup_logging
+from .telemetry import (
+    ORDER_EVENTS,
+    PRODUCT_CACHE_HIT_RATIO,
+    render_metrics,
+    setup_tracing,
+)
 
-from .firestore_client import get_db
-from .email_client import send_email
-from .config import PRODUCTS_COLLECTION
+setup_logging()
+setup_tracing()
+PRODUCT_CACHE_HIT_RATIO.set_function(lambda: cache_stats()["hit_ratio"])
+
+logger = get_logger(__name__)
 
 
 def orders_listener(event, context):
-    logging.info(f"Event received: {event}")
+    logger.info("Event received: %s", event)
 
-    value = event.get("value") if event else {}
-    fields = value.get("fields") if value else {}
-
-    buyer_email = _get_string(fields, "buyer_email")
-    product_id = _get_string(fields, "product_id")
+    buyer_email, product_ids = _parse_order(event)
 
     if not buyer_email:
-        logging.info("Error: Missing buyer_email in event fields")
+        logger.info("Error: Missing buyer_email in event fields")
+        ORDER_EVENTS.labels(status="skipped").inc()
         return
 
-    if not product_id:
-        logging.info("Error: Missing product_id in event fields")
+    if not product_ids:
+        logger.info("Error: Missing product_id in event fields")
+        ORDER_EVENTS.labels(status="skipped").inc()
         return
 
-    db = get_db()
     try:
-        product_doc = db.collection(PRODUCTS_COLLECTION).document(product_id).get()
-        if not product_doc.exists:
-            logging.info(f"LookupError: Product not found: {product_id}")
-            return
-
-        product = product_doc.to_dict() or {}
-        product_name = product.get("product_name", product_id)
+        known = get_product_names(product_ids)
+        for product_id in product_ids:
+            if product_id not in known:
+                logger.info("LookupError: Product not found: %s", product_id)
+                ORDER_EVENTS.labels(status="skipped").inc()
+                return
 
-        subject = f"New order for product {product_name}"
-        body = f"Your order was confirmed for product: {product_name}"
+        label, names = _describe([known[product_id] for product_id in product_ids])
+        subject = f"New order for {label} {names}"
+        body = f"Your order was confirmed for {label}: {names}"
 
         send_email(buyer_email, subject, body)
-        logging.info(f"Email sent successfully to {buyer_email}")
+        logger.info("Email sent successfully to %s", buyer_email)
+        ORDER_EVENTS.labels(status="sent").inc()
 
     except Exception as e:
-        logging.info(f"Internal Error: {e}")
+        logger.info("Internal Error: %s", e)
+        ORDER_EVENTS.labels(status="failed").inc()
         raise e
 
 
+def orders_listener_batch(events: list[dict]) -> list[dict]:
+    """Handle many order events with at most one product read and one SMTP
+    session.
+
+    Orders for the same buyer are confirmed in a single email. Returns one
+    ``{"status": "sent" | "skipped" | "failed", ...}`` result per event.
+    """
+    logger.info("Batch received: %d events", len(events))
+
+    results: list[dict | None] = [None] * len(events)
+    orders = {}
+    for index, event in enumerate(events):
+        buyer_email, product_ids = _parse_order(event)
+        if not buyer_email:
+            results[index] = {"status": "skipped", "reason": "missing_buyer_email"}
+        elif not product_ids:
+            results[index] = {"status": "skipped", "reason": "missing_product_id"}
+        else:
+            orders[index] = (buyer_email, product_ids)
+
+    product_names = get_product_names(
+        [pid for _, pids in orders.values() for pid in pids]
+    )
+
+    by_recipient: dict[str, list[int]] = {}
+    for index, (buyer_email, product_ids) in orders.items():
+        missing = [pid for pid in product_ids if pid not in product_names]
+        if missing:
+            logger.info("LookupError: Product not found: %s", ", ".join(missing))
+            results[index] = {"status": "skipped", "reason": "product_not_found"}
+        else:
+            by_recipient.setdefault(buyer_email, []).append(index)
+
+    messages = []
+    for buyer_email, indexes in by_recipient.items():
+        lines = []
+        for index in indexes:
+            lines.append(_describe([product_names[pid] for pid in orders[index][1]]))
+        if len(lines) == 1:
+            label, names = lines[0]
+            subject = f"New order for {label} {names}"
+        else:
+            subject = f"{len(lines)} new orders"
+        body = "\n".join(
+            f"Your order was confirmed for {label}: {names}" for label, names in lines
+        )
+        messages.append((buyer_email, subject, body))
+
+    for (buyer_email, indexes), error in zip(
+        by_recipient.items(), send_emails(messages)
+    ):
+        if error is None:
+            logger.info("Email sent successfully to %s", buyer_email)
+            result = {"status": "sent"}
+        else:
+            logger.info("Internal Error: %s", error)
+            result = {"status": "failed", "reason": str(error)}
+        for index in indexes:
+            results[index] = result
+
+    for result in results:
+        ORDER_EVENTS.labels(status=result["status"]).inc()
+    logger.info("Product cache: %s", cache_stats())
+    return results
+
+
 def orders_listener_http(request):
+    if request.method == "GET" and request.path.rstrip("/").endswith("/metrics"):
+        body, content_type = render_metrics()
+        return (body, 200, {"Content-Type": content_type})
+
+    token = current_route.set(request.path)
+    try:
+        return _handle_http(request)
+    finally:
+        current_route.reset(token)
+
+
+def _handle_http(request):
     event = request.get_json(silent=True) or {}
-    orders_listener(event, None)
-    return ("", 204)
+    # The bridge may coalesce several order events into one request
+    if "events" not in event:
+        orders_listener(event, None)
+        return ("", 204)
+
+    # Always 200: a 5xx would make the bridge resend the whole batch, emailing
+    # the recipients that did get theirs again. It resends the failed events.
+    return ({"results": orders_listener_batch(event["events"] or [])}, 200)
+
+
+def _parse_order(event) -> tuple[str | None, list[str]]:
+    value = event.get("value") if event else {}
+    fields = value.get("fields") if value else {}
+
+    buyer_email = _get_string(fields, "buyer_email")
+    product_id = _get_string(fields, "product_id")
+    # Cart orders carry line items instead of a single product_id
+    product_ids = [product_id] if product_id else _get_item_product_ids(fields)
+    return buyer_email, product_ids
+
+
+def _describe(product_names: list[str]) -> tuple[str, str]:
+    label = "product" if len(product_names) == 1 else "products"
+    return label, ", ".join(product_names)
 
 
 def _get_string(fields: dict, name: str) -> str | None:
@@ -54,3 +163,16 @@ def _get_string(fields: dict, name: str) -> str | None:
     if isinstance(field_data, dict) and "stringValue" in field_data:
         return field_data.get("stringValue")
     return None
+
+
+def _get_item_product_ids(fields: dict) -> list[str]:
+    items = fields.get("items")
+    if not isinstance(items, dict):
+        return []
+    product_ids = []
+    for item in items.get("arrayValue", {}).get("values", []):
+        item_fields = item.get("mapValue", {}).get("fields", {})
+        product_id = _get_string(item_fields, "product_id")
+        if product_id:
+            product_ids.append(product_id)
+    return product_ids
@@ -0,0 +1,837 @@
+"""In-memory stand-in for the parts of ``google.cloud.firestore`` this
+service uses, selected with ``FIRESTORE_ENGINE=memory``.
+
+Documents live in one process-wide store. Transactions are optimistic: reads
+record each document's version and the commit aborts with ``Aborted`` if any
+of them changed, which ``firestore.transactional`` retries like a real
+contention abort. Transactions implement the private hooks that decorator
+drives (``_begin``, ``_commit``, ``_rollback``, ``_clean_up``), so service
+code keeps using ``google.cloud.firestore`` for decorators, sentinels and
+filters. Snapshot listeners are called synchronously after each commit.
+"""
+
+import copy
+import itertools
+import threading
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+from google.api_core import exceptions
+from google.cloud.firestore_v1 import transforms
+from google.cloud.firestore_v1.watch import ChangeType, DocumentChange
+
+_MISSING = object()
+
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _split(field_path: str) -> list[str]:
+    return field_path.split(".")
+
+
+def _get_field(data: dict, field_path: str):
+    value: Any = data
+    for part in _split(field_path):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_field(data: dict, field_path: str, value) -> None:
+    *parents, leaf = _split(field_path)
+    for part in parents:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    data[leaf] = value
+
+
+def _delete_field(data: dict, field_path: str) -> None:
+    *parents, leaf = _split(field_path)
+    for part in parents:
+        data = data.get(part)
+        if not isinstance(data, dict):
+            return
+    data.pop(leaf, None)
+
+
+def _leaf_paths(data: dict, prefix: str = ""):
+    """Yield ``(field_path, value)`` for every leaf of a nested dict."""
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            yield from _leaf_paths(value, f"{path}.")
+        else:
+            yield path, value
+
+
+def _transform(current, value, now: datetime):
+    if value is transforms.SERVER_TIMESTAMP:
+        return now
+    if isinstance(value, transforms.Increment):
+        base = current if isinstance(current, (int, float)) else 0
+        return base + value.value
+    if isinstance(value, transforms.Maximum):
+        return (
+            value.value
+            if not isinstance(current, (int, float))
+            else max(current, value.value)
+        )
+    if isinstance(value, transforms.Minimum):
+        return (
+            value.value
+            if not isinstance(current, (int, float))
+            else min(current, value.value)
+        )
+    if isinstance(value, transforms.ArrayUnion):
+        items = list(current) if isinstance(current, list) else []
+        return items + [v for v in value.values if v not in items]
+    if isinstance(value, transforms.ArrayRemove):
+        items = list(current) if isinstance(current, list) else []
+        return [v for v in items if v not in value.values]
+    if isinstance(value, dict):
+        return {
+            k: _transform(_MISSING, v, now)
+            for k, v in value.items()
+            if v is not transforms.DELETE_FIELD
+        }
+    return copy.deepcopy(value)
+
+
+def _apply_fields(data: dict, fields, now: datetime) -> dict:
+    for field_path, value in fields:
+        if value is transforms.DELETE_FIELD:
+            _delete_field(data, field_path)
+        else:
+            current = _get_field(data, field_path)
+            _set_field(data, field_path, _transform(current, value, now))
+    return data
+
+
+# Firestore's cross-type ordering: null < bool < number < timestamp < string
+# < bytes < reference < array < map
+def _type_rank(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, datetime):
+        return 3
+    if isinstance(value, str):
+        return 4
+    if isinstance(value, bytes):
+        return 5
+    if isinstance(value, DocumentReference):
+        return 6
+    if isinstance(value, list):
+        return 8
+    return 9
+
+
+def _sort_key(value):
+    rank = _type_rank(value)
+    if rank == 6:
+        return rank, value.path
+    if rank == 8:
+        return rank, [_sort_key(v) for v in value]
+    if rank == 9:
+        return rank, sorted((k, _sort_key(v)) for k, v in value.items())
+    return rank, value
+
+
+class _Descending:
+    """Inverts the ordering of a sort key."""
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __gt__(self, other):
+        return other.key > self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def _matches(op: str, value, operand) -> bool:
+    if value is _MISSING:
+        return False
+    if op == "==":
+        return value == operand
+    if op == "!=":
+        return value != operand and value is not None
+    if op == "in":
+        return value in operand
+    if op == "not-in":
+        return value not in operand and value is not None
+    if op == "array_contains":
+        return isinstance(value, list) and operand in value
+    if op == "array_contains_any":
+        return isinstance(value, list) and any(v in value for v in operand)
+    # Range filters only match values of the operand's type
+    if _type_rank(value) != _type_rank(operand):
+        return False
+    if op == "<":
+        return _sort_key(value) < _sort_key(operand)
+    if op == "<=":
+        return _sort_key(value) <= _sort_key(operand)
+    if op == ">":
+        return _sort_key(value) > _sort_key(operand)
+    if op == ">=":
+        return _sort_key(value) >= _sort_key(operand)
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class _Document:
+    __slots__ = ("create_time", "data", "update_time", "version")
+
+    def __init__(
+        self, data: dict, version: int, create_time: datetime, update_time: datetime
+    ):
+        self.data = data
+        self.version = version
+        self.create_time = create_time
+        self.update_time = update_time
+
+
+class MemoryStore:
+    """Documents by path, with a version per document for conflict checks."""
+
+    def __init__(self):
+        self.docs: dict[str, _Document] = {}
+        self._versions = itertools.count(1)
+        self._lock = threading.RLock()
+        self._watches: list[Watch] = []
+
+    def version(self, path: str) -> int:
+        doc = self.docs.get(path)
+        return doc.version if doc is not None else 0
+
+    def snapshot(self, ref: "DocumentReference") -> "DocumentSnapshot":
+        with self._lock:
+            return self._snapshot(ref, self.docs.get(ref.path))
+
+    def _snapshot(self, ref, doc: _Document | None) -> "DocumentSnapshot":
+        if doc is None:
+            return DocumentSnapshot(ref, None, None, None, _now())
+        return DocumentSnapshot(
+            ref,
+            copy.deepcopy(doc.data),
+            doc.create_time,
+            doc.update_time,
+            _now(),
+            doc.version,
+        )
+
+    def query(self, query: "Query") -> list["DocumentSnapshot"]:
+        with self._lock:
+            prefix = f"{query._parent.path}/"
+            snaps = []
+            for path, doc in self.docs.items():
+                # Direct children only, not documents of sub-collections
+                if not path.startswith(prefix) or "/" in path[len(prefix) :]:
+                    continue
+                if all(f.matches(path, doc.data) for f in query._filters):
+                    snaps.append(
+                        self._snapshot(query._parent.document(path[len(prefix) :]), doc)
+                    )
+        return query._order_and_slice(snaps)
+
+    def commit(
+        self, writes: list[tuple], read_versions: dict[str, int] | None = None
+    ) -> list:
+        """Apply ``(kind, ref, data, merge)`` writes atomically.
+
+        Raises Aborted if a document read by the transaction has changed.
+        """
+        with self._lock:
+            for path, version in (read_versions or {}).items():
+                if self.version(path) != version:
+                    raise exceptions.Aborted(f"Transaction lost a race on {path}")
+
+            now = _now()
+            version = next(self._versions)
+            changed = {}
+            for kind, ref, data, merge in writes:
+                changed[ref.path] = self._apply(kind, ref, data, merge, now, version)
+            watches = list(self._watches)
+
+        for watch in watches:
+            watch._on_commit(changed)
+        return [WriteResult(now) for _ in writes]
+
+    def _apply(self, kind, ref, data, merge, now, version) -> bool:
+        doc = self.docs.get(ref.path)
+        if kind == "delete":
+            return self.docs.pop(ref.path, None) is not None
+        if kind == "create" and doc is not None:
+            raise exceptions.AlreadyExists(f"Document already exists: {ref.path}")
+        if kind == "update" and doc is None:
+            raise exceptions.NotFound(f"No document to update: {ref.path}")
+
+        if kind == "update":
+            fields = data.items()
+            current = copy.deepcopy(doc.data)
+        elif merge:
+            fields = _leaf_paths(data)
+            current = copy.deepcopy(doc.data) if doc is not None else {}
+        else:
+            fields = data.items()
+            current = {}
+        new_data = _apply_fields(current, fields, now)
+        create_time = doc.create_time if doc is not None else now
+        self.docs[ref.path] = _Document(new_data, version, create_time, now)
+        return True
+
+
+class WriteResult:
+    def __init__(self, update_time: datetime):
+        self.update_time = update_time
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data, create_time, update_time, read_time, version=0):
+        self.reference = reference
+        self._version = version
+        self._data = data
+        self.create_time = create_time
+        self.update_time = update_time
+        self.read_time = read_time
+
+    @property
+    def id(self) -> str:
+        return self.reference.id
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict | None:
+        return copy.deepcopy(self._data)
+
+    def get(self, field_path: str):
+        if self._data is None:
+            return None
+        value = _get_field(self._data, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class _FieldFilter:
+    def __init__(self, field_path: str, op_string: str, value):
+        self.field_path = field_path
+        self.op_string = op_string
+        self.value = value
+
+    def matches(self, path: str, data: dict) -> bool:
+        if self.field_path == "__name__":
+            value = path.rsplit("/", 1)[1]
+            operand = (
+                self.value.id
+                if isinstance(self.value, DocumentReference)
+                else self.value
+            )
+            return _matches(self.op_string, value, operand)
+        return _matches(self.op_string, _get_field(data, self.field_path), self.value)
+
+
+class Query:
+    def __init__(self, parent, filters=(), orders=(), limit=None, start=None):
+        self._parent = parent
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        # (values, inclusive) cursor over the order_by fields
+        self._start = start
+
+    @property
+    def _client(self):
+        return self._parent._client
+
+    def _copy(self, **changes) -> "Query":
+        query = Query.__new__(self._query_type)
+        state = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit": self._limit,
+            "start": self._start,
+            **changes,
+        }
+        Query.__init__(query, self._parent, **state)
+        return query
+
+    def where(
+        self, field_path=None, op_string=None, value=None, *, filter=None
+    ) -> "Query":
+        if filter is None:
+            filter = _FieldFilter(field_path, op_string, value)
+        else:
+            filter = _FieldFilter(filter.field_path, filter.op_string, filter.value)
+        return self._copy(filters=self._filters + (filter,))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> "Query":
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int) -> "Query":
+        return self._copy(limit=count)
+
+    def _cursor(self, values, inclusive: bool) -> "Query":
+        if isinstance(values, DocumentSnapshot):
+            values = {
+                field: values.id if field == "__name__" else values.get(field)
+                for field, _ in self._orders
+            }
+        if isinstance(values, dict):
+            values = [values[field] for field, _ in self._orders]
+        return self._copy(start=(list(values), inclusive))
+
+    def start_after(self, values) -> "Query":
+        return self._cursor(values, inclusive=False)
+
+    def start_at(self, values) -> "Query":
+        return self._cursor(values, inclusive=True)
+
+    def _value(self, snap: DocumentSnapshot, field: str):
+        return snap.id if field == "__name__" else _get_field(snap._data, field)
+
+    def _key(self, values: list) -> list:
+        key = []
+        for (_, direction), value in zip(self._orders, values):
+            part = _sort_key(value)
+            key.append(_Descending(part) if direction == DESCENDING else part)
+        return key
+
+    def _order_and_slice(self, snaps: list[DocumentSnapshot]) -> list[DocumentSnapshot]:
+        orders = list(self._orders)
+        # Documents without an order_by field are left out, like in Firestore
+        snaps = [
+            s
+            for s in snaps
+            if all(self._value(s, f) is not _MISSING for f, _ in orders)
+        ]
+        # Ties are broken by document id, in the last order_by's direction
+        if not any(field == "__name__" for field, _ in orders):
+            orders.append(("__name__", orders[-1][1] if orders else ASCENDING))
+        query = self._copy(orders=tuple(orders))
+        snaps.sort(key=lambda s: query._key([query._value(s, f) for f, _ in orders]))
+
+        if self._start is not None:
+            values, inclusive = self._start
+            bound = query._key(values)
+            n = len(bound)
+
+            def after(snap):
+                key = query._key([query._value(snap, f) for f, _ in orders])[:n]
+                return key > bound or (inclusive and key == bound)
+
+            snaps = [s for s in snaps if after(s)]
+        if self._limit is not None:
+            snaps = snaps[: self._limit]
+        return snaps
+
+    def stream(self, transaction=None):
+        snaps = self._client._store.query(self)
+        if transaction is not None:
+            for snap in snaps:
+                transaction._read(snap.reference.path, snap)
+        yield from snaps
+
+    def get(self, transaction=None) -> list[DocumentSnapshot]:
+        return list(self.stream(transaction=transaction))
+
+    def on_snapshot(self, callback) -> "Watch":
+        return Watch(self._client._store, callback, query=self)
+
+
+Query._query_type = Query
+
+
+class CollectionReference(Query):
+    def __init__(self, client, path: str):
+        self._client_ref = client
+        self.path = path
+        super().__init__(self)
+
+    @property
+    def _client(self):
+        return self._client_ref
+
+    @property
+    def id(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self):
+        if "/" not in self.path:
+            return None
+        return self._client.document(self.path.rsplit("/", 1)[0])
+
+    def document(self, document_id: str | None = None) -> "DocumentReference":
+        return self._client.document(
+            f"{self.path}/{document_id or uuid.uuid4().hex[:20]}"
+        )
+
+    def add(self, data: dict) -> tuple[datetime, "DocumentReference"]:
+        ref = self.document()
+        result = ref.create(data)
+        return result.update_time, ref
+
+    def list_documents(self):
+        return [snap.reference for snap in self.stream()]
+
+
+class DocumentReference:
+    def __init__(self, client, path: str):
+        self._client = client
+        self.path = path
+
+    def __eq__(self, other):
+        return isinstance(other, DocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    @property
+    def id(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> CollectionReference:
+        return self._client.collection(self.path.rsplit("/", 1)[0])
+
+    def collection(self, collection_id: str) -> CollectionReference:
+        return self._client.collection(f"{self.path}/{collection_id}")
+
+    def get(self, field_paths=None, transaction=None) -> DocumentSnapshot:
+        snap = self._client._store.snapshot(self)
+        if transaction is not None:
+            transaction._read(self.path, snap)
+        return snap
+
+    def _write(self, kind: str, data=None, merge=False) -> WriteResult:
+        (result,) = self._client._store.commit([(kind, self, data, merge)])
+        return result
+
+    def create(self, document_data: dict) -> WriteResult:
+        return self._write("create", document_data)
+
+    def set(self, document_data: dict, merge: bool = False) -> WriteResult:
+        return self._write("set", document_data, merge)
+
+    def update(self, field_updates: dict) -> WriteResult:
+        return self._write("update", field_updates)
+
+    def delete(self) -> WriteResult:
+        return self._write("delete")
+
+    def on_snapshot(self, callback) -> "Watch":
+        return Watch(self._client._store, callback, document=self)
+
+
+class WriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes: list[tuple] = []
+
+    def __len__(self):
+        return len(self._writes)
+
+    def create(self, reference, document_data: dict) -> None:
+        self._writes.append(("create", reference, document_data, False))
+
+    def set(self, reference, document_data: dict, merge: bool = False) -> None:
+        self._writes.append(("set", reference, document_data, merge))
+
+    def update(self, reference, field_updates: dict) -> None:
+        self._writes.append(("update", reference, field_updates, False))
+
+    def delete(self, reference) -> None:
+        self._writes.append(("delete", reference, None, False))
+
+    def commit(self) -> list[WriteResult]:
+        writes, self._writes = self._writes, []
+        return self._client._store.commit(writes)
+
+
+class Transaction(WriteBatch):
+    """Optimistic transaction: buffered writes plus the versions read."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, client, max_attempts: int = 5, read_only: bool = False):
+        super().__init__(client)
+        self._max_attempts = max_attempts
+        self._read_only = read_only
+        self._id = None
+        self._read_versions: dict[str, int] = {}
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def in_progress(self) -> bool:
+        return self._id is not None
+
+    def _read(self, path: str, snap: DocumentSnapshot) -> None:
+        # The version first read must still be current at commit
+        self._read_versions.setdefault(path, snap._version)
+
+    def _clean_up(self) -> None:
+        self._writes = []
+        self._read_versions = {}
+        self._id = None
+
+    def _begin(self, retry_id=None) -> None:
+        if self.in_progress:
+            raise ValueError("Transaction already in progress")
+        self._id = next(self._ids).to_bytes(8, "big")
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+    def _commit(self) -> list[WriteResult]:
+        if not self.in_progress:
+            raise ValueError("Transaction not in progress")
+        try:
+            return self._client._store.commit(self._writes, self._read_versions)
+        finally:
+            self._clean_up()
+
+    def get_all(self, references, field_paths=None):
+        return self._client.get_all(references, transaction=self)
+
+    def get(self, ref_or_query):
+        if isinstance(ref_or_query, DocumentReference):
+            return iter([ref_or_query.get(transaction=self)])
+        return ref_or_query.stream(transaction=self)
+
+
+class Watch:
+    """Snapshot listener on one document or a query.
+
+    The callback gets ``(docs, changes, read_time)`` once on subscribe and
+    then after every commit that changes the result.
+    """
+
+    def __init__(self, store: MemoryStore, callback, document=None, query=None):
+        self._store = store
+        self._callback = callback
+        self._document = document
+        self._query = query
+        self._current: dict[str, DocumentSnapshot] = {}
+        self._subscribed = False
+        self._lock = threading.Lock()
+        with store._lock:
+            store._watches.append(self)
+        self._refresh()
+
+    def _results(self) -> list[DocumentSnapshot]:
+        if self._document is not None:
+            snap = self._store.snapshot(self._document)
+            return [snap] if snap.exists else []
+        return self._store.query(self._query)
+
+    def _on_commit(self, changed: dict[str, bool]) -> None:
+        if self._document is not None:
+            relevant = self._document.path in changed
+        else:
+            prefix = f"{self._query._parent.path}/"
+            relevant = any(path.startswith(prefix) for path in changed)
+        if relevant:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        with self._lock:
+            docs = self._results()
+            new = {snap.reference.path: snap for snap in docs}
+            old_order = list(self._current)
+            changes = []
+            for index, path in enumerate(old_order):
+                if path not in new:
+                    changes.append(
+                        DocumentChange(
+                            ChangeType.REMOVED, self._current[path], index, -1
+                        )
+                    )
+            for index, snap in enumerate(docs):
+                path = snap.reference.path
+                if path not in self._current:
+                    changes.append(DocumentChange(ChangeType.ADDED, snap, -1, index))
+                elif snap.update_time != self._current[path].update_time:
+                    changes.append(
+                        DocumentChange(
+                            ChangeType.MODIFIED, snap, old_order.index(path), index
+                        )
+                    )
+            first, self._subscribed = not self._subscribed, True
+            self._current = new
+        if changes or first:
+            self._callback(docs, changes, _now())
+
+    def unsubscribe(self) -> None:
+        with self._store._lock:
+            if self in self._store._watches:
+                self._store._watches.remove(self)
+
+    def close(self) -> None:
+        self.unsubscribe()
+
+
+# One store per process, shared by every client like one Firestore database
+_default_store = MemoryStore()
+
+
+class Client:
+    def __init__(
+        self, project: str | None = None, store: MemoryStore | None = None, **kwargs
+    ):
+        self.project = project
+        self._store = store if store is not None else _default_store
+
+    def collection(self, *path: str) -> CollectionReference:
+        return CollectionReference(self, "/".join(path))
+
+    def document(self, *path: str) -> DocumentReference:
+        return DocumentReference(self, "/".join(path))
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        for ref in references:
+            yield ref.get(transaction=transaction)
+
+    def batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    def transaction(
+        self, max_attempts: int = 5, read_only: bool = False
+    ) -> Transaction:
+        return Transaction(self, max_attempts=max_attempts, read_only=read_only)
+
+    def collections(self) -> list[CollectionReference]:
+        with self._store._lock:
+            names = {path.split("/", 1)[0] for path in self._store.docs}
+        return [self.collection(name) for name in sorted(names)]
+
+    def close(self) -> None:
+        pass
+
+
+# Async API: the same store behind awaitable methods. Every operation is a
+# dict lookup under a lock, so nothing is offloaded to threads.
+
+
+class AsyncQuery(Query):
+    _query_type: type
+
+    async def stream(self, transaction=None):
+        for snap in Query.stream(self, transaction=transaction):
+            yield snap
+
+    async def get(self, transaction=None) -> list[DocumentSnapshot]:
+        return [snap async for snap in self.stream(transaction=transaction)]
+
+
+class AsyncCollectionReference(CollectionReference, AsyncQuery):
+    def document(self, document_id: str | None = None) -> "AsyncDocumentReference":
+        return self._client.document(
+            f"{self.path}/{document_id or uuid.uuid4().hex[:20]}"
+        )
+
+    async def add(self, data: dict):
+        ref = self.document()
+        result = await ref.create(data)
+        return result.update_time, ref
+
+    async def list_documents(self):
+        return [snap.reference async for snap in self.stream()]
+
+
+class AsyncDocumentReference(DocumentReference):
+    async def get(self, field_paths=None, transaction=None) -> DocumentSnapshot:
+        return DocumentReference.get(self, field_paths, transaction)
+
+    async def create(self, document_data: dict) -> WriteResult:
+        return self._write("create", document_data)
+
+    async def set(self, document_data: dict, merge: bool = False) -> WriteResult:
+        return self._write("set", document_data, merge)
+
+    async def update(self, field_updates: dict) -> WriteResult:
+        return self._write("update", field_updates)
+
+    async def delete(self) -> WriteResult:
+        return self._write("delete")
+
+
+class AsyncWriteBatch(WriteBatch):
+    async def commit(self) -> list[WriteResult]:
+        return WriteBatch.commit(self)
+
+
+class AsyncTransaction(Transaction):
+    async def _begin(self, retry_id=None) -> None:
+        Transaction._begin(self, retry_id)
+
+    async def _rollback(self) -> None:
+        Transaction._rollback(self)
+
+    async def _commit(self) -> list[WriteResult]:
+        return Transaction._commit(self)
+
+    async def get_all(self, references, field_paths=None):
+        return self._client.get_all(references, transaction=self)
+
+    async def get(self, ref_or_query):
+        if isinstance(ref_or_query, DocumentReference):
+            return _aiter([await ref_or_query.get(transaction=self)])
+        return ref_or_query.stream(transaction=self)
+
+
+AsyncQuery._query_type = AsyncQuery
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class AsyncClient(Client):
+    def collection(self, *path: str) -> AsyncCollectionReference:
+        return AsyncCollectionReference(self, "/".join(path))
+
+    def document(self, *path: str) -> AsyncDocumentReference:
+        return AsyncDocumentReference(self, "/".join(path))
+
+    async def get_all(self, references, field_paths=None, transaction=None):
+        for ref in references:
+            yield await ref.get(transaction=transaction)
+
+    def batch(self) -> AsyncWriteBatch:
+        return AsyncWriteBatch(self)
+
+    def transaction(
+        self, max_attempts: int = 5, read_only: bool = False
+    ) -> AsyncTransaction:
+        return AsyncTransaction(self, max_attempts=max_attempts, read_only=read_only)
+
+    async def close(self) -> None:
+        pass
+
+
+def reset() -> None:
+    """Drop every document of the process-wide store, e.g. between tests."""
+    with _default_store._lock:
+        _default_store.docs.clear()
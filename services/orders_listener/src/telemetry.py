@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager
+
+from opentelemetry import trace
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from .config import OTEL_EXPORTER_OTLP_ENDPOINT, OTEL_SERVICE_NAME
+
+tracer = trace.get_tracer("orders-listener")
+
+SMTP_SEND_SECONDS = Histogram(
+    "smtp_send_duration_seconds",
+    "Time to hand one message to the SMTP server",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ORDER_EVENTS = Counter(
+    "order_events_total",
+    "Order events handled, by outcome",
+    ["status"],
+)
+PRODUCT_CACHE_HIT_RATIO = Gauge(
+    "product_cache_hit_ratio",
+    "Hit ratio of the product-name cache since the instance started",
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, span_name: str, **attributes):
+    """Observe the block's duration in ``histogram`` and trace it as a span."""
+    started = time.perf_counter()
+    with tracer.start_as_current_span(span_name, attributes=attributes):
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+
+def setup_tracing() -> None:
+    """Batch-export spans over OTLP/HTTP if a collector endpoint is set."""
+    if not OTEL_EXPORTER_OTLP_ENDPOINT:
+        return
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": OTEL_SERVICE_NAME})
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
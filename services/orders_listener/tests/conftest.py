@@ -1,8 +1,13 @@
 import os
+import socket
+import socketserver
 import sys
+import threading
+
 import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "bridge")))
 
 os.environ.setdefault("GCP_PROJECT_ID", "test-project")
 os.environ.setdefault("SMTP_HOST", "smtp.gmail.com")
@@ -17,20 +22,22 @@ os.environ.setdefault("PRODUCTS_COLLECTION", "Products")
 
 def pytest_configure(config):
     class MockDocSnapshot:
-        def __init__(self, data=None, exists=True):
+        def __init__(self, data=None, exists=True, doc_id=None):
             self._data = data or {}
             self.exists = exists
+            self.id = doc_id
         
         def to_dict(self):
             return self._data
     
     class MockDocRef:
-        def __init__(self):
+        def __init__(self, doc_id=None):
+            self.id = doc_id
             self._data = None
 
         def get(self, transaction=None):
             exists = bool(self._data)
-            return MockDocSnapshot(self._data or {}, exists=exists)
+            return MockDocSnapshot(self._data or {}, exists=exists, doc_id=self.id)
 
         def set(self, data, **kwargs):
             self._data = data
@@ -41,7 +48,7 @@ def pytest_configure(config):
         
         def document(self, doc_id=None):
             if doc_id not in self._docs:
-                self._docs[doc_id] = MockDocRef()
+                self._docs[doc_id] = MockDocRef(doc_id)
             return self._docs[doc_id]
     
     class MockClient:
@@ -52,6 +59,9 @@ def pytest_configure(config):
             if name not in self._collections:
                 self._collections[name] = MockCollRef()
             return self._collections[name]
+
+        def get_all(self, refs):
+            return (ref.get() for ref in refs)
     
     # Create a single MockClient instance so repeated get_db() calls share state
     _singleton_mock_client = MockClient()
@@ -74,3 +84,89 @@ def _test_env(monkeypatch):
     monkeypatch.setenv("SMTP_USE_TLS", "true")
     monkeypatch.setenv("ORDERS_COLLECTION", "Orders")
     monkeypatch.setenv("PRODUCTS_COLLECTION", "Products")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_smtp_pool(monkeypatch):
+    # The module-level pool outlives a test; give each test an empty one so
+    # connections opened against one test's SMTP mock are never reused.
+    from src import email_client
+
+    pool = email_client._pool
+    monkeypatch.setattr(
+        email_client,
+        "_pool",
+        email_client.SMTPPool(
+            pool.host,
+            pool.port,
+            use_tls=pool.use_tls,
+            user=pool.user,
+            password=pool.password,
+            max_messages=pool.max_messages,
+            noop_after=pool.noop_after,
+        ),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _empty_product_cache():
+    from src import catalog
+
+    catalog.clear_cache()
+    yield
+    catalog.stop_watch()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.sessions.append(self.request)
+        self._reply("220 localhost ESMTP stub")
+        while line := self.rfile.readline():
+            verb = line.decode().strip().split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 localhost")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.server.commands.append(verb)
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(chunk)
+                self.server.messages.append(b"".join(data).decode())
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Plain-text SMTP server on localhost recording sessions and messages."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.sessions = []
+        self.commands = []
+        self.messages = []
+
+    def drop_sessions(self):
+        for sock in self.sessions:
+            sock.shutdown(socket.SHUT_RDWR)
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,105 @@
+from datetime import UTC, datetime
+
+import pytest
+import requests
+
+
+class _Response:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body
+        self.text = "" if body is None else str(body)
+
+    def json(self):
+        return self._body
+
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return self._data
+
+
+class _Collection:
+    """Orders query that returns ``orders`` whatever the filters."""
+
+    def __init__(self, orders):
+        self.orders = orders
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def limit(self, _):
+        return self
+
+    def stream(self):
+        return [_Snapshot(doc_id, data) for doc_id, data in self.orders]
+
+
+@pytest.fixture
+def bridge(monkeypatch, tmp_path):
+    import bridge
+
+    monkeypatch.setattr(bridge, "CHECKPOINT_PATH", tmp_path / "checkpoint.json")
+    monkeypatch.setattr(bridge, "MAX_RETRIES", 2)
+    monkeypatch.setattr(bridge.time, "sleep", lambda _: None)
+    return bridge
+
+
+def _orders(count):
+    created_at = datetime(2025, 1, 1, tzinfo=UTC)
+    return [
+        (f"order-{n}", {"buyer_email": "buyer@example.com", "created_at": created_at})
+        for n in range(count)
+    ]
+
+
+def test_deliver_raises_once_retries_run_out(bridge, monkeypatch):
+    posts = []
+
+    def fake_post(url, json, timeout):
+        posts.append(json)
+        if json["value"]["name"].endswith("order-1"):
+            raise requests.ConnectionError("refused")
+        return _Response(204)
+
+    monkeypatch.setattr(bridge._session, "post", fake_post)
+
+    with pytest.raises(bridge.DeliveryError):
+        bridge._deliver(_orders(2))
+
+    assert len(posts) == 1 + 3  # order-0 once, order-1 with two retries
+
+
+def test_batch_retry_resends_only_failed_events(bridge, monkeypatch):
+    monkeypatch.setattr(bridge, "BATCH_SIZE", 3)
+    posts = []
+
+    def fake_post(url, json, timeout):
+        names = [event["value"]["name"].rsplit("/", 1)[1] for event in json["events"]]
+        posts.append(names)
+        # order-1's email fails on the first attempt only
+        results = [
+            {"status": "failed" if name == "order-1" and len(posts) == 1 else "sent"}
+            for name in names
+        ]
+        return _Response(200, {"results": results})
+
+    monkeypatch.setattr(bridge._session, "post", fake_post)
+
+    bridge._deliver(_orders(3))
+
+    assert posts == [["order-0", "order-1", "order-2"], ["order-1"]]
+
+
+def test_drain_keeps_checkpoint_on_failed_delivery(bridge, monkeypatch):
+    monkeypatch.setattr(bridge._session, "post", lambda *a, **kw: _Response(503))
+    bridge._save_checkpoint(None, set())
+
+    with pytest.raises(bridge.DeliveryError):
+        bridge._drain(_Collection(_orders(2)), None, set())
+
+    assert bridge._load_checkpoint() == (None, set())
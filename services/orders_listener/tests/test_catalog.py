@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+
+def _spy_get_all(monkeypatch, db):
+    calls = []
+    get_all = db.get_all
+    monkeypatch.setattr(
+        db, "get_all", lambda refs: calls.append(len(refs)) or get_all(refs)
+    )
+    return calls
+
+
+def _change(kind, doc_id, data):
+    snap = SimpleNamespace(id=doc_id, to_dict=lambda: data)
+    return SimpleNamespace(type=SimpleNamespace(name=kind), document=snap)
+
+
+def test_get_product_names_caches_lookups(monkeypatch):
+    from src import catalog
+    from src.firestore_client import get_db
+
+    db = get_db()
+    db.collection("Products").document("cat-a").set({"product_name": "Widget A"})
+    db.collection("Products").document("cat-b").set({"name": "No display name"})
+    calls = _spy_get_all(monkeypatch, db)
+
+    assert catalog.get_product_names(["cat-a", "cat-b", "cat-missing"]) == {
+        "cat-a": "Widget A",
+        "cat-b": "cat-b",
+    }
+    assert catalog.get_product_names(["cat-a", "cat-b"]) == {
+        "cat-a": "Widget A",
+        "cat-b": "cat-b",
+    }
+
+    assert calls == [3]
+    stats = catalog.cache_stats()
+    assert stats["size"] == 2
+    assert stats["hit_ratio"] > 0
+
+
+def test_products_watch_invalidates_changed_names(monkeypatch):
+    from src import catalog
+    from src.firestore_client import get_db
+
+    products = get_db().collection("Products")
+    products.document("cat-c").set({"product_name": "Old name"})
+    callbacks = []
+
+    def on_snapshot(callback):
+        callbacks.append(callback)
+        return SimpleNamespace(unsubscribe=lambda: None)
+
+    monkeypatch.setattr(products, "on_snapshot", on_snapshot, raising=False)
+    monkeypatch.setattr(catalog, "PRODUCT_CACHE_WATCH", True)
+
+    assert catalog.get_product_names(["cat-c"]) == {"cat-c": "Old name"}
+    assert len(callbacks) == 1
+
+    products.document("cat-c").set({"product_name": "New name"})
+    assert catalog.get_product_names(["cat-c"]) == {"cat-c": "Old name"}
+
+    callbacks[0]([], [_change("MODIFIED", "cat-c", {"product_name": "New name"})], None)
+
+    assert catalog.get_product_names(["cat-c"]) == {"cat-c": "New name"}
+    assert len(callbacks) == 1
+
+
+def test_memory_engine_watch_invalidates_names(monkeypatch):
+    from src import catalog, firestore_client
+    from src.memory_firestore import Client, MemoryStore
+
+    db = Client(store=MemoryStore())
+    monkeypatch.setattr(firestore_client, "_pool", [db])
+    monkeypatch.setattr(catalog, "PRODUCT_CACHE_WATCH", True)
+    monkeypatch.setattr(catalog, "_watch", None)
+    catalog.clear_cache()
+    products = db.collection("Products")
+    products.document("mem-a").set({"product_name": "Old name"})
+
+    assert catalog.get_product_names(["mem-a"]) == {"mem-a": "Old name"}
+
+    products.document("mem-a").update({"product_name": "New name"})
+
+    assert catalog.get_product_names(["mem-a"]) == {"mem-a": "New name"}
+    catalog.stop_watch()
+
+
+def test_memory_engine_watch_keeps_names_on_stock_updates(monkeypatch):
+    from src import catalog, firestore_client
+    from src.memory_firestore import Client, MemoryStore
+
+    db = Client(store=MemoryStore())
+    monkeypatch.setattr(firestore_client, "_pool", [db])
+    monkeypatch.setattr(catalog, "PRODUCT_CACHE_WATCH", True)
+    monkeypatch.setattr(catalog, "_watch", None)
+    catalog.clear_cache()
+    products = db.collection("Products")
+    products.document("mem-a").set({"product_name": "Widget", "quantity": 5})
+    catalog.get_product_names(["mem-a"])
+    calls = _spy_get_all(monkeypatch, db)
+
+    products.document("mem-a").update({"quantity": 4, "status": "in_stock"})
+    assert catalog.get_product_names(["mem-a"]) == {"mem-a": "Widget"}
+    products.document("mem-a").delete()
+    assert catalog.get_product_names(["mem-a"]) == {}
+
+    assert calls == [1]
+    catalog.stop_watch()
@@ -125,3 +125,102 @@ def test_send_email_sets_headers(monkeypatch):
     assert sent_messages[0]["to"] == "recipient@example.com"
     assert sent_messages[0]["subject"] == "Test Subject"
     assert sent_messages[0]["from"] == "test@example.com"
+
+
+def _stub_pool(smtp_server, **kwargs):
+    from src.email_client import SMTPPool
+
+    host, port = smtp_server.server_address
+    return SMTPPool(host, port, use_tls=False, **kwargs)
+
+
+def _message(n):
+    from src.email_client import build_message
+
+    return build_message(f"buyer{n}@example.com", f"Order {n}", "Body")
+
+
+def test_pool_reuses_connection(smtp_server):
+    pool = _stub_pool(smtp_server)
+
+    for n in range(3):
+        pool.send_message(_message(n))
+    pool.close()
+
+    assert len(smtp_server.messages) == 3
+    assert len(smtp_server.sessions) == 1
+
+
+def test_pool_retires_connection_after_max_messages(smtp_server):
+    pool = _stub_pool(smtp_server, max_messages=2)
+
+    for n in range(5):
+        pool.send_message(_message(n))
+    pool.close()
+
+    assert len(smtp_server.messages) == 5
+    assert len(smtp_server.sessions) == 3
+
+
+def test_pool_checks_idle_connection_with_noop(smtp_server):
+    pool = _stub_pool(smtp_server, noop_after=0)
+
+    pool.send_message(_message(1))
+    pool.send_message(_message(2))
+    smtp_server.drop_sessions()
+    pool.send_message(_message(3))
+    pool.close()
+
+    assert len(smtp_server.messages) == 3
+    assert len(smtp_server.sessions) == 2
+    assert smtp_server.commands.count("NOOP") == 1
+
+
+def test_pool_reconnects_when_send_fails(smtp_server):
+    pool = _stub_pool(smtp_server, noop_after=60)
+
+    pool.send_message(_message(1))
+    smtp_server.drop_sessions()
+    pool.send_message(_message(2))
+    pool.close()
+
+    assert len(smtp_server.messages) == 2
+    assert len(smtp_server.sessions) == 2
+    assert "NOOP" not in smtp_server.commands
+
+
+def test_pool_returns_connection_after_any_error(smtp_server):
+    import smtplib
+
+    import pytest
+
+    pool = _stub_pool(smtp_server, size=1, noop_after=60)
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused), pool.connection():
+        raise smtplib.SMTPRecipientsRefused({})
+    with pytest.raises(ValueError), pool.connection():
+        raise ValueError("bad message")
+    # The single slot was released both times, and only the session that
+    # saw an unknown error was replaced
+    pool.send_message(_message(1))
+    pool.close()
+
+    assert len(smtp_server.messages) == 1
+    assert len(smtp_server.sessions) == 2
+
+
+def test_send_emails_shares_one_session(smtp_server, monkeypatch):
+    from src import email_client
+
+    monkeypatch.setattr(email_client, "_pool", _stub_pool(smtp_server, noop_after=60))
+    email_client.send_emails([("a@example.com", "A", "Body")])
+    smtp_server.drop_sessions()
+
+    errors = email_client.send_emails(
+        [(f"buyer{n}@example.com", f"Order {n}", "Body") for n in range(3)]
+    )
+    email_client._pool.close()
+
+    assert errors == [None, None, None]
+    assert len(smtp_server.messages) == 4
+    assert len(smtp_server.sessions) == 2
@@ -21,3 +21,19 @@ def test_firestore_client_collection_retrieval():
     
     assert products_ref is not None
     assert hasattr(products_ref, "document")
+
+
+def test_firestore_client_is_reused_across_invocations():
+    from src.firestore_client import get_db
+
+    assert get_db() is get_db()
+
+
+def test_firestore_client_close_resets_pool():
+    from src import firestore_client
+
+    firestore_client.get_db()
+    firestore_client.close_db()
+
+    assert firestore_client._pool == []
+    assert firestore_client.get_db() is not None
@@ -0,0 +1,45 @@
+import json
+import logging
+
+from src import main
+from src.log import ContextFilter, JsonFormatter, SamplingFilter
+
+
+def test_http_requests_are_logged_with_their_route(monkeypatch):
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    capture = Capture()
+    capture.addFilter(ContextFilter())
+    main.logger.addHandler(capture)
+    monkeypatch.setattr(main.logger, "level", logging.INFO)
+
+    class FakeRequest:
+        method = "POST"
+        path = "/orders"
+
+        def get_json(self, silent=False):
+            return {}
+
+    try:
+        main.orders_listener_http(FakeRequest())
+    finally:
+        main.logger.removeHandler(capture)
+
+    assert records
+    entry = json.loads(JsonFormatter().format(records[0]))
+    assert entry["route"] == "/orders"
+    assert entry["message"] == "Event received: {}"
+
+
+def test_sampling_filter_keeps_warnings():
+    sampler = SamplingFilter({"/": 0.0})
+
+    info = logging.makeLogRecord({"levelno": logging.INFO, "route": "/"})
+    warning = logging.makeLogRecord({"levelno": logging.WARNING, "route": "/"})
+
+    assert sampler.filter(info) is False
+    assert sampler.filter(warning) is True
@@ -33,6 +33,43 @@ def test_orders_listener_success(monkeypatch):
     assert "product-123" in email_sent["subject"]
 
 
+def test_orders_listener_cart_order(monkeypatch):
+    email_sent = {}
+
+    def fake_send_email(to_email: str, subject: str, body: str) -> None:
+        email_sent["to"] = to_email
+        email_sent["subject"] = subject
+
+    monkeypatch.setattr(main, "send_email", fake_send_email)
+    main.orders_listener.__globals__["send_email"] = fake_send_email
+
+    from src.firestore_client import get_db
+    products_collection = get_db().collection("Products")
+    products_collection.document("product-a").set({"product_name": "Widget A"})
+    products_collection.document("product-b").set({"product_name": "Widget B"})
+
+    event = {
+        "value": {
+            "fields": {
+                "buyer_email": {"stringValue": "buyer@example.com"},
+                "items": {
+                    "arrayValue": {
+                        "values": [
+                            {"mapValue": {"fields": {"product_id": {"stringValue": "product-a"}}}},
+                            {"mapValue": {"fields": {"product_id": {"stringValue": "product-b"}}}},
+                        ]
+                    }
+                },
+            }
+        }
+    }
+
+    main.orders_listener(event, None)
+
+    assert email_sent["to"] == "buyer@example.com"
+    assert email_sent["subject"] == "New order for products Widget A, Widget B"
+
+
 def test_orders_listener_missing_buyer_email(monkeypatch, capsys):
     monkeypatch.setattr(main, "send_email", lambda *args: None)
     main.orders_listener.__globals__["send_email"] = lambda *args: None
@@ -115,3 +152,163 @@ def test_get_string_with_invalid_format():
     
     result = main._get_string(fields, "name")
     assert result is None
+
+
+def test_orders_listener_http_accepts_batched_events(monkeypatch):
+    handled = []
+
+    def fake_batch(events):
+        handled.extend(events)
+        return [{"status": "sent"} for _ in events]
+
+    monkeypatch.setattr(main, "orders_listener_batch", fake_batch)
+
+    class FakeRequest:
+        method = "POST"
+        path = "/"
+
+        def get_json(self, silent=False):
+            return {"events": [{"value": {"name": "a"}}, {"value": {"name": "b"}}]}
+
+    assert main.orders_listener_http(FakeRequest()) == (
+        {"results": [{"status": "sent"}, {"status": "sent"}]},
+        200,
+    )
+    assert handled == [{"value": {"name": "a"}}, {"value": {"name": "b"}}]
+
+
+def test_orders_listener_http_reports_failed_events_with_200(monkeypatch):
+    monkeypatch.setattr(
+        main,
+        "orders_listener_batch",
+        lambda events: [{"status": "sent"}, {"status": "failed", "reason": "boom"}],
+    )
+
+    class FakeRequest:
+        method = "POST"
+        path = "/"
+
+        def get_json(self, silent=False):
+            return {"events": [{"value": {"name": "a"}}, {"value": {"name": "b"}}]}
+
+    body, status = main.orders_listener_http(FakeRequest())
+
+    assert status == 200
+    assert body["results"][1]["status"] == "failed"
+
+
+def _order_event(buyer_email=None, product_id=None):
+    fields = {}
+    if buyer_email:
+        fields["buyer_email"] = {"stringValue": buyer_email}
+    if product_id:
+        fields["product_id"] = {"stringValue": product_id}
+    return {"value": {"fields": fields}}
+
+
+def test_orders_listener_batch_groups_by_recipient(monkeypatch):
+    from src.firestore_client import get_db
+
+    db = get_db()
+    products = db.collection("Products")
+    products.document("batch-a").set({"product_name": "Widget A"})
+    products.document("batch-b").set({"product_name": "Widget B"})
+
+    get_all_calls = []
+    get_all = db.get_all
+    monkeypatch.setattr(db, "get_all", lambda refs: get_all_calls.append(refs) or get_all(refs))
+
+    sent = []
+    monkeypatch.setattr(main, "send_emails", lambda messages: sent.extend(messages) or [None] * len(messages))
+
+    results = main.orders_listener_batch(
+        [
+            _order_event("one@example.com", "batch-a"),
+            _order_event("two@example.com", "batch-b"),
+            _order_event("one@example.com", "batch-b"),
+            _order_event(product_id="batch-a"),
+            _order_event("two@example.com", "batch-missing"),
+        ]
+    )
+
+    assert results == [
+        {"status": "sent"},
+        {"status": "sent"},
+        {"status": "sent"},
+        {"status": "skipped", "reason": "missing_buyer_email"},
+        {"status": "skipped", "reason": "product_not_found"},
+    ]
+    assert len(get_all_calls) == 1
+    assert sent == [
+        (
+            "one@example.com",
+            "2 new orders",
+            (
+                "Your order was confirmed for product: Widget A\n"
+                "Your order was confirmed for product: Widget B"
+            ),
+        ),
+        (
+            "two@example.com",
+            "New order for product Widget B",
+            "Your order was confirmed for product: Widget B",
+        ),
+    ]
+
+
+def test_orders_listener_batch_reports_failed_sends(monkeypatch):
+    import smtplib
+
+    from src.firestore_client import get_db
+
+    get_db().collection("Products").document("batch-a").set({"product_name": "Widget A"})
+    error = smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"No such user")})
+    monkeypatch.setattr(main, "send_emails", lambda messages: [None, error])
+
+    results = main.orders_listener_batch(
+        [_order_event("good@example.com", "batch-a"), _order_event("bad@example.com", "batch-a")]
+    )
+
+    assert results[0] == {"status": "sent"}
+    assert results[1]["status"] == "failed"
+
+
+def test_orders_listener_batch_uses_one_smtp_session(smtp_server, monkeypatch):
+    from src import email_client
+    from src.firestore_client import get_db
+
+    get_db().collection("Products").document("batch-a").set({"product_name": "Widget A"})
+    host, port = smtp_server.server_address
+    monkeypatch.setattr(email_client, "_pool", email_client.SMTPPool(host, port, use_tls=False))
+
+    results = main.orders_listener_batch(
+        [_order_event(f"buyer{n}@example.com", "batch-a") for n in range(4)]
+    )
+    email_client._pool.close()
+
+    assert results == [{"status": "sent"}] * 4
+    assert len(smtp_server.messages) == 4
+    assert len(smtp_server.sessions) == 1
+
+
+def test_orders_listener_http_serves_metrics(smtp_server, monkeypatch):
+    from src import email_client
+    from src.firestore_client import get_db
+
+    get_db().collection("Products").document("batch-a").set({"product_name": "Widget A"})
+    host, port = smtp_server.server_address
+    monkeypatch.setattr(email_client, "_pool", email_client.SMTPPool(host, port, use_tls=False))
+    main.orders_listener_batch([_order_event("buyer@example.com", "batch-a")])
+    email_client._pool.close()
+
+    class FakeRequest:
+        method = "GET"
+        path = "/metrics"
+
+    body, status, headers = main.orders_listener_http(FakeRequest())
+
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/plain")
+    assert b"smtp_send_duration_seconds_count" in body
+    assert b'order_events_total{status="sent"}' in body
+    assert b"product_cache_hit_ratio" in body
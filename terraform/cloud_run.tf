@@ -37,6 +37,12 @@ resource "google_cloud_run_v2_service" "api" {
         name  = "JWT_ALGORITHM"
         value = "HS256"
       }
+
+      # Cloud Run's front end appends the caller's address to X-Forwarded-For
+      env {
+        name  = "TRUSTED_PROXY_HOPS"
+        value = "1"
+      }
     }
   }
 }
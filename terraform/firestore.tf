@@ -6,3 +6,55 @@ resource "google_firestore_database" "default" {
 
   depends_on = [google_project_service.apis]
 }
+
+# Idempotency keys of POST /orders/place are deleted once expires_at passes.
+resource "google_firestore_field" "idempotency_keys_ttl" {
+  project    = var.project_id
+  database   = google_firestore_database.default.name
+  collection = "IdempotencyKeys"
+  field      = "expires_at"
+
+  ttl_config {}
+
+  # Never queried; skip the single-field indexes on a timestamp that only grows
+  index_config {}
+}
+
+# Reservation sweeper: status == "held" AND expires_at <= now
+resource "google_firestore_index" "reservations_held_by_expiry" {
+  project    = var.project_id
+  database   = google_firestore_database.default.name
+  collection = "Reservations"
+
+  fields {
+    field_path = "status"
+    order      = "ASCENDING"
+  }
+
+  fields {
+    field_path = "expires_at"
+    order      = "ASCENDING"
+  }
+}
+
+# GET /orders: user_id == sub ORDER BY created_at DESC, __name__ DESC
+resource "google_firestore_index" "orders_by_user_newest_first" {
+  project    = var.project_id
+  database   = google_firestore_database.default.name
+  collection = "Orders"
+
+  fields {
+    field_path = "user_id"
+    order      = "ASCENDING"
+  }
+
+  fields {
+    field_path = "created_at"
+    order      = "DESCENDING"
+  }
+
+  fields {
+    field_path = "__name__"
+    order      = "DESCENDING"
+  }
+}